@@ -0,0 +1,109 @@
+"""
+Benchmark da detecção de idioma em camadas contra o langdetect puro.
+
+Lê as resenhas de `resenhas_app.txt` (baixando o arquivo se necessário),
+detecta o idioma de cada texto com `detect_language` e com
+`detect_language_tiered` e relata o tempo de cada um, o ganho, a taxa de
+concordância e a fração de textos decidida por cada camada.
+
+Uso:
+    python -m scripts.bench_language_detection [--file data/raw/resenhas_app.txt]
+"""
+import argparse
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+from src.logging_config import configure_logging
+from src.tools.parser import read_reviews_from_file
+from src.tools.text_utils import detect_language, detect_language_tiered
+from src.utils.loader import DocumentLoader
+
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(texts: List[str], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Compara as duas estratégias de detecção sobre os mesmos textos.
+
+    Args:
+        texts: Os textos a serem analisados.
+        repeat: Quantas vezes cada estratégia percorre os textos (o melhor
+            tempo é usado).
+    """
+    baseline: List[str] = []
+    baseline_s = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        baseline = [detect_language(text) for text in texts]
+        baseline_s = min(baseline_s, time.perf_counter() - started_at)
+
+    tiered: List[tuple] = []
+    tiered_s = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        tiered = [detect_language_tiered(text) for text in texts]
+        tiered_s = min(tiered_s, time.perf_counter() - started_at)
+
+    agreement = sum(b == t for b, (t, _) in zip(baseline, tiered))
+    disagreements = Counter(
+        (b, t) for b, (t, _) in zip(baseline, tiered) if b != t
+    )
+    return {
+        "texts": len(texts),
+        "langdetect_s": baseline_s,
+        "tiered_s": tiered_s,
+        "speedup": baseline_s / tiered_s if tiered_s else 0.0,
+        "agreement": agreement / len(texts) if texts else 1.0,
+        "tiers": dict(Counter(tier for _, tier in tiered)),
+        "disagreements": disagreements.most_common(5),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Formata o relatório do benchmark para exibição no terminal."""
+    lines = [
+        f"Textos:               {report['texts']}",
+        f"langdetect:           {report['langdetect_s']:.2f}s",
+        f"Em camadas:           {report['tiered_s']:.2f}s",
+        f"Ganho:                {report['speedup']:.1f}x",
+        f"Concordância:         {report['agreement'] * 100:.2f}%",
+    ]
+    total = report["texts"] or 1
+    for tier, count in sorted(report["tiers"].items()):
+        lines.append(f"Camada {tier + ':':<14}{count} ({100 * count / total:.1f}%)")
+    for (baseline, tiered), count in report["disagreements"]:
+        lines.append(f"Divergência langdetect={baseline} camadas={tiered}: {count}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Executa o benchmark a partir da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--file", type=Path,
+                        default=settings.RAW_DATA_DIR / "resenhas_app.txt",
+                        help="Arquivo de resenhas (baixado se não existir).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Repetições de cada estratégia (vale o melhor tempo).")
+    args = parser.parse_args(argv)
+    configure_logging(logging.WARNING)
+
+    if not args.file.is_file():
+        downloaded = DocumentLoader(persist_dir=str(args.file.parent)).carregar(
+            [settings.REVIEWS_URL]
+        )
+        if not downloaded:
+            raise SystemExit(f"Arquivo de resenhas indisponível: {args.file}")
+        args.file = Path(downloaded[0])
+
+    # O cache de idiomas mascararia o custo real da detecção.
+    settings.LANG_CACHE_ENABLED = False
+    texts = [review.text for review in read_reviews_from_file(args.file)]
+    print(format_report(run_benchmark(texts, repeat=args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark das funções de limpeza de texto: versões escalares contra em lote.
+
+Gera strings sintéticas no estilo das resenhas (português, inglês, acentos,
+espaços repetidos e alguns textos em outros alfabetos), aplica cada função
+escalar string a string e a versão em lote correspondente, confere que os
+resultados são idênticos e relata os tempos.
+
+Uso:
+    python -m scripts.bench_text_utils --strings 1000000
+"""
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.tools.text_utils import (
+    normalize_whitespace,
+    normalize_whitespace_bulk,
+    remove_special_characters,
+    remove_special_characters_bulk,
+)
+
+_WORDS = [
+    "ótimo", "app", "muito", "bom!", "não", "funciona,", "atualização", "lento",
+    "great", "app.", "crashes", "every", "time?", "love", "it", "très", "bien",
+    "ñandú", "日本語", "1234", "R$", "5,99", "\t", "  ", "\n",
+]
+
+
+def make_texts(count: int, seed: int = 0) -> List[str]:
+    """Gera `count` strings sintéticas de 1 a 30 palavras."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 30)))
+        for _ in range(count)
+    ]
+
+
+def _best_time(func: Callable[[], List[str]], repeat: int) -> tuple:
+    """Executa `func` `repeat` vezes e retorna o melhor tempo e o último resultado."""
+    best = float("inf")
+    result: List[str] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started_at)
+    return best, result
+
+
+def run_benchmark(texts: List[str], repeat: int = 1) -> Dict[str, Dict[str, float]]:
+    """Compara as versões escalares e em lote sobre os mesmos textos."""
+    cases = {
+        "normalize_whitespace": (
+            lambda: [normalize_whitespace(t) for t in texts],
+            lambda: normalize_whitespace_bulk(texts),
+        ),
+        "remove_special_characters": (
+            lambda: [remove_special_characters(t) for t in texts],
+            lambda: remove_special_characters_bulk(texts),
+        ),
+    }
+    report = {}
+    for name, (scalar, bulk) in cases.items():
+        scalar_s, expected = _best_time(scalar, repeat)
+        bulk_s, result = _best_time(bulk, repeat)
+        if result != expected:
+            raise AssertionError(f"{name}: resultado em lote difere do escalar")
+        report[name] = {
+            "scalar_s": scalar_s,
+            "bulk_s": bulk_s,
+            "speedup": scalar_s / bulk_s if bulk_s else 0.0,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    """Executa o benchmark a partir da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--strings", type=int, default=1_000_000,
+                        help="Quantidade de strings geradas.")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Repetições de cada versão (vale o melhor tempo).")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Semente do gerador de textos.")
+    args = parser.parse_args(argv)
+
+    texts = make_texts(args.strings, args.seed)
+    for name, result in run_benchmark(texts, args.repeat).items():
+        print(
+            f"{name:<26} escalar {result['scalar_s']:6.2f}s | "
+            f"lote {result['bulk_s']:6.2f}s | ganho {result['speedup']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
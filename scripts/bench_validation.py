@@ -0,0 +1,109 @@
+"""
+Benchmark da validação das respostas do LLM: individual contra em lote.
+
+Gera respostas sintéticas no formato pedido ao LLM (com uma fração de
+respostas inválidas, que caem no fallback), valida cada uma com
+`map_llm_response_to_processed` e todas de uma vez com
+`map_llm_responses_to_processed`, confere que os resultados são idênticos
+e relata os tempos. Os logs seguem o nível do pipeline (INFO por padrão),
+mas são descartados.
+
+Uso:
+    python -m scripts.bench_validation --records 100000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.logging_config import configure_logging
+from src.models import ReviewProcessed, ReviewRaw
+from src.processor import map_llm_response_to_processed, map_llm_responses_to_processed
+
+_SENTIMENTS = ["positive", "negative", "neutral"]
+_INTENSITIES = ["Alta", "Média", "Baixa", "forte"]
+_ASPECTS = ["desempenho", "design", "preço", "suporte", "estabilidade"]
+
+
+def make_records(
+    count: int, invalid_ratio: float = 0.05, seed: int = 0
+) -> List[Tuple[ReviewRaw, str]]:
+    """Gera `count` pares (resenha, resposta do LLM), parte deles inválidos."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        review = ReviewRaw(id=str(i), user=f"user{i}", text=f"Resenha número {i}.", language="pt")
+        payload = {
+            "translation_pt": f"Resenha número {i}.",
+            "sentiment": rng.choice(_SENTIMENTS),
+            "intensity": rng.choice(_INTENSITIES),
+            "aspects": ", ".join(rng.sample(_ASPECTS, rng.randint(0, 3))),
+            "explanation": "Explicação curta.",
+        }
+        if rng.random() < invalid_ratio:
+            payload["sentiment"] = "happy"
+        records.append((review, f"```json\n{json.dumps(payload, ensure_ascii=False)}\n```"))
+    return records
+
+
+def _best_time(func: Callable[[], List[ReviewProcessed]], repeat: int) -> tuple:
+    """Executa `func` `repeat` vezes e retorna o melhor tempo e o último resultado."""
+    best = float("inf")
+    result: List[ReviewProcessed] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started_at)
+    return best, result
+
+
+def run_benchmark(records: List[Tuple[ReviewRaw, str]], repeat: int = 1) -> Dict[str, float]:
+    """Compara a validação individual e em lote sobre os mesmos registros."""
+    single_s, expected = _best_time(
+        lambda: [map_llm_response_to_processed(review, resp) for review, resp in records],
+        repeat,
+    )
+    bulk_s, result = _best_time(lambda: map_llm_responses_to_processed(records), repeat)
+    if result != expected:
+        raise AssertionError("Validação em lote difere da validação individual")
+    return {
+        "records": len(records),
+        "single_s": single_s,
+        "bulk_s": bulk_s,
+        "speedup": single_s / bulk_s if bulk_s else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Executa o benchmark a partir da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--records", type=int, default=100_000,
+                        help="Quantidade de respostas geradas.")
+    parser.add_argument("--invalid-ratio", type=float, default=0.05,
+                        help="Fração de respostas inválidas (fallback).")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Repetições de cada versão (vale o melhor tempo).")
+    parser.add_argument("--log-level", default="INFO",
+                        help="Nível de log durante a medição (o custo dos logs conta).")
+    args = parser.parse_args(argv)
+    records = make_records(args.records, args.invalid_ratio)
+
+    configure_logging(getattr(logging, args.log_level.upper()))
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        handler = logging.getLogger().handlers[0]
+        handler.setStream(devnull)
+        try:
+            report = run_benchmark(records, args.repeat)
+        finally:
+            logging.getLogger().removeHandler(handler)
+    print(
+        f"{report['records']} respostas | individual {report['single_s']:6.2f}s | "
+        f"lote {report['bulk_s']:6.2f}s | ganho {report['speedup']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Teste de carga do LLMClient contra servidores LLM falsos.
+
+Sobe um ou mais `MockLLMServer` locais (ou usa uma URL existente), envia
+prompts pelo LLMClient e relata vazão e percentis de latência. Serve para
+comparar, de forma reproduzível e sem GPU, os efeitos de concorrência,
+cache e roteamento entre servidores.
+
+Uso:
+    python -m scripts.load_test --requests 200 --concurrency 8 --servers 2
+"""
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from openai import OpenAI
+
+from scripts.mock_llm_server import add_server_arguments, server_from_args
+from src.concurrency import percentile
+from src.config import EndpointConfig
+from src.llm_cache import LLMResponseCache
+from src.llm_client import API_ERROR_RESPONSE, CONNECTION_ERROR_RESPONSE, LLMClient
+from src.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class TimedLLMClient(LLMClient):
+    """LLMClient que registra a latência de cada chamada ao servidor."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+        self._latencies_lock = threading.Lock()
+
+    def _create_completion(
+        self, client: OpenAI, prompt: str, temperature: float, max_tokens: int
+    ) -> str:
+        started_at = time.perf_counter()
+        try:
+            return super()._create_completion(client, prompt, temperature, max_tokens)
+        finally:
+            with self._latencies_lock:
+                self.latencies.append(time.perf_counter() - started_at)
+
+
+def run_load_test(
+    client: TimedLLMClient,
+    n_requests: int,
+    unique_prompts: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Envia `n_requests` prompts pelo cliente e calcula as métricas da execução.
+
+    Args:
+        client: O cliente a ser medido.
+        n_requests: Total de prompts enviados.
+        unique_prompts: Quantidade de prompts distintos (os demais se repetem),
+            útil para medir o efeito do cache. None = todos distintos.
+    """
+    distinct = unique_prompts or n_requests
+    prompts = [f"Resenha de teste número {i % distinct}." for i in range(n_requests)]
+
+    started_at = time.perf_counter()
+    outputs = client.batch_process(prompts)
+    elapsed = time.perf_counter() - started_at
+
+    latencies = client.latencies
+    failures = sum(o in (CONNECTION_ERROR_RESPONSE, API_ERROR_RESPONSE) for o in outputs)
+    report: Dict[str, Any] = {
+        "requests": n_requests,
+        "server_calls": len(latencies),
+        "failures": failures,
+        "elapsed_s": elapsed,
+        "throughput_rps": n_requests / elapsed if elapsed else 0.0,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p90_s": percentile(latencies, 90),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_p99_s": percentile(latencies, 99),
+        "latency_max_s": max(latencies, default=0.0),
+    }
+    if client.concurrency is not None:
+        report["final_concurrency_limit"] = client.concurrency.limit
+    if client.cache is not None:
+        report["cache"] = client.cache.stats()
+    if client.pool is not None:
+        report["endpoints"] = client.pool.stats()
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Formata o relatório do teste de carga para exibição no terminal."""
+    lines = [
+        f"Requisições:           {report['requests']} "
+        f"({report['server_calls']} chamadas ao servidor, {report['failures']} falhas)",
+        f"Tempo total:           {report['elapsed_s']:.2f}s",
+        f"Vazão:                 {report['throughput_rps']:.2f} req/s",
+        "Latência p50/p90/p95/p99/max: "
+        f"{report['latency_p50_s'] * 1000:.0f} / {report['latency_p90_s'] * 1000:.0f} / "
+        f"{report['latency_p95_s'] * 1000:.0f} / {report['latency_p99_s'] * 1000:.0f} / "
+        f"{report['latency_max_s'] * 1000:.0f} ms",
+    ]
+    if "final_concurrency_limit" in report:
+        lines.append(f"Limite de concorrência final: {report['final_concurrency_limit']}")
+    if "cache" in report:
+        lines.append(f"Cache: {report['cache']}")
+    for endpoint in report.get("endpoints", []):
+        lines.append(f"Servidor {endpoint['base_url']}: {endpoint['requests']} requisições")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Executa o teste de carga a partir da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Total de prompts enviados.")
+    parser.add_argument("--unique-prompts", type=int, default=None,
+                        help="Quantidade de prompts distintos (mede o cache).")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Máximo de requisições simultâneas do cliente.")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Ativa o controle adaptativo de concorrência.")
+    parser.add_argument("--cache", action="store_true",
+                        help="Usa um cache de respostas temporário.")
+    parser.add_argument("--servers", type=int, default=1,
+                        help="Quantidade de servidores falsos (roteados pelo pool).")
+    parser.add_argument("--url", default=None,
+                        help="Usa um servidor existente em vez dos servidores falsos.")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(logging.WARNING)
+
+    servers = [] if args.url else [
+        server_from_args(args).start() for _ in range(max(1, args.servers))
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = LLMResponseCache(Path(tmp_dir) / "cache.sqlite3") if args.cache else None
+        try:
+            if args.url:
+                client = TimedLLMClient(
+                    base_url=args.url, max_concurrency=args.concurrency,
+                    adaptive=args.adaptive, cache=cache,
+                )
+            else:
+                per_server = max(1, args.concurrency // len(servers))
+                client = TimedLLMClient(
+                    endpoints=[
+                        EndpointConfig(base_url=s.base_url, max_concurrency=per_server)
+                        for s in servers
+                    ],
+                    max_concurrency=args.concurrency,
+                    adaptive=args.adaptive,
+                    cache=cache,
+                )
+            report = run_load_test(client, args.requests, args.unique_prompts)
+        finally:
+            if cache is not None:
+                cache.close()
+            for server in servers:
+                server.stop()
+
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
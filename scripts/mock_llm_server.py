@@ -0,0 +1,274 @@
+"""
+Servidor LLM falso, compatível com a API da OpenAI, para testes e benchmarks.
+
+Atende `POST /v1/chat/completions` e `GET /v1/models` sem GPU nem modelo,
+com distribuição de latência, taxa de erros, limite de concorrência e
+modelos de resposta configuráveis. Permite medir o LLMClient (concorrência,
+cache, roteamento) de forma reproduzível no CI ou em um notebook.
+
+Uso:
+    python -m scripts.mock_llm_server --port 8000 --latency-ms 300 --server-concurrency 4
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Resposta padrão: uma análise válida para `map_llm_response_to_processed`.
+DEFAULT_TEMPLATES = [
+    json.dumps(
+        {
+            "translation_pt": "Resposta simulada pelo servidor de testes.",
+            "sentiment": "positive",
+            "intensity": "Média",
+            "aspects": ["geral"],
+            "explanation": "Resposta gerada pelo servidor LLM falso.",
+        },
+        ensure_ascii=False,
+    )
+]
+
+
+class MockLLMServer:
+    """
+    Servidor HTTP falso que simula um servidor de inferência local.
+
+    Args:
+        host: Endereço de escuta.
+        port: Porta de escuta (0 escolhe uma porta livre).
+        latency_ms: Latência mediana de cada requisição, em milissegundos.
+        latency_dist: Distribuição da latência: 'fixed', 'uniform'
+            (entre 0 e 2x a mediana) ou 'lognormal'.
+        latency_sigma: Dispersão da distribuição lognormal.
+        error_rate: Fração das requisições respondidas com HTTP 500.
+        concurrency: Requisições atendidas ao mesmo tempo; as demais
+            aguardam na fila, como em um servidor real.
+        templates: Conteúdos possíveis da resposta do assistente.
+        seed: Semente do gerador aleatório (para resultados reproduzíveis).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        latency_dist: str = "fixed",
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        concurrency: int = 1,
+        templates: Optional[List[str]] = None,
+        seed: int | None = 0,
+    ):
+        if latency_dist not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Distribuição de latência inválida: {latency_dist}")
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.templates = templates or DEFAULT_TEMPLATES
+        self.requests = 0
+        self.errors = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """URL base no formato esperado pelo cliente OpenAI."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def sample_latency(self) -> float:
+        """Sorteia a latência de uma requisição, em segundos."""
+        median = self.latency_ms / 1000
+        with self._lock:
+            if self.latency_dist == "uniform":
+                return self._random.uniform(0, 2 * median)
+            if self.latency_dist == "lognormal" and median > 0:
+                return self._random.lognormvariate(0, self.latency_sigma) * median
+            return median
+
+    def _next_outcome(self) -> Tuple[bool, str]:
+        """Decide se a requisição falha e escolhe o modelo de resposta."""
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return failed, self._random.choice(self.templates)
+
+    def _make_handler(self):
+        """Cria a classe de handler HTTP ligada a este servidor."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Handler HTTP com as rotas mínimas da API da OpenAI."""
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                """Envia uma resposta JSON com o status informado."""
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(
+                        200,
+                        {"object": "list", "data": [{"id": "mock-model", "object": "model"}]},
+                    )
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                with server._slots:
+                    with server._lock:
+                        server._in_flight += 1
+                        server.max_in_flight = max(server.max_in_flight, server._in_flight)
+                    try:
+                        time.sleep(server.sample_latency())
+                        failed, content = server._next_outcome()
+                    finally:
+                        with server._lock:
+                            server._in_flight -= 1
+
+                if failed:
+                    self._send_json(
+                        500,
+                        {"error": {"message": "erro simulado", "type": "server_error"}},
+                    )
+                    return
+                prompt = "".join(
+                    str(m.get("content", "")) for m in request.get("messages", [])
+                )
+                self._send_json(
+                    200,
+                    {
+                        "id": f"chatcmpl-mock-{server.requests}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": request.get("model", "mock-model"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": len(prompt) // 4,
+                            "completion_tokens": len(content) // 4,
+                            "total_tokens": (len(prompt) + len(content)) // 4,
+                        },
+                    },
+                )
+
+        return Handler
+
+    def start(self) -> "MockLLMServer":
+        """Inicia o servidor em uma thread em segundo plano."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-llm", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Atende requisições na thread atual até ser interrompido (Ctrl+C)."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """Encerra o servidor."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adiciona as opções do servidor falso a um parser de argumentos."""
+    parser.add_argument("--latency-ms", type=float, default=200.0,
+                        help="Latência mediana por requisição (ms).")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"],
+                        default="lognormal", help="Distribuição da latência.")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Dispersão da distribuição lognormal.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fração das requisições que retornam HTTP 500.")
+    parser.add_argument("--server-concurrency", type=int, default=4,
+                        help="Requisições atendidas simultaneamente pelo servidor.")
+    parser.add_argument("--template", type=Path, default=None,
+                        help="Arquivo JSON com uma lista de respostas possíveis.")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Semente para resultados reproduzíveis.")
+
+
+def server_from_args(args: argparse.Namespace, port: int = 0) -> MockLLMServer:
+    """Cria um MockLLMServer a partir dos argumentos de linha de comando."""
+    templates = None
+    if args.template is not None:
+        templates = json.loads(args.template.read_text(encoding="utf-8"))
+    return MockLLMServer(
+        port=port,
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        concurrency=args.server_concurrency,
+        templates=templates,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    """Executa o servidor falso até ser interrompido (Ctrl+C)."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--port", type=int, default=8000, help="Porta de escuta.")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    server = server_from_args(args, port=args.port)
+    logger.info("Servidor LLM falso ouvindo em %s", server.base_url)
+    server.serve_forever()
+    logger.info("%d requisições atendidas (%d erros).", server.requests, server.errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,33 +3,52 @@ Script principal para executar o pipeline completo de processamento de resenhas.
 
 Este script orquestra as seguintes etapas:
 1. Baixa o arquivo de dados de uma URL.
-2. Lê e parseia o arquivo .txt para objetos `ReviewRaw`.
+2. Lê e parseia o arquivo .txt para objetos `ReviewRaw`, sob demanda.
 3. Envia os prompts para o LLM e recebe as respostas em JSON.
 4. Processa, valida, analisa e salva os resultados.
 """
+import argparse
 import logging
+from collections import deque
+from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # 1. IMPORTS NO TOPO DO ARQUIVO (Resolve C0415)
+# Exceções: o cliente OpenAI e o `requests` são lentos para importar e só são
+# importados nas etapas que os usam (ver `process_with_llm` e `download_data`).
 from src.config import settings
-from src.llm_client import LLMClient
-from src.logging_config import configure_logging
-from src.models import ReviewRaw
-from src.processor import analyze_reviews, map_llm_response_to_processed
-from src.tools.parser import read_reviews_from_file
+from src.dedup import DuplicateTracker
+from src.llm_cache import LLMResponseCache
+from src.journal import ResponseJournal
+from src.logging_config import brasilia_tz, configure_logging
+from src.models import ReviewProcessed, ReviewRaw
+from src.packing import iter_packed
+from src.processor import ReviewAggregator, map_llm_responses_to_processed
+from src.review_table import ReviewTable
+from src.tools.incremental_reader import IncrementalReviewReader
+from src.tools.parsed_cache import ParsedReviewCache
+from src.tools.parser import is_compressed, iter_reviews, iter_reviews_parallel
 from src.tools.prompt_builder import build_json_prompt
-from src.utils.file_ops import save_processed_json, save_summary_txt
-from src.utils.loader import DocumentLoader
+from src.tools.token_budget import budget_review
+from src.utils.file_ops import save_aggregated_summary, save_processed_json, save_summary_json
+
+if TYPE_CHECKING:
+    from src.llm_client import LLMClient
 
 # Configura o logger para este módulo
 logger = logging.getLogger(__name__)
 
+# Respostas do LLM validadas por chamada ao pydantic.
+VALIDATION_BATCH_SIZE = 1000
+
 # 2. DIVISÃO EM FUNÇÕES MENORES (Resolve R0914 e R0915)
 
 def download_data() -> Optional[Path]:
     """Etapa 1: Baixa o arquivo de dados da URL configurada."""
     logger.info("Etapa 1: Baixando o arquivo de dados...")
+    from src.utils.loader import DocumentLoader  # pylint: disable=import-outside-toplevel
     doc_loader = DocumentLoader(persist_dir=str(settings.RAW_DATA_DIR))
     downloaded_files = doc_loader.carregar([settings.REVIEWS_URL])
 
@@ -41,63 +60,289 @@ def download_data() -> Optional[Path]:
     logger.info("✅ Arquivo salvo em: %s", reviews_file_path)
     return reviews_file_path
 
-def process_with_llm(raw_reviews: List[ReviewRaw]) -> List[str]:
-    """Etapa 2: Constrói prompts e obtém respostas do LLM."""
-    logger.info("Etapa 2: Construindo prompts e processando com o LLM...")
-    prompts = [build_json_prompt(review) for review in raw_reviews]
-    logger.info("✅ %d prompts construídos.", len(prompts))
+def _request_for(review: ReviewRaw) -> Tuple[str, int]:
+    """Monta o prompt e o `max_tokens` de uma resenha."""
+    if settings.LLM_DYNAMIC_MAX_TOKENS:
+        review, max_tokens = budget_review(review)
+    else:
+        max_tokens = settings.LLM_MAX_TOKENS
+    return build_json_prompt(review), max_tokens
+
+def _llm_responses(
+    reviews: Iterable[Tuple[int, ReviewRaw]],
+    llm_client: "LLMClient",
+) -> Iterator[Tuple[int, ReviewRaw, str]]:
+    """
+    Envia as resenhas `(índice, resenha)` ao LLM à medida que são lidas e
+    produz triplas `(índice, resenha, resposta)` na ordem de conclusão.
+    """
+    if settings.LLM_PACK_SIZE > 1:
+        logger.info(
+            "Enviando resenhas em pacotes de %d para o LLM (pode levar um tempo)...",
+            settings.LLM_PACK_SIZE,
+        )
+        # O empacotamento trabalha em blocos, para manter o consumo de memória
+        # limitado e ainda assim ocupar todas as vagas de concorrência.
+        chunk_size = settings.LLM_PACK_SIZE * llm_client.max_concurrency * 4
+        iterator = iter(reviews)
+        while chunk := list(islice(iterator, chunk_size)):
+            for k, response in iter_packed([r for _, r in chunk], llm_client):
+                yield (*chunk[k], response)
+        return
 
     logger.info("Enviando prompts para o LLM (pode levar um tempo)...")
-    llm_client = LLMClient()
-    llm_responses = llm_client.batch_process(prompts)
+    sent: Dict[int, Tuple[int, ReviewRaw]] = {}
+
+    def requests() -> Iterator[Tuple[str, int]]:
+        for k, (index, review) in enumerate(reviews):
+            sent[k] = (index, review)
+            yield _request_for(review)
+
+    for k, response in llm_client.iter_requests(requests()):
+        yield (*sent.pop(k), response)
+
+def process_with_llm(
+    raw_reviews: Iterable[ReviewRaw],
+    resume: bool = False,
+) -> Iterator[Tuple[int, ReviewRaw, str]]:
+    """
+    Etapa 2: Constrói prompts e obtém respostas do LLM.
+
+    Consome as resenhas sob demanda (um gerador como `iter_reviews` é lido
+    apenas conforme há vagas para novas requisições) e produz triplas
+    `(índice, resenha, resposta bruta)` à medida que as respostas chegam,
+    para que a validação possa ocorrer em paralelo à inferência.
+
+    Cada resposta é registrada no journal; com `resume`, as resenhas já
+    registradas são reaproveitadas e apenas as demais são enviadas ao LLM.
+    Com LLM_DEDUP_ENABLED, duplicatas recebem a resposta do primeiro
+    membro do grupo em vez de uma nova requisição.
+    """
+    logger.info("Etapa 2: Construindo prompts e processando com o LLM...")
+    journal = ResponseJournal()
+    done = journal.load() if resume else {}
+    tracker = DuplicateTracker() if settings.LLM_DEDUP_ENABLED else None
+    # Respostas já conhecidas (journal ou duplicatas resolvidas), entregues
+    # junto com as próximas respostas do LLM.
+    ready: Deque[Tuple[int, ReviewRaw, str]] = deque()
+    replayed = 0
+
+    def resolve(review: ReviewRaw, response: str) -> None:
+        if tracker is not None:
+            ready.extend(
+                (index, duplicate, response)
+                for index, duplicate in tracker.resolve(review, response)
+            )
+
+    def to_send() -> Iterator[Tuple[int, ReviewRaw]]:
+        nonlocal replayed
+        for index, review in enumerate(raw_reviews):
+            if tracker is not None:
+                is_new, response = tracker.add(index, review)
+                if not is_new:
+                    if response is not None:
+                        ready.append((index, review, response))
+                    continue
+            response = done.get(journal.key(review))
+            if response is not None:
+                replayed += 1
+                ready.append((index, review, response))
+                resolve(review, response)
+                continue
+            yield index, review
+
+    from src.llm_client import LLMClient  # pylint: disable=import-outside-toplevel
+    journal.open(resume=resume)
+    cache = LLMResponseCache() if settings.LLM_CACHE_ENABLED else None
+    llm_client = LLMClient(cache=cache)
+    try:
+        for index, review, response in _llm_responses(to_send(), llm_client):
+            journal.append(review, response)
+            resolve(review, response)
+            while ready:
+                yield ready.popleft()
+            yield index, review, response
+        while ready:
+            yield ready.popleft()
+    finally:
+        journal.close()
+        if cache is not None:
+            cache.close()
+    if resume:
+        logger.info("✅ Execução retomada: %d resenhas reaproveitadas do journal.", replayed)
+    if tracker is not None:
+        tracker.log_stats()
     logger.info("✅ Respostas do LLM recebidas.")
-    return llm_responses
 
-def validate_and_analyze(raw_reviews: List[ReviewRaw], llm_responses: List[str]):
-    """Etapa 3: Valida, analisa e salva os resultados finais."""
+def validate_and_analyze(
+    llm_results: Iterable[Tuple[int, ReviewRaw, str]],
+    output_dir: Optional[Path] = None,
+):
+    """
+    Etapa 3: Valida, analisa e salva os resultados finais.
+
+    As respostas são validadas em lotes de VALIDATION_BATCH_SIZE, à medida
+    que chegam. Se a execução for interrompida (Ctrl+C), as respostas já
+    recebidas são validadas e salvas antes de encerrar.
+
+    Args:
+        llm_results: Tuplas (posição no arquivo, resenha, resposta do LLM).
+        output_dir: Diretório dos arquivos de saída (padrão: OUTPUTS_DIR).
+    """
+    output_dir = output_dir or settings.OUTPUTS_DIR
     logger.info("Etapa 3: Validando, analisando e salvando os resultados...")
 
-    processed_reviews = [
-        map_llm_response_to_processed(raw_review, llm_resp)
-        for raw_review, llm_resp in zip(raw_reviews, llm_responses)
-    ]
+    # As resenhas validadas ficam em colunas; `positions` guarda o índice de
+    # cada linha no arquivo.
+    processed_reviews = ReviewTable(ReviewProcessed)
+    positions: List[int] = []
+    batch: List[Tuple[int, ReviewRaw, str]] = []
+
+    def validate_batch():
+        processed_reviews.extend(
+            map_llm_responses_to_processed((review, resp) for _, review, resp in batch)
+        )
+        positions.extend(index for index, _, _ in batch)
+        batch.clear()
+
+    interrupted = False
+    try:
+        for result in llm_results:
+            batch.append(result)
+            if len(batch) >= VALIDATION_BATCH_SIZE:
+                validate_batch()
+    except KeyboardInterrupt:
+        interrupted = True
+        if hasattr(llm_results, "close"):
+            llm_results.close()  # Cancela as requisições pendentes
+        logger.warning("⚠️ Execução interrompida. Salvando os resultados parciais...")
+    validate_batch()
+
+    # As respostas chegam na ordem de conclusão; os resultados seguem a do arquivo.
+    processed_reviews.sort_by(positions)
     logger.info("✅ %d respostas processadas e validadas.", len(processed_reviews))
 
-    counts, concatenated_text = analyze_reviews(processed_reviews)
-    logger.info("✅ Análise concluída. Contagem de sentimentos: %s", dict(counts))
+    json_path = output_dir / "processed.json"
+    summary_path = output_dir / "summary.txt"
+    report_path = output_dir / "summary.json"
 
-    json_path = settings.OUTPUTS_DIR / "processed.json"
-    summary_path = settings.OUTPUTS_DIR / "summary.txt"
+    # A seção concatenada do sumário vai para um arquivo temporário e é
+    # copiada em blocos, sem montar uma única string com todas as resenhas.
+    with ReviewAggregator() as aggregator:
+        aggregator.update(processed_reviews)
+        logger.info(
+            "✅ Análise concluída. Contagem de sentimentos: %s", dict(aggregator.sentiments)
+        )
+        save_processed_json(processed_reviews, json_path)
+        save_aggregated_summary(aggregator, summary_path)
 
-    save_processed_json(processed_reviews, json_path)
-    save_summary_txt(counts, concatenated_text, summary_path)
-    logger.info("✅ Arquivos salvos em: %s", settings.OUTPUTS_DIR)
+    # O relatório analítico usa o pandas, importado apenas nesta etapa.
+    from src.analytics import build_report  # pylint: disable=import-outside-toplevel
+    save_summary_json(build_report(processed_reviews), report_path)
+    logger.info("✅ Arquivos salvos em: %s", output_dir)
+    if interrupted:
+        raise KeyboardInterrupt
 
-def main():
+def _incremental_output_dir() -> Path:
+    """
+    Diretório próprio para os resultados de uma execução incremental, para
+    não sobrescrever os das execuções anteriores.
+    """
+    run_id = datetime.now(tz=brasilia_tz()).strftime("%Y%m%d-%H%M%S")
+    output_dir = settings.OUTPUTS_DIR / "incremental" / run_id
+    suffix = 1
+    while output_dir.exists():
+        suffix += 1
+        output_dir = settings.OUTPUTS_DIR / "incremental" / f"{run_id}-{suffix}"
+    return output_dir
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Lê os argumentos de linha de comando do pipeline."""
+    parser = argparse.ArgumentParser(
+        description="Pipeline de análise de sentimento de resenhas."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Retoma uma execução interrompida: reaproveita as respostas do "
+            "journal e envia ao LLM apenas as resenhas pendentes."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Processa apenas as resenhas acrescentadas ao arquivo desde a "
+            "última execução incremental concluída."
+        ),
+    )
+    parser.add_argument(
+        "--input",
+        default=None,
+        help=(
+            "Lê as resenhas de um arquivo (.txt, .gz, .bz2, .xz), diretório ou "
+            "glob de fragmentos em vez de baixar o arquivo padrão."
+        ),
+    )
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Orquestra a execução do pipeline."""
+    args = parse_args(argv)
     configure_logging()
     logger.info("=================================================")
     logger.info("🚀 INICIANDO O PIPELINE DE PROCESSAMENTO DE RESENHAS 🚀")
     logger.info("=================================================")
 
-    # Etapa 1: Download
-    reviews_file_path = download_data()
+    # Etapa 1: Download (dispensado quando a entrada é informada com --input)
+    reviews_file_path = args.input or download_data()
     if not reviews_file_path:
         return
 
-    # Etapa 2: Leitura
+    # Etapa 2: Leitura, sob demanda: cada resenha é parseada apenas quando o
+    # LLM tem vaga para ela, então as requisições começam após a primeira.
+    # Com PARSER_WORKERS != 1, o arquivo é parseado em vários processos; com
+    # --incremental, apenas as resenhas novas desde a última execução são lidas.
+    incremental = None
+    output_dir = settings.OUTPUTS_DIR
     try:
-        raw_reviews = read_reviews_from_file(reviews_file_path)
-        logger.info("✅ %d resenhas lidas e enriquecidas com sucesso.", len(raw_reviews))
+        if args.incremental:
+            if is_compressed(Path(reviews_file_path)) or not Path(reviews_file_path).is_file():
+                logger.error(
+                    "❌ --incremental exige um único arquivo .txt sem compactação: %s",
+                    reviews_file_path,
+                )
+                return
+            incremental = IncrementalReviewReader(reviews_file_path)
+            raw_reviews = incremental.iter_new()
+            first_review = next(raw_reviews, None)
+            if first_review is None:
+                # Nada a processar: os resultados anteriores ficam intactos.
+                incremental.commit()
+                logger.info("✅ Nenhuma resenha nova; os resultados em %s foram mantidos.",
+                            settings.OUTPUTS_DIR)
+                return
+            raw_reviews = chain([first_review], raw_reviews)
+            output_dir = _incremental_output_dir()
+        else:
+            parse = iter_reviews if settings.PARSER_WORKERS == 1 else iter_reviews_parallel
+            if settings.PARSED_CACHE_ENABLED:
+                # Se a origem não mudou desde a última execução, as resenhas
+                # parseadas são carregadas do cache, sem parsing.
+                raw_reviews = ParsedReviewCache().iter_reviews(reviews_file_path, parse)
+            else:
+                raw_reviews = parse(reviews_file_path)
     except FileNotFoundError:
         logger.error("❌ Arquivo de resenhas não encontrado em %s.", reviews_file_path)
         return
 
-    # Etapa 3: Processamento com LLM
-    llm_responses = process_with_llm(raw_reviews)
-
-    # Etapa 4: Análise e Salvamento
-    validate_and_analyze(raw_reviews, llm_responses)
+    # Etapas 3 e 4: Processamento com LLM, análise e salvamento, em paralelo
+    # à leitura do arquivo e à chegada das respostas.
+    validate_and_analyze(process_with_llm(raw_reviews, resume=args.resume), output_dir)
+    if incremental is not None:
+        # Só avança a posição depois que os resultados foram salvos.
+        incremental.commit()
 
     logger.info("=================================================")
     logger.info("🎉 PIPELINE CONCLUÍDO COM SUCESSO! 🎉")
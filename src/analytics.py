@@ -0,0 +1,110 @@
+"""
+Relatório analítico das resenhas processadas, calculado de forma vetorizada.
+
+As resenhas são carregadas em colunas do pandas (com `language`,
+`sentiment` e `intensity` como categorias) e os relatórios (tabelas
+cruzadas, aspectos mais citados por sentimento e resenhas por usuário) são
+calculados sem laços Python por resenha. O resultado é um dicionário pronto
+para ser salvo como `summary.json`.
+
+O pandas é importado junto com este módulo; o pipeline só o importa na
+etapa final.
+"""
+import logging
+from typing import Any, Dict, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.models import ReviewProcessed
+from src.review_table import ReviewTable
+
+logger = logging.getLogger(__name__)
+
+_CATEGORICAL = ("language", "sentiment", "intensity")
+
+
+def _categorical(table: ReviewTable, name: str) -> pd.Categorical:
+    """Converte uma coluna categórica da tabela sem decodificar valor a valor."""
+    codes = np.frombuffer(table.codes(name), dtype=np.uint16).astype(np.int32)
+    return pd.Categorical.from_codes(codes, categories=table.categories(name))
+
+
+def load_frames(
+    reviews: Union[ReviewTable, Iterable[ReviewProcessed]]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Carrega as resenhas em dois DataFrames: um por resenha (`user`,
+    `language`, `sentiment`, `intensity`) e um por aspecto citado (`aspect`,
+    `sentiment`).
+    """
+    if not isinstance(reviews, ReviewTable):
+        reviews = ReviewTable.from_rows(reviews)
+    frame = pd.DataFrame(
+        {"user": reviews.column("user"), **{n: _categorical(reviews, n) for n in _CATEGORICAL}}
+    )
+    items, offsets = reviews.list_items("aspects")
+    per_review = np.diff(np.frombuffer(offsets, dtype=np.uint64)).astype(np.int64)
+    aspects = pd.DataFrame({
+        "aspect": pd.Categorical(items),
+        "sentiment": frame["sentiment"].take(np.repeat(np.arange(len(frame)), per_review)).values,
+    })
+    return frame, aspects
+
+
+def _crosstab(index: pd.Series, columns: pd.Series) -> Dict[str, Dict[str, int]]:
+    """Tabela cruzada como {linha: {coluna: contagem}}, só com os valores presentes."""
+    table = pd.crosstab(index, columns)
+    return {
+        str(row): {str(column): int(count) for column, count in values.items()}
+        for row, values in table.iterrows()
+    }
+
+
+def build_report(
+    reviews: Union[ReviewTable, Iterable[ReviewProcessed]],
+    top_aspects: int = 10,
+) -> Dict[str, Any]:
+    """
+    Calcula o relatório analítico das resenhas processadas.
+
+    Args:
+        reviews: As resenhas (de preferência em uma ReviewTable).
+        top_aspects: Quantidade de aspectos listados por sentimento.
+
+    Returns:
+        Um dicionário serializável em JSON com o total de resenhas, as
+        contagens por sentimento, as tabelas cruzadas de sentimento por
+        idioma e por intensidade, os aspectos mais citados por sentimento e
+        a quantidade de resenhas por usuário.
+    """
+    frame, aspects = load_frames(reviews)
+    logger.info("Calculando o relatório analítico de %d resenhas...", len(frame))
+
+    aspect_counts = aspects.groupby("sentiment", observed=True)["aspect"].value_counts()
+    top_by_sentiment = (
+        aspect_counts[aspect_counts > 0]
+        .groupby(level=0, observed=True, group_keys=False)
+        .head(top_aspects)
+    )
+    top_aspects_by_sentiment: Dict[str, list] = {}
+    for (sentiment, aspect), count in top_by_sentiment.items():
+        top_aspects_by_sentiment.setdefault(str(sentiment), []).append(
+            {"aspect": str(aspect), "count": int(count)}
+        )
+
+    per_user = frame["user"].value_counts()
+    return {
+        "total_reviews": int(len(frame)),
+        "sentiment_counts": {
+            str(k): int(v) for k, v in frame["sentiment"].value_counts().items() if v
+        },
+        "sentiment_by_language": _crosstab(frame["language"], frame["sentiment"]),
+        "sentiment_by_intensity": _crosstab(frame["intensity"], frame["sentiment"]),
+        "top_aspects_by_sentiment": top_aspects_by_sentiment,
+        "users": {
+            "distinct": int(len(per_user)),
+            "max_reviews_per_user": int(per_user.max()) if len(per_user) else 0,
+            "reviews_per_user": {str(k): int(v) for k, v in per_user.items()},
+        },
+    }
@@ -0,0 +1,137 @@
+"""
+Controle adaptativo do número de requisições simultâneas ao LLM.
+
+Implementa um controlador AIMD (aumento aditivo, redução multiplicativa)
+guiado pela latência observada: enquanto o p95 da latência permanece próximo
+do melhor p95 já medido, o limite cresce de um em um; quando a latência sobe
+além da tolerância ou ocorrem timeouts/erros de conexão ou respostas de
+sobrecarga (HTTP 429 e 5xx), o limite é reduzido multiplicativamente.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Calcula o percentil `pct` (0-100) pelo método nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class AdaptiveConcurrencyController:
+    """
+    Ajusta o limite de requisições em andamento a partir de latência e erros.
+
+    É seguro para uso a partir de várias threads. Cada alteração do limite é
+    registrada com o motivo e pode ser consultada em `metrics()`.
+    """
+
+    def __init__(
+        self,
+        min_limit: int | None = None,
+        max_limit: int | None = None,
+        initial_limit: int | None = None,
+        window_size: int = 20,
+        latency_tolerance: float = 1.5,
+        backoff_factor: float = 0.7,
+    ):
+        self.min_limit = max(1, min_limit or settings.LLM_MIN_CONCURRENCY)
+        self.max_limit = max(self.min_limit, max_limit or settings.LLM_MAX_CONCURRENCY)
+        self.limit = min(self.max_limit, max(self.min_limit, initial_limit or self.min_limit))
+        self.window_size = window_size
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.baseline_p95: Optional[float] = None
+        self.last_p95: Optional[float] = None
+        self.changes: List[Dict[str, Any]] = []
+        self._window: List[float] = []
+        self._last_decrease = float("-inf")  # time.monotonic() da última redução
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        """Registra a latência (em segundos) de uma requisição bem-sucedida."""
+        with self._lock:
+            self._window.append(latency)
+            if len(self._window) < self.window_size:
+                return
+            p95 = percentile(self._window, 95)
+            self._window.clear()
+            self.last_p95 = p95
+
+            if self.baseline_p95 is None or p95 < self.baseline_p95:
+                self.baseline_p95 = p95
+            if p95 > self.baseline_p95 * self.latency_tolerance:
+                self._decrease(
+                    f"latência p95 em alta ({p95:.2f}s > "
+                    f"{self.latency_tolerance:.1f} x {self.baseline_p95:.2f}s)"
+                )
+            else:
+                self._set_limit(
+                    self.limit + 1, f"latência p95 estável ({p95:.2f}s)"
+                )
+
+    def record_failure(
+        self,
+        started_at: float | None = None,
+        reason: str = "timeout/erro de conexão",
+    ) -> None:
+        """
+        Registra uma falha por sobrecarga e reduz o limite imediatamente.
+
+        Args:
+            started_at: `time.monotonic()` do início da requisição. Falhas de
+                requisições iniciadas antes da última redução são ignoradas,
+                para que uma rajada de timeouts conte como um único sinal.
+            reason: Motivo registrado no histórico de alterações.
+        """
+        with self._lock:
+            if started_at is not None and started_at < self._last_decrease:
+                return
+            # Descarta a janela atual: as latências foram medidas sob sobrecarga.
+            self._window.clear()
+            self._decrease(reason)
+
+    def _decrease(self, reason: str) -> None:
+        """Reduz o limite multiplicativamente."""
+        self._last_decrease = time.monotonic()
+        self._set_limit(math.floor(self.limit * self.backoff_factor), reason)
+
+    def _set_limit(self, new_limit: int, reason: str) -> None:
+        """Aplica um novo limite (dentro dos extremos) e registra o motivo."""
+        new_limit = min(self.max_limit, max(self.min_limit, new_limit))
+        if new_limit == self.limit:
+            return
+        self.changes.append(
+            {
+                "time": time.time(),
+                "from": self.limit,
+                "to": new_limit,
+                "reason": reason,
+            }
+        )
+        logger.info(
+            "Limite de concorrência do LLM: %d -> %d (%s).",
+            self.limit, new_limit, reason,
+        )
+        self.limit = new_limit
+
+    def metrics(self) -> Dict[str, Any]:
+        """Retorna o limite atual, as latências de referência e o histórico."""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "baseline_p95": self.baseline_p95,
+                "last_p95": self.last_p95,
+                "changes": list(self.changes),
+            }
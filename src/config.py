@@ -6,12 +6,21 @@ Todas as configurações são acessíveis através do objeto `settings`.
 """
 
 from pathlib import Path
+from typing import List
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # 1. Define a raiz do projeto. É a única variável "global" necessária.
 #    É o diretório que contém 'src', 'data', 'outputs', etc.
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+class EndpointConfig(BaseModel):
+    """Configuração de um servidor de inferência compatível com OpenAI."""
+    base_url: str
+    api_key: str | None = None  # Usa LLM_API_KEY se não informado
+    weight: float = 1.0  # Participação relativa na distribuição das requisições
+    max_concurrency: int = 1  # Requisições simultâneas permitidas neste servidor
+
 class Settings(BaseSettings):
     """
     Define e valida todas as configurações do aplicativo.
@@ -33,6 +42,74 @@ class Settings(BaseSettings):
     LLM_MAX_RETRIES: int = 3
     LLM_TEMPERATURE: float = 0.0
     LLM_MAX_TOKENS: int = 512
+    # Orçamento de tokens por resenha: com LLM_DYNAMIC_MAX_TOKENS, o max_tokens
+    # de cada requisição é estimado a partir do texto (entre os limites
+    # MIN/MAX_OUTPUT) e textos acima de LLM_MAX_INPUT_TOKENS são reduzidos.
+    LLM_DYNAMIC_MAX_TOKENS: bool = False
+    LLM_MIN_OUTPUT_TOKENS: int = 128
+    LLM_MAX_OUTPUT_TOKENS: int = 1024
+    LLM_MAX_INPUT_TOKENS: int = 768
+    # Janela de contexto do modelo; prompt + resposta nunca a ultrapassam.
+    LLM_CONTEXT_TOKENS: int = 4096
+    # Número máximo de requisições simultâneas ao servidor do LLM.
+    # 1 mantém o comportamento sequencial original.
+    LLM_MAX_CONCURRENCY: int = 1
+    # Se True, o limite de concorrência é ajustado em tempo de execução entre
+    # LLM_MIN_CONCURRENCY e LLM_MAX_CONCURRENCY conforme latência e erros.
+    LLM_ADAPTIVE_CONCURRENCY: bool = False
+    LLM_MIN_CONCURRENCY: int = 1
+    # Lista (JSON) de servidores de inferência. Se vazia, usa apenas LLM_BASE_URL.
+    # Ex: '[{"base_url": "http://10.0.0.2:1234/v1", "weight": 2, "max_concurrency": 4}]'
+    LLM_ENDPOINTS: List[EndpointConfig] = []
+    # Falhas de conexão consecutivas até um servidor sair de rotação, e
+    # segundos até que ele seja testado novamente.
+    LLM_ENDPOINT_FAILURE_THRESHOLD: int = 3
+    LLM_ENDPOINT_COOLDOWN: float = 30.0
+    # Quantidade de resenhas enviadas em uma única requisição.
+    # 1 desativa o empacotamento (uma requisição por resenha).
+    LLM_PACK_SIZE: int = 1
+    # Envia uma única requisição para resenhas com o mesmo texto normalizado
+    # e idioma, repassando a análise a todas elas.
+    LLM_DEDUP_ENABLED: bool = True
+
+    # --- Cache persistente de respostas do LLM ---
+    # Respostas são reaproveitadas entre execuções quando modelo, prompt,
+    # temperatura e max_tokens não mudam.
+    LLM_CACHE_ENABLED: bool = True
+    # Ignora as respostas já armazenadas (força nova inferência), mas continua
+    # gravando as novas respostas no cache.
+    LLM_CACHE_BYPASS: bool = False
+    # Tamanho máximo do cache em megabytes; as entradas menos usadas
+    # recentemente são removidas quando o limite é ultrapassado.
+    LLM_CACHE_MAX_MB: int = 512
+
+    # --- Leitura do arquivo de resenhas ---
+    # Processos usados para parsear o arquivo (incluindo a detecção de idioma).
+    # 1 lê o arquivo sequencialmente, sob demanda; 0 usa todas as CPUs.
+    PARSER_WORKERS: int = 1
+    # Tamanho aproximado, em megabytes, de cada intervalo do arquivo enviado
+    # a um processo.
+    PARSER_CHUNK_MB: int = 8
+    # Detecção de idioma em camadas: textos claramente em português ou inglês
+    # são decididos por uma heurística (palavras funcionais e caracteres) e
+    # apenas os ambíguos passam pelo langdetect. Desativada por padrão até que
+    # o `scripts/bench_language_detection.py` confirme a concordância com o
+    # langdetect sobre os dados reais.
+    LANG_DETECT_FAST_PATH: bool = False
+    # Cache da detecção de idioma: LRU em memória e, com LANG_CACHE_PERSISTENT,
+    # um arquivo em CACHE_DIR reaproveitado entre execuções.
+    LANG_CACHE_ENABLED: bool = True
+    LANG_CACHE_PERSISTENT: bool = True
+    LANG_CACHE_MEMORY_ENTRIES: int = 100_000
+    # Máximo de entradas no arquivo; as mais antigas são removidas.
+    LANG_CACHE_MAX_ENTRIES: int = 2_000_000
+    # Cache colunar das resenhas parseadas, por conteúdo do arquivo de origem:
+    # se o arquivo não mudou, o parsing e a detecção de idioma são dispensados.
+    # Desativado por padrão: com ele, a origem inteira é lida (hash) antes da
+    # primeira resenha e as resenhas parseadas ficam em memória até o fim.
+    PARSED_CACHE_ENABLED: bool = False
+    # Quantidade de arquivos de cache mantidos (os mais antigos são removidos).
+    PARSED_CACHE_MAX_FILES: int = 8
 
     # --- Configurações de Logging (lidas do .env) ---
     LOG_LEVEL: str = "INFO"
@@ -49,6 +126,9 @@ class Settings(BaseSettings):
     OUTPUTS_DIR: Path = PROJECT_ROOT / "outputs"
     RAW_DATA_DIR: Path = DATA_DIR / "raw"
     SRC_DIR: Path = PROJECT_ROOT / "src"
+    CACHE_DIR: Path = DATA_DIR / "cache"
+    JOURNAL_PATH: Path = OUTPUTS_DIR / "llm_journal.jsonl"
+    INCREMENTAL_STATE_PATH: Path = CACHE_DIR / "incremental_state.json"
 
 
 # 3. Cria uma única instância das configurações para ser usada em todo o projeto.
@@ -0,0 +1,88 @@
+"""
+Agrupamento de resenhas duplicadas antes da inferência.
+
+Resenhas com o mesmo texto normalizado e o mesmo idioma (ex: "Ótimo app",
+"Muito bom", cópias de spam) recebem uma única requisição ao LLM; a resposta
+é então repassada a todas as resenhas do grupo, cada uma mantendo o seu
+próprio usuário e texto original.
+"""
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from src.models import ReviewRaw
+from src.tools.text_utils import normalize_whitespace
+
+logger = logging.getLogger(__name__)
+
+
+def dedup_key(review: ReviewRaw) -> Tuple[str, str]:
+    """
+    Chave de deduplicação: texto normalizado (NFKC, sem diferença entre
+    maiúsculas e minúsculas e com espaços normalizados) e idioma.
+    """
+    text = normalize_whitespace(unicodedata.normalize("NFKC", review.text)).casefold()
+    return text, review.language
+
+
+class DuplicateTracker:
+    """
+    Deduplicação incremental para resenhas lidas de um fluxo.
+
+    Não exige a lista completa: cada resenha é registrada com `add` assim
+    que é lida, e a primeira de cada grupo é o representante enviado ao LLM.
+    Apenas um hash da chave de cada grupo é mantido, junto com as duplicatas
+    que aguardam a resposta do representante e as respostas dos grupos já
+    resolvidos.
+    """
+
+    def __init__(self):
+        self._waiting: Dict[str, List[Tuple[int, ReviewRaw]]] = {}
+        self._resolved: Dict[str, str] = {}
+        self.total = 0
+        self.unique = 0
+
+    @staticmethod
+    def _hash(review: ReviewRaw) -> str:
+        text, language = dedup_key(review)
+        return hashlib.sha1(f"{language}\x1f{text}".encode("utf-8")).hexdigest()
+
+    def add(self, index: int, review: ReviewRaw) -> Tuple[bool, Optional[str]]:
+        """
+        Registra uma resenha lida.
+
+        Returns:
+            `(True, None)` se a resenha é a primeira do seu grupo e deve ser
+            enviada ao LLM; `(False, resposta)` se o grupo já foi resolvido;
+            `(False, None)` se a resenha aguarda a resposta do representante.
+        """
+        self.total += 1
+        key = self._hash(review)
+        if key in self._resolved:
+            return False, self._resolved[key]
+        if key in self._waiting:
+            self._waiting[key].append((index, review))
+            return False, None
+        self._waiting[key] = []
+        self.unique += 1
+        return True, None
+
+    def resolve(self, review: ReviewRaw, response: str) -> List[Tuple[int, ReviewRaw]]:
+        """
+        Registra a resposta do representante do grupo de `review` e retorna
+        as duplicatas `(índice, resenha)` que aguardavam por ela.
+        """
+        key = self._hash(review)
+        self._resolved[key] = response
+        return self._waiting.pop(key, [])
+
+    def log_stats(self) -> None:
+        """Registra no log a razão de deduplicação do fluxo."""
+        saved = self.total - self.unique
+        logger.info(
+            "Deduplicação: %d resenhas -> %d únicas (razão %.2f; %d requisições "
+            "economizadas, %.1f%%).",
+            self.total, self.unique, self.total / self.unique if self.unique else 1.0,
+            saved, 100 * saved / self.total if self.total else 0.0,
+        )
@@ -0,0 +1,132 @@
+"""
+Diário (journal) de respostas do LLM para retomar execuções interrompidas.
+
+Cada resposta concluída é anexada a um arquivo JSON Lines com o id da
+resenha, um hash do seu conteúdo e a resposta bruta. Se o processo cair no
+meio da etapa do LLM, uma nova execução com `--resume` reaproveita as
+respostas registradas e envia apenas os prompts que faltam.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+from src.config import settings
+from src.llm_fallbacks import ERROR_RESPONSES
+from src.models import ReviewRaw
+
+logger = logging.getLogger(__name__)
+
+JournalKey = Tuple[str, str]
+# Tamanho dos blocos lidos do fim do arquivo ao procurar a última linha completa.
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+class ResponseJournal:
+    """
+    Registro append-only das respostas do LLM já concluídas.
+
+    As linhas são gravadas e descarregadas (`flush`) uma a uma; um `fsync`
+    é feito no máximo a cada `fsync_interval` segundos, limitando a perda a
+    esse intervalo mesmo em caso de queda do sistema operacional.
+    """
+
+    def __init__(self, path: Path | None = None, fsync_interval: float = 1.0):
+        self.path = Path(path or settings.JOURNAL_PATH)
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._last_fsync = 0.0
+
+    @staticmethod
+    def content_hash(review: ReviewRaw) -> str:
+        """Hash do conteúdo da resenha (usuário, texto e idioma)."""
+        payload = "\x1f".join([review.user, review.text, review.language])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def key(cls, review: ReviewRaw) -> JournalKey:
+        """Chave que identifica uma resenha no journal."""
+        return review.id, cls.content_hash(review)
+
+    def load(self) -> Dict[JournalKey, str]:
+        """
+        Lê as respostas já registradas.
+
+        Linhas corrompidas (por exemplo, a última linha de um processo que
+        caiu durante a escrita) são ignoradas.
+        """
+        responses: Dict[JournalKey, str] = {}
+        if not self.path.is_file():
+            return responses
+        with self.path.open("r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                    responses[(record["id"], record["hash"])] = record["response"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(
+                        "Linha %d do journal ignorada (incompleta ou inválida).",
+                        line_number,
+                    )
+        logger.info("%d respostas carregadas do journal %s.", len(responses), self.path)
+        return responses
+
+    def _drop_partial_last_line(self) -> None:
+        """
+        Remove uma última linha sem quebra de linha (escrita interrompida),
+        para que o próximo registro não seja anexado a ela.
+        """
+        with self.path.open("rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - _TAIL_BLOCK_SIZE)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                logger.warning(
+                    "Linha incompleta no fim do journal descartada (%d bytes).",
+                    end - position,
+                )
+                f.truncate(position)
+
+    def open(self, resume: bool) -> None:
+        """Abre o journal para escrita; sem `resume`, descarta o conteúdo anterior."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.is_file():
+            self._drop_partial_last_line()
+        self._file = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    def append(self, review: ReviewRaw, response: str) -> None:
+        """
+        Registra a resposta de uma resenha.
+
+        Respostas de fallback (erros de conexão/API) não são registradas,
+        para que sejam tentadas novamente ao retomar.
+        """
+        if response in ERROR_RESPONSES:
+            return
+        review_id, content_hash = self.key(review)
+        record = {"id": review_id, "hash": content_hash, "response": response}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self) -> None:
+        """Grava os dados pendentes em disco e fecha o arquivo."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
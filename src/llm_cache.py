@@ -0,0 +1,159 @@
+"""
+Cache persistente (SQLite) para respostas do LLM.
+
+As respostas são indexadas por um hash do modelo, do prompt, da temperatura
+e do max_tokens, de modo que uma nova execução do pipeline com os mesmos
+parâmetros não precise refazer a inferência.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Cache de respostas do LLM armazenado em um arquivo SQLite.
+
+    É seguro para uso a partir de várias threads. Quando o tamanho total das
+    respostas ultrapassa `max_bytes`, as entradas acessadas há mais tempo são
+    removidas até que o cache volte a 90% do limite.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int | None = None,
+        bypass: bool | None = None,
+    ):
+        self.path = Path(path or settings.CACHE_DIR / "llm_responses.sqlite3")
+        self.max_bytes = (
+            max_bytes if max_bytes is not None
+            else settings.LLM_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.bypass = settings.LLM_CACHE_BYPASS if bypass is None else bypass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed_at"
+            " ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(
+        model: str, prompt: str, temperature: float, max_tokens: int
+    ) -> str:
+        """Gera a chave do cache a partir dos parâmetros de geração."""
+        payload = json.dumps(
+            [model, prompt, float(temperature), int(max_tokens)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna a resposta armazenada para `key` ou None em caso de miss."""
+        if self.bypass:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Armazena uma resposta e aplica a política de remoção por tamanho."""
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas até atingir 90% de `max_bytes`."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        removed = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            removed.append((key,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", removed)
+        self.evictions += len(removed)
+        logger.info(
+            "Cache do LLM excedeu %d bytes; %d entradas removidas.",
+            self.max_bytes, len(removed),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """Tamanho total das respostas armazenadas, em bytes."""
+        return self._size
+
+    def stats(self) -> Dict[str, float]:
+        """Retorna os contadores de uso do cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size_bytes": self._size,
+        }
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco de dados."""
+        with self._lock:
+            self._conn.close()
@@ -2,7 +2,11 @@
 Script para processar prompts com um modelo LLM.
 """
 import logging
-from typing import List
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from collections.abc import Sized
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 from openai import (
     APIConnectionError,
     APIError,
@@ -10,14 +14,41 @@ from openai import (
     OpenAI,
 )
 
-from src.config import settings
+from src.concurrency import AdaptiveConcurrencyController
+from src.config import EndpointConfig, settings
+from src.llm_cache import LLMResponseCache
+# Reexportadas aqui por compatibilidade: o restante do projeto as importa
+# de src.llm_fallbacks para não carregar o cliente OpenAI.
+from src.llm_fallbacks import API_ERROR_RESPONSE, CONNECTION_ERROR_RESPONSE
+from src.llm_pool import EndpointPool
+from src.tools.token_budget import fit_to_context
 
 logger = logging.getLogger(__name__)
 
+# Códigos HTTP que indicam sobrecarga do servidor e reduzem o limite de
+# concorrência adaptativo: rate limit (429) e erros do servidor (5xx).
+_OVERLOAD_STATUS_CODES = frozenset({429}) | frozenset(range(500, 600))
+
+__all__ = [
+    "API_ERROR_RESPONSE",
+    "CONNECTION_ERROR_RESPONSE",
+    "LLMClient",
+    "NoEndpointAvailableError",
+]
+
+
+class NoEndpointAvailableError(Exception):
+    """Nenhum servidor do pool está em rotação para atender a requisição."""
+
+
 class LLMClient:
     """
     Cliente para interagir com um modelo de linguagem grande (LLM) via API
     compatível com OpenAI.
+
+    Com uma lista de `endpoints` (ou `LLM_ENDPOINTS`), as requisições são
+    distribuídas entre vários servidores por um `EndpointPool`; caso
+    contrário, todas vão para `base_url`.
     """
 
     def __init__(
@@ -25,78 +56,310 @@ class LLMClient:
         base_url: str | None = None,
         api_key: str | None = None,
         model: str | None = None,
+        max_concurrency: int | None = None,
+        cache: LLMResponseCache | None = None,
+        endpoints: List[EndpointConfig] | None = None,
+        adaptive: bool | None = None,
     ):
         _base_url = base_url or settings.LLM_BASE_URL
         _api_key = api_key or settings.LLM_API_KEY
         self.model = model or settings.LLM_MODEL
-        self.client = OpenAI(
-            base_url=_base_url,
-            api_key=_api_key,
-            timeout=settings.LLM_TIMEOUT,
-            max_retries=settings.LLM_MAX_RETRIES,
+        self.cache = cache
+
+        if endpoints is None:
+            # Uma base_url explícita tem precedência sobre LLM_ENDPOINTS.
+            endpoints = settings.LLM_ENDPOINTS if base_url is None else []
+        self.pool = EndpointPool(endpoints, api_key=_api_key) if endpoints else None
+
+        if self.pool is not None:
+            # Mantém `self.client` para compatibilidade (ex: max_retries nos logs).
+            self.client = self.pool.endpoints[0].client
+            default_concurrency = self.pool.max_concurrency
+        else:
+            self.client = OpenAI(
+                base_url=_base_url,
+                api_key=_api_key,
+                timeout=settings.LLM_TIMEOUT,
+                max_retries=settings.LLM_MAX_RETRIES,
+            )
+            default_concurrency = settings.LLM_MAX_CONCURRENCY
+        self.max_concurrency = max(1, max_concurrency or default_concurrency)
+
+        adaptive = settings.LLM_ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        # Com controle adaptativo, `max_concurrency` passa a ser o teto do limite.
+        self.concurrency = (
+            AdaptiveConcurrencyController(max_limit=self.max_concurrency)
+            if adaptive and self.max_concurrency > 1 else None
+        )
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Número de requisições que podem estar em andamento agora."""
+        if self.concurrency is not None:
+            return self.concurrency.limit
+        return self.max_concurrency
+
+    def _create_completion(
+        self, client: OpenAI, prompt: str, temperature: float, max_tokens: int
+    ) -> str:
+        """Executa uma chamada de chat completion e retorna o texto gerado."""
+        resp = client.chat.completions.create(
+            model=self.model,
+            messages=[
+                # Removido o system prompt para ser mais direto, o prompt
+                # do usuário já é bem específico
+                {"role": "user", "content": prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            # --- MELHORIA: Força o LLM a responder em modo JSON ---
+            # Caso a API suporte, usar este parâmetro para garantir que a
+            # resposta seja um JSON válido.
+            #  response_format={"type": "json_object"},
         )
+        return resp.choices[0].message.content or ""  # Garante que não seja None
+
+    def _create_completion_pooled(
+        self, prompt: str, temperature: float, max_tokens: int
+    ) -> str:
+        """
+        Executa a chamada no servidor menos carregado do pool.
+
+        Em caso de erro de conexão, tenta os demais servidores antes de
+        propagar o último erro.
+        """
+        tried = []
+        last_error: APIConnectionError | None = None
+        while True:
+            endpoint = self.pool.acquire(exclude=tuple(tried))
+            if endpoint is None:
+                if last_error is not None:
+                    raise last_error
+                raise NoEndpointAvailableError(
+                    "Nenhum servidor do LLM ficou disponível dentro do tempo de espera."
+                )
+            try:
+                text = self._create_completion(
+                    endpoint.client, prompt, temperature, max_tokens
+                )
+            except APIConnectionError as e:
+                self.pool.release(endpoint, connection_failed=True)
+                tried.append(endpoint)
+                last_error = e
+                continue
+            except BaseException:
+                self.pool.release(endpoint)
+                raise
+            self.pool.release(endpoint)
+            return text
+
+    def _process_prompt(
+        self,
+        index: int,
+        prompt: str,
+        total: int | None,
+        temperature: float | None,
+        max_tokens: int | None = None,
+    ) -> str:
+        """
+        Envia um único prompt ao LLM e retorna a resposta bruta.
+
+        Erros de conexão e de API são convertidos em respostas JSON de
+        fallback; erros de autenticação são propagados. Se houver um cache
+        configurado, respostas já conhecidas são retornadas sem chamar o LLM
+        e apenas respostas bem-sucedidas são armazenadas.
+        """
+        _temperature = (
+            temperature if temperature is not None else settings.LLM_TEMPERATURE
+        )
+        max_tokens = fit_to_context(prompt, max_tokens or settings.LLM_MAX_TOKENS)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                self.model, prompt, _temperature, max_tokens
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Prompt %d encontrado no cache.", index + 1)
+                return cached
+
+        started_at = time.monotonic()
+        try:
+            logger.info(
+                "Processando prompt %d de %s...", index + 1,
+                total if total is not None else "?",
+            )
+            if self.pool is not None:
+                text = self._create_completion_pooled(prompt, _temperature, max_tokens)
+            else:
+                text = self._create_completion(
+                    self.client, prompt, _temperature, max_tokens
+                )
+            if self.concurrency is not None:
+                self.concurrency.record_success(time.monotonic() - started_at)
+            if cache_key is not None:
+                self.cache.set(cache_key, text)
+            return text
+        except AuthenticationError as e:
+            # Erro de autenticação é fatal. Aborta o batch.
+            logger.critical(
+                "Erro de autenticação com a API do LLM. Verifique sua "
+                "API Key. Abortando. Erro: %s", e
+            )
+            raise
+        except APIConnectionError as e:  # Também captura APITimeoutError
+            if self.concurrency is not None:
+                self.concurrency.record_failure(started_at)
+            # Erros de conexão/timeout após as tentativas. Loga e continua.
+            logger.error(
+                "Não foi possível conectar ao LLM para o prompt %d "
+                "após %d tentativas. Erro: %s",
+                index + 1, self.client.max_retries, e
+            )
+            return CONNECTION_ERROR_RESPONSE
+        except NoEndpointAvailableError as e:
+            logger.error("Prompt %d não enviado: %s", index + 1, e)
+            return CONNECTION_ERROR_RESPONSE
+        except APIError as e:
+            status_code = getattr(e, "status_code", None)
+            if self.concurrency is not None and status_code in _OVERLOAD_STATUS_CODES:
+                self.concurrency.record_failure(started_at, reason=f"HTTP {status_code}")
+            # Outros erros de API (ex: rate limit, bad request). Loga e continua.
+            logger.error(
+                "Ocorreu um erro na API do LLM no prompt %d: %s", index + 1, e
+            )
+            # Retorna um JSON de erro para não quebrar o pipeline.
+            # O processador usará como fallback.
+            return API_ERROR_RESPONSE
 
     def batch_process(
         self,
         prompts: List[str],
         temperature: float | None = None,
+        max_tokens: Sequence[int] | None = None,
     ) -> List[str]:
-        """Envia uma lista de prompts e retorna as respostas brutas do LLM."""
+        """
+        Envia uma lista de prompts e retorna as respostas brutas do LLM.
+
+        Com `max_concurrency` > 1, até `max_concurrency` requisições ficam em
+        andamento ao mesmo tempo. As respostas são sempre devolvidas na
+        mesma ordem dos prompts.
+
+        `max_tokens`, se informado, define o limite de geração de cada prompt
+        (mesmo tamanho de `prompts`); caso contrário usa `LLM_MAX_TOKENS`. Em
+        ambos os casos o limite é reduzido, se necessário, para que prompt e
+        resposta caibam em `LLM_CONTEXT_TOKENS`.
+        """
+        outputs: List[str] = [""] * len(prompts)
+        for index, text in self.iter_process(prompts, temperature, max_tokens):
+            outputs[index] = text
+        return outputs
+
+    def iter_process(
+        self,
+        prompts: Iterable[str],
+        temperature: float | None = None,
+        max_tokens: Iterable[int] | None = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Envia os prompts e produz pares `(índice, resposta)` à medida que as
+        requisições terminam.
+
+        No modo sequencial os pares saem na ordem dos prompts; no modo
+        concorrente saem na ordem de conclusão. Interromper a iteração
+        cancela as requisições que ainda não foram iniciadas.
+
+        `prompts` pode ser qualquer iterável (inclusive um gerador): cada
+        prompt só é lido quando há espaço para uma nova requisição.
+        """
+        total = len(prompts) if isinstance(prompts, Sized) else None
+        if max_tokens is None:
+            budgets: Iterable[int | None] = repeat(None)
+        else:
+            budgets = max_tokens
+            if total is not None and isinstance(max_tokens, Sized) \
+                    and len(max_tokens) != total:
+                raise ValueError("max_tokens deve ter o mesmo tamanho de prompts.")
+        return self.iter_requests(zip(prompts, budgets), temperature, total)
+
+    def iter_requests(
+        self,
+        requests: Iterable[Tuple[str, int | None]],
+        temperature: float | None = None,
+        total: int | None = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Variante de `iter_process` que recebe pares `(prompt, max_tokens)`.
+
+        Útil quando prompt e orçamento são produzidos juntos por um gerador.
+        `total`, se conhecido, é usado apenas nos logs de progresso.
+        """
         logger.info(
-            "Iniciando processamento em lote com max_retries=%d.",
-            self.client.max_retries,
+            "Iniciando processamento em lote com max_retries=%d e "
+            "max_concurrency=%d.",
+            self.client.max_retries, self.max_concurrency,
         )
-        outputs = []
-        for i, p in enumerate(prompts):
-            try:
-                logger.info("Processando prompt %d de %d...", i + 1, len(prompts))
-                resp = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        # Removido o system prompt para ser mais direto, o prompt
-                        # do usuário já é bem específico
-                        {"role": "user", "content": p},
-                    ],
-                    temperature=(
-                        temperature
-                        if temperature is not None
-                        else settings.LLM_TEMPERATURE
-                    ),
-                    max_tokens=settings.LLM_MAX_TOKENS,
-                    # --- MELHORIA: Força o LLM a responder em modo JSON ---
-                    # Caso a API suporte, usar este parâmetro para garantir que a
-                    # resposta seja um JSON válido.
-                    #  response_format={"type": "json_object"},
-                )
-                text = resp.choices[0].message.content
-                outputs.append(text or "")  # Garante que não seja None
-            except AuthenticationError as e:
-                # Erro de autenticação é fatal. Aborta o batch.
-                logger.critical(
-                    "Erro de autenticação com a API do LLM. Verifique sua "
-                    "API Key. Abortando. Erro: %s", e
-                )
-                raise
-            except APIConnectionError as e:  # Também captura APITimeoutError
-                # Erros de conexão/timeout após as tentativas. Loga e continua.
-                logger.error(
-                    "Não foi possível conectar ao LLM para o prompt %d "
-                    "após %d tentativas. Erro: %s",
-                    i + 1, self.client.max_retries, e
-                )
-                outputs.append(
-                    '{"translation_pt": "ERRO DE CONEXÃO", "sentiment": "neutral"}'
-                )
-            except APIError as e:
-                # Outros erros de API (ex: rate limit, bad request). Loga e continua.
-                logger.error(
-                    "Ocorreu um erro na API do LLM no prompt %d: %s", i + 1, e
-                )
-                # Retorna um JSON de erro para não quebrar o pipeline.
-                # O processador usará como fallback.
-                outputs.append(
-                    '{"translation_pt": "ERRO NA API", "sentiment": "neutral"}'
-                )
+        processed = 0
+        if self.max_concurrency == 1 or (total is not None and total <= 1):
+            for i, (prompt, budget) in enumerate(requests):
+                yield i, self._process_prompt(i, prompt, total, temperature, budget)
+                processed += 1
+        else:
+            for pair in self._iter_requests_concurrent(requests, temperature, total):
+                yield pair
+                processed += 1
 
-        logger.info("Processados %d prompts pelo LLM.", len(outputs))
-        return outputs
+        logger.info("Processados %d prompts pelo LLM.", processed)
+        if self.cache is not None:
+            logger.info("Estatísticas do cache do LLM: %s", self.cache.stats())
+        if self.pool is not None:
+            logger.info("Estado dos servidores do LLM: %s", self.pool.stats())
+        if self.concurrency is not None:
+            metrics = self.concurrency.metrics()
+            logger.info(
+                "Concorrência adaptativa: limite final %d, %d ajustes.",
+                metrics["limit"], len(metrics["changes"]),
+            )
+
+    def _iter_requests_concurrent(
+        self,
+        requests: Iterable[Tuple[str, int | None]],
+        temperature: float | None,
+        total: int | None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Processa as requisições em um pool de threads, mantendo no máximo
+        `concurrency_limit` requisições em andamento (o limite é reavaliado a
+        cada conclusão quando o controle adaptativo está ativo).
+        """
+        max_workers = self.max_concurrency
+        if total is not None:
+            max_workers = max(1, min(max_workers, total))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        source = enumerate(requests)
+        exhausted = False
+        pending: Dict[Future, int] = {}
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency_limit:
+                    try:
+                        index, (prompt, budget) = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(
+                        self._process_prompt, index, prompt, total, temperature, budget
+                    )
+                    pending[future] = index
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    # `result()` propaga o AuthenticationError da falha fatal.
+                    yield index, future.result()
+        finally:
+            # Cancela as requisições que ainda não começaram (erro fatal ou
+            # consumidor que parou de iterar) e aguarda as que estão em curso.
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,16 @@
+"""
+Respostas de fallback do LLM.
+
+Ficam em um módulo próprio, sem dependências, para que o journal, o
+empacotamento e o processador possam reconhecê-las sem importar o cliente
+OpenAI (cuja importação é lenta).
+"""
+
+# Respostas de fallback devolvidas quando uma requisição falha. O processador
+# as converte em um ReviewProcessed neutro.
+CONNECTION_ERROR_RESPONSE = (
+    '{"translation_pt": "ERRO DE CONEXÃO", "sentiment": "neutral"}'
+)
+API_ERROR_RESPONSE = '{"translation_pt": "ERRO NA API", "sentiment": "neutral"}'
+
+ERROR_RESPONSES = frozenset({CONNECTION_ERROR_RESPONSE, API_ERROR_RESPONSE})
@@ -0,0 +1,192 @@
+"""
+Pool de servidores de inferência compatíveis com OpenAI.
+
+Distribui as requisições entre vários servidores (LM Studio, Ollama, ...)
+escolhendo sempre o servidor saudável menos carregado em relação ao seu peso.
+Servidores com falhas de conexão consecutivas saem de rotação e voltam a ser
+testados com uma única requisição depois de um período de espera.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from openai import OpenAI
+
+from src.config import EndpointConfig, settings
+
+logger = logging.getLogger(__name__)
+
+
+class Endpoint:
+    """Estado de um servidor de inferência dentro do pool."""
+
+    def __init__(self, config: EndpointConfig, client: OpenAI):
+        self.base_url = config.base_url
+        self.weight = max(config.weight, 1e-6)
+        self.max_concurrency = max(1, config.max_concurrency)
+        self.client = client
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.down_until: Optional[float] = None  # None = em rotação
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Indica se o servidor está em rotação."""
+        return self.down_until is None
+
+    def load(self) -> float:
+        """Carga relativa ao peso, usada para escolher o servidor."""
+        return (self.in_flight + 1) / self.weight
+
+
+class EndpointPool:
+    """
+    Seleciona servidores para cada requisição com roteamento por carga.
+
+    É seguro para uso a partir de várias threads. `acquire` bloqueia enquanto
+    todos os servidores disponíveis estão no limite de concorrência e, quando
+    todos estão fora de rotação, espera até o fim do período de espera mais
+    próximo para testar o servidor novamente. Retorna None apenas se não
+    houver servidor a esperar ou se `wait_timeout` se esgotar.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[EndpointConfig],
+        api_key: str | None = None,
+        failure_threshold: int | None = None,
+        cooldown: float | None = None,
+        wait_timeout: float | None = None,
+    ):
+        if not endpoints:
+            raise ValueError("O pool precisa de pelo menos um servidor.")
+        self.failure_threshold = max(
+            1, failure_threshold or settings.LLM_ENDPOINT_FAILURE_THRESHOLD
+        )
+        self.cooldown = (
+            cooldown if cooldown is not None else settings.LLM_ENDPOINT_COOLDOWN
+        )
+        self.wait_timeout = (
+            wait_timeout if wait_timeout is not None else settings.LLM_TIMEOUT
+        )
+        self.endpoints = [
+            Endpoint(
+                config,
+                OpenAI(
+                    base_url=config.base_url,
+                    api_key=config.api_key or api_key or settings.LLM_API_KEY,
+                    timeout=settings.LLM_TIMEOUT,
+                    max_retries=settings.LLM_MAX_RETRIES,
+                ),
+            )
+            for config in endpoints
+        ]
+        self._cond = threading.Condition()
+
+    @property
+    def max_concurrency(self) -> int:
+        """Soma dos limites de concorrência de todos os servidores."""
+        return sum(e.max_concurrency for e in self.endpoints)
+
+    def _is_available(self, endpoint: Endpoint, now: float) -> bool:
+        """Servidor em rotação, ou fora de rotação e pronto para ser testado."""
+        if endpoint.healthy:
+            return True
+        return not endpoint.probing and now >= endpoint.down_until
+
+    def acquire(
+        self, exclude: tuple = (), timeout: float | None = None
+    ) -> Optional[Endpoint]:
+        """
+        Reserva o servidor disponível menos carregado.
+
+        Se todos os servidores estiverem fora de rotação, espera até que o
+        primeiro deles possa ser testado novamente (ou até o fim do teste em
+        andamento), em vez de desistir imediatamente.
+
+        Args:
+            exclude: Servidores que não devem ser escolhidos (ex: servidores
+                que já falharam para a requisição atual).
+            timeout: Tempo máximo de espera, em segundos (padrão:
+                `wait_timeout` do pool).
+
+        Returns:
+            O servidor reservado, ou None se nenhum puder ser usado dentro
+            do tempo de espera.
+        """
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                candidates = [e for e in self.endpoints if e not in exclude]
+                available = [e for e in candidates if self._is_available(e, now)]
+                if not available:
+                    if not candidates or now >= deadline:
+                        return None
+                    # Todos fora de rotação: espera o fim do período de espera
+                    # mais próximo, ou o fim de um teste em andamento.
+                    waiting = [e.down_until for e in candidates if not e.probing]
+                    wake_at = min(waiting + [deadline])
+                    self._cond.wait(max(wake_at - now, 0))
+                    continue
+                free = [e for e in available if e.in_flight < e.max_concurrency]
+                if free:
+                    endpoint = min(free, key=Endpoint.load)
+                    if not endpoint.healthy:
+                        endpoint.probing = True
+                        logger.info(
+                            "Testando novamente o servidor %s.", endpoint.base_url
+                        )
+                    endpoint.in_flight += 1
+                    endpoint.requests += 1
+                    return endpoint
+                self._cond.wait()
+
+    def release(self, endpoint: Endpoint, connection_failed: bool = False) -> None:
+        """
+        Libera a reserva de um servidor e atualiza o seu estado de saúde.
+
+        Args:
+            endpoint: O servidor obtido com `acquire`.
+            connection_failed: True se a requisição falhou por erro de
+                conexão/timeout (outros erros não afetam a saúde).
+        """
+        with self._cond:
+            endpoint.in_flight -= 1
+            was_probing, endpoint.probing = endpoint.probing, False
+            if connection_failed:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if was_probing or endpoint.consecutive_failures >= self.failure_threshold:
+                    endpoint.down_until = time.monotonic() + self.cooldown
+                    logger.warning(
+                        "Servidor %s fora de rotação por %.0fs após %d falhas "
+                        "de conexão consecutivas.",
+                        endpoint.base_url, self.cooldown,
+                        endpoint.consecutive_failures,
+                    )
+            else:
+                if not endpoint.healthy:
+                    logger.info("Servidor %s de volta à rotação.", endpoint.base_url)
+                endpoint.consecutive_failures = 0
+                endpoint.down_until = None
+            self._cond.notify_all()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Retorna o estado e os contadores de cada servidor."""
+        with self._cond:
+            return [
+                {
+                    "base_url": e.base_url,
+                    "healthy": e.healthy,
+                    "in_flight": e.in_flight,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                }
+                for e in self.endpoints
+            ]
@@ -4,9 +4,13 @@ Script para configurar logs com horário de Brasília (UTC-3).
 
 import logging
 from datetime import datetime
-import pytz
+from functools import lru_cache
 
-brasilia_tz = pytz.timezone("America/Sao_Paulo")
+@lru_cache(maxsize=None)
+def brasilia_tz():
+    """Fuso horário de Brasília, carregado (com o pytz) apenas no primeiro log."""
+    import pytz  # pylint: disable=import-outside-toplevel
+    return pytz.timezone("America/Sao_Paulo")
 
 class TZFormatter(logging.Formatter):
     """Formatter de log que converte o timestamp para o fuso horário de Brasília."""
@@ -21,7 +25,7 @@ class TZFormatter(logging.Formatter):
         Returns:
             str: A string de data/hora formatada.
         """
-        dt = datetime.fromtimestamp(record.created, tz=brasilia_tz)
+        dt = datetime.fromtimestamp(record.created, tz=brasilia_tz())
         return dt.strftime(datefmt or "%Y-%m-%d %H:%M:%S")
 
 def configure_logging(level: int = logging.INFO) -> None:
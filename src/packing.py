@@ -0,0 +1,140 @@
+"""
+Empacotamento de várias resenhas em uma única requisição ao LLM.
+
+Em vez de uma requisição por resenha, até `pack_size` resenhas são enviadas
+em um só prompt (as instruções são repetidas uma única vez) e o LLM devolve
+uma lista JSON com um objeto por resenha. Quando a resposta de um pacote vem
+mal formada ou sem alguns ids, apenas as resenhas faltantes são reenviadas,
+em pacotes divididos ao meio, até chegar ao prompt individual.
+"""
+import json
+import logging
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+
+from src.config import settings
+from src.llm_fallbacks import ERROR_RESPONSES
+from src.models import ReviewRaw
+from src.tools.prompt_builder import build_json_prompt, build_packed_json_prompt
+from src.tools.token_budget import budget_reviews
+from src.utils.helpers import safe_json_list_load
+
+if TYPE_CHECKING:
+    from src.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+
+def make_packs(reviews: List[ReviewRaw], pack_size: int) -> List[List[int]]:
+    """
+    Agrupa os índices das resenhas em pacotes de até `pack_size` itens.
+
+    Um pacote nunca contém dois ids iguais, para que a resposta do LLM
+    possa ser associada sem ambiguidade a cada resenha.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    current_ids = set()
+    for i, review in enumerate(reviews):
+        if len(current) >= pack_size or review.id in current_ids:
+            packs.append(current)
+            current, current_ids = [], set()
+        current.append(i)
+        current_ids.add(review.id)
+    if current:
+        packs.append(current)
+    return packs
+
+
+def split_packed_response(text: str, ids: List[str]) -> Dict[str, str]:
+    """
+    Separa a resposta de um pacote em uma resposta JSON por id de resenha.
+
+    Itens sem id, com ids desconhecidos ou que não sejam objetos são
+    ignorados; os ids ausentes simplesmente não aparecem no resultado.
+    """
+    expected = set(ids)
+    responses: Dict[str, str] = {}
+    for item in safe_json_list_load(text):
+        if not isinstance(item, dict) or "id" not in item:
+            continue
+        review_id = str(item.pop("id")).strip()
+        if review_id in expected and review_id not in responses:
+            responses[review_id] = json.dumps(item, ensure_ascii=False)
+    return responses
+
+
+def iter_packed(
+    reviews: List[ReviewRaw],
+    llm_client: "LLMClient",
+    pack_size: int | None = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Obtém uma resposta do LLM por resenha usando requisições empacotadas.
+
+    Produz pares `(índice da resenha, resposta JSON)` assim que cada resenha
+    tem sua resposta definida, no mesmo formato esperado por
+    `map_llm_response_to_processed`.
+    """
+    pack_size = max(1, pack_size or settings.LLM_PACK_SIZE)
+    prompt_reviews, review_budgets = budget_reviews(reviews)
+    pending = make_packs(reviews, pack_size)
+    round_number = 0
+
+    while pending:
+        round_number += 1
+        prompts, budgets = [], []
+        for group in pending:
+            if len(group) == 1:
+                prompts.append(build_json_prompt(prompt_reviews[group[0]]))
+            else:
+                prompts.append(
+                    build_packed_json_prompt([prompt_reviews[i] for i in group])
+                )
+            budgets.append(sum(review_budgets[i] for i in group))
+
+        logger.info(
+            "Rodada %d de empacotamento: %d requisições para %d resenhas.",
+            round_number, len(prompts), sum(len(g) for g in pending),
+        )
+
+        next_pending: List[List[int]] = []
+        for group_index, response in llm_client.iter_process(prompts, max_tokens=budgets):
+            group = pending[group_index]
+            if len(group) == 1 or response in ERROR_RESPONSES:
+                # Respostas individuais seguem o caminho normal de validação,
+                # e falhas de conexão/API não melhoram ao dividir o pacote.
+                for i in group:
+                    yield i, response
+                continue
+
+            by_id = split_packed_response(response, [reviews[i].id for i in group])
+            missing = []
+            for i in group:
+                if reviews[i].id in by_id:
+                    yield i, by_id[reviews[i].id]
+                else:
+                    missing.append(i)
+
+            if missing:
+                logger.warning(
+                    "Resposta empacotada sem %d de %d resenhas; reenviando "
+                    "apenas as faltantes.", len(missing), len(group),
+                )
+                middle = (len(missing) + 1) // 2
+                next_pending.extend(g for g in (missing[:middle], missing[middle:]) if g)
+        pending = next_pending
+
+
+def process_packed(
+    reviews: List[ReviewRaw],
+    llm_client: "LLMClient",
+    pack_size: int | None = None,
+) -> List[str]:
+    """
+    Versão em lista de `iter_packed`: retorna uma resposta por resenha, na
+    ordem de entrada.
+    """
+    results = [""] * len(reviews)
+    for index, response in iter_packed(reviews, llm_client, pack_size):
+        results[index] = response
+    return results
@@ -2,11 +2,14 @@
 Processa, valida e analisa as resenhas.
 """
 import logging
+import os
+import tempfile
 from collections import Counter
-from typing import Iterable, Tuple
+from typing import Annotated, Any, Dict, Iterable, Iterator, List, Tuple, Union
 
-from pydantic import ValidationError
+from pydantic import Field, TypeAdapter, ValidationError
 from src.models import ReviewRaw, ReviewProcessed
+from src.review_table import ReviewTable
 from src.utils.helpers import safe_json_load
 
 logger = logging.getLogger(__name__)
@@ -17,16 +20,22 @@ def map_llm_response_to_processed(review_raw: ReviewRaw, llm_response: str) -> R
     usando o objeto ReviewRaw original como a fonte da verdade para os
     dados originais.
     """
-    data = safe_json_load(llm_response)
+    return _validate_with_fallback(review_raw, safe_json_load(llm_response))
 
+def _processed_record(review_raw: ReviewRaw, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Combina a resposta do LLM com os dados originais, que têm prioridade."""
+    return {
+        **data,
+        "user": review_raw.user,
+        "original": review_raw.text,
+        "language": review_raw.language,  # Passa o idioma
+    }
+
+def _validate_with_fallback(review_raw: ReviewRaw, data: Dict[str, Any]) -> ReviewProcessed:
+    """Valida uma resposta já carregada, usando o fallback se ela for inválida."""
     try:
         # Pydantic fará a maior parte do trabalho de validação e limpeza
-        processed_review = ReviewProcessed(
-            user=review_raw.user,
-            original=review_raw.text,
-            language=review_raw.language,  # Passa o idioma
-            **data
-        )
+        processed_review = ReviewProcessed(**_processed_record(review_raw, data))
         logger.info(
             "Análise detalhada do LLM validada para o usuário: %s", processed_review.user
         )
@@ -49,16 +58,143 @@ def map_llm_response_to_processed(review_raw: ReviewRaw, llm_response: str) -> R
             explanation="Falha na análise detalhada do LLM."  # Fallback seguro
         )
 
+# Valida uma lista inteira de respostas em uma única chamada ao pydantic-core.
+# Cada item é validado como ReviewProcessed ou, se for inválido, devolvido
+# como o dicionário de entrada, sem interromper a validação dos demais.
+_PROCESSED_OR_INVALID_LIST = TypeAdapter(
+    List[Annotated[Union[ReviewProcessed, Dict[str, Any]], Field(union_mode="left_to_right")]]
+)
+
+def map_llm_responses_to_processed(
+    results: Iterable[Tuple[ReviewRaw, str]]
+) -> List[ReviewProcessed]:
+    """
+    Versão em lote de `map_llm_response_to_processed`: valida todas as
+    respostas com uma única chamada a um `TypeAdapter`, em vez de construir
+    um modelo por vez.
+
+    Apenas as respostas inválidas passam pelo caminho individual, que
+    registra os erros e aplica o mesmo fallback. O resultado segue a ordem
+    de `results`.
+    """
+    reviews: List[ReviewRaw] = []
+    payloads: List[Dict[str, Any]] = []
+    for review_raw, llm_response in results:
+        reviews.append(review_raw)
+        payloads.append(safe_json_load(llm_response))
+
+    validated = _PROCESSED_OR_INVALID_LIST.validate_python(
+        [_processed_record(review_raw, data) for review_raw, data in zip(reviews, payloads)]
+    )
+    fallbacks = 0
+    for i, item in enumerate(validated):
+        if not isinstance(item, ReviewProcessed):
+            validated[i] = _validate_with_fallback(reviews[i], payloads[i])
+            fallbacks += 1
+
+    logger.info(
+        "%d análises do LLM validadas em lote (%d com fallback).", len(validated), fallbacks
+    )
+    return validated
+
+class ReviewAggregator:
+    """
+    Agrega as resenhas processadas à medida que são recebidas, uma a uma.
+
+    Mantém as contagens por sentimento, idioma e intensidade e a frequência
+    dos aspectos. A seção concatenada ("usuário: resenha" separados por
+    `separator`) é escrita em um arquivo temporário, que só passa para o
+    disco acima de `spool_max_size` caracteres, em vez de ser montada como
+    uma única string; `iter_concatenated` a devolve em blocos.
+
+    Use como gerenciador de contexto (ou chame `close`) para descartar o
+    arquivo temporário.
+    """
+
+    def __init__(self, separator: str = " || ", spool_max_size: int = 1024 * 1024):
+        self.separator = separator
+        self.total = 0
+        self.sentiments: Counter = Counter()
+        self.languages: Counter = Counter()
+        self.intensities: Counter = Counter()
+        self.aspects: Counter = Counter()
+        self._concatenated = tempfile.SpooledTemporaryFile(
+            max_size=spool_max_size, mode="w+", encoding="utf-8"
+        )
+
+    def _add(
+        self,
+        user: str,
+        original: str,
+        sentiment: str,
+        language: str,
+        intensity: str,
+        aspects: Iterable[str],
+    ) -> None:
+        if self.total:
+            self._concatenated.write(self.separator)
+        self._concatenated.write(f"{user}: {original}")
+        self.sentiments[sentiment] += 1
+        self.languages[language] += 1
+        self.intensities[intensity] += 1
+        self.aspects.update(aspects)
+        self.total += 1
+
+    def add(self, review: ReviewProcessed) -> None:
+        """Acrescenta uma resenha processada."""
+        self._add(
+            review.user, review.original, review.sentiment,
+            review.language, review.intensity, review.aspects,
+        )
+
+    def update(self, reviews: Union[ReviewTable, Iterable[ReviewProcessed]]) -> None:
+        """
+        Acrescenta várias resenhas, na ordem recebida. Com uma ReviewTable,
+        as colunas são lidas diretamente, sem criar um objeto por resenha.
+        """
+        if isinstance(reviews, ReviewTable):
+            columns = ("user", "original", "sentiment", "language", "intensity", "aspects")
+            for values in zip(*(reviews.column(name) for name in columns)):
+                self._add(*values)
+        else:
+            for review in reviews:
+                self.add(review)
+
+    def iter_concatenated(self, block_size: int = 64 * 1024) -> Iterator[str]:
+        """Produz a seção concatenada em blocos de até `block_size` caracteres."""
+        self._concatenated.seek(0)
+        try:
+            while block := self._concatenated.read(block_size):
+                yield block
+        finally:
+            self._concatenated.seek(0, os.SEEK_END)
+
+    def concatenated(self) -> str:
+        """Retorna a seção concatenada inteira (em memória)."""
+        return "".join(self.iter_concatenated())
+
+    def close(self) -> None:
+        """Descarta o arquivo temporário da seção concatenada."""
+        self._concatenated.close()
+
+    def __enter__(self) -> "ReviewAggregator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 def analyze_reviews(
     processed: Iterable[ReviewProcessed],
     separator: str = " || "
 ) -> Tuple[Counter, str]:
     """
     Analisa uma lista de resenhas processadas para contar sentimentos e concatenar textos.
+
+    Monta o texto concatenado inteiro em memória; para grandes volumes, use
+    `ReviewAggregator` com `save_aggregated_summary`, como o pipeline.
     """
-    processed_list = list(processed)
-    logger.info("Analisando %d resenhas processadas...", len(processed_list))
-    counts = Counter(r.sentiment for r in processed_list)
-    all_texts = separator.join(f"{r.user}: {r.original}" for r in processed_list)
-    logger.info("Contagem de sentimentos: %s", counts)
-    return counts, all_texts
+    with ReviewAggregator(separator) as aggregator:
+        aggregator.update(processed)
+        logger.info("Analisando %d resenhas processadas...", aggregator.total)
+        logger.info("Contagem de sentimentos: %s", aggregator.sentiments)
+        return aggregator.sentiments, aggregator.concatenated()
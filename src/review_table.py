@@ -0,0 +1,268 @@
+"""
+Armazenamento colunar compacto de resenhas.
+
+Com milhões de resenhas, manter cada uma como um objeto Pydantic completo
+(com seu próprio `__dict__`, strings de idioma repetidas e uma lista de
+aspectos separada) domina o consumo de memória. A `ReviewTable` guarda os
+mesmos dados em colunas e só cria objetos Pydantic quando eles são pedidos.
+"""
+import sys
+from array import array
+from collections import Counter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+from src.models import ReviewProcessed
+
+# Colunas com poucos valores distintos, guardadas como códigos de categoria.
+CATEGORICAL_COLUMNS = frozenset({"language", "sentiment", "intensity"})
+
+
+class ReviewTable:
+    """
+    Tabela colunar para resenhas de um modelo Pydantic (ReviewRaw ou
+    ReviewProcessed).
+
+    - colunas de texto: listas de strings;
+    - `language`, `sentiment` e `intensity`: códigos em um `array` e uma
+      tabela de categorias, na ordem da primeira ocorrência;
+    - colunas de lista (`aspects`): os itens de todas as resenhas em uma
+      única lista, com strings internadas, e os limites de cada resenha em
+      um `array`.
+
+    Indexar ou iterar a tabela produz objetos do modelo, criados sob demanda
+    e sem nova validação (os dados já foram validados ao entrar).
+
+    Args:
+        model: O modelo Pydantic das linhas (padrão: ReviewProcessed).
+    """
+
+    def __init__(self, model: Type[BaseModel] = ReviewProcessed):
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        self._strings: Dict[str, List[str]] = {}
+        self._codes: Dict[str, array] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._category_index: Dict[str, Dict[str, int]] = {}
+        self._items: Dict[str, List[str]] = {}
+        self._offsets: Dict[str, array] = {}
+        for name, field in model.model_fields.items():
+            if get_origin(field.annotation) is list:
+                self._items[name] = []
+                self._offsets[name] = array("Q", [0])
+            elif name in CATEGORICAL_COLUMNS:
+                self._codes[name] = array("H")
+                self._categories[name] = []
+                self._category_index[name] = {}
+            else:
+                self._strings[name] = []
+        self._length = 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Union[BaseModel, Mapping[str, Any]]],
+        model: Type[BaseModel] = ReviewProcessed,
+    ) -> "ReviewTable":
+        """Cria uma tabela a partir de objetos do modelo ou dicionários."""
+        table = cls(model)
+        table.extend(rows)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Sequence[Any]],
+        model: Type[BaseModel] = ReviewProcessed,
+    ) -> "ReviewTable":
+        """Cria uma tabela a partir de colunas já validadas, todas do mesmo tamanho."""
+        table = cls(model)
+        lengths = {len(columns[name]) for name in table.fields}
+        if len(lengths) > 1:
+            raise ValueError(f"Colunas com tamanhos diferentes: {sorted(lengths)}")
+        for name, values in table._strings.items():
+            values.extend(columns[name])
+        for name in table._codes:
+            table._encode(name, columns[name])
+        for name in table._items:
+            table._append_lists(name, columns[name])
+        table._length = lengths.pop() if lengths else 0
+        return table
+
+    def _encode(self, name: str, values: Iterable[str]) -> None:
+        """Acrescenta valores a uma coluna categórica."""
+        codes = self._codes[name]
+        categories = self._categories[name]
+        index = self._category_index[name]
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(categories)
+                categories.append(value)
+            codes.append(code)
+
+    def _append_lists(self, name: str, values: Iterable[Sequence[str]]) -> None:
+        """Acrescenta valores a uma coluna de listas."""
+        items = self._items[name]
+        offsets = self._offsets[name]
+        for value in values:
+            items.extend(map(sys.intern, value))
+            offsets.append(len(items))
+
+    def append(self, row: Union[BaseModel, Mapping[str, Any]]) -> None:
+        """Acrescenta uma resenha (objeto do modelo ou dicionário)."""
+        if isinstance(row, BaseModel):
+            row = {name: getattr(row, name) for name in self.fields}
+        for name, values in self._strings.items():
+            values.append(row[name])
+        for name in self._codes:
+            self._encode(name, (row[name],))
+        for name in self._items:
+            self._append_lists(name, (row[name],))
+        self._length += 1
+
+    def extend(self, rows: Iterable[Union[BaseModel, Mapping[str, Any]]]) -> None:
+        """Acrescenta várias resenhas."""
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _value(self, name: str, position: int) -> Any:
+        """Valor de uma coluna em uma linha."""
+        if name in self._strings:
+            return self._strings[name][position]
+        if name in self._codes:
+            return self._categories[name][self._codes[name][position]]
+        offsets = self._offsets[name]
+        return self._items[name][offsets[position]:offsets[position + 1]]
+
+    def row(self, position: int) -> Dict[str, Any]:
+        """Retorna uma linha como dicionário, no formato de `model_dump()`."""
+        if not -self._length <= position < self._length:
+            raise IndexError("Posição fora da tabela")
+        position %= self._length
+        return {name: self._value(name, position) for name in self.fields}
+
+    def __getitem__(self, position: int) -> BaseModel:
+        return self.model.model_construct(**self.row(position))
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for row in self.iter_dicts():
+            yield self.model.model_construct(**row)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Produz as linhas como dicionários, sem criar objetos do modelo nem
+        decodificar colunas inteiras: cada linha é montada ao ser pedida.
+        """
+        strings = [(name, self._strings[name]) for name in self.fields if name in self._strings]
+        codes = [
+            (name, self._codes[name], self._categories[name])
+            for name in self.fields if name in self._codes
+        ]
+        lists = [
+            (name, self._items[name], self._offsets[name])
+            for name in self.fields if name in self._items
+        ]
+        for position in range(self._length):
+            row = {name: values[position] for name, values in strings}
+            for name, column_codes, categories in codes:
+                row[name] = categories[column_codes[position]]
+            for name, items, offsets in lists:
+                row[name] = items[offsets[position]:offsets[position + 1]]
+            yield {name: row[name] for name in self.fields}
+
+    def column(self, name: str) -> List[Any]:
+        """Retorna os valores de uma coluna, decodificados."""
+        if name in self._strings:
+            return list(self._strings[name])
+        if name in self._codes:
+            categories = self._categories[name]
+            return [categories[code] for code in self._codes[name]]
+        if name not in self._items:
+            raise KeyError(name)
+        items = self._items[name]
+        offsets = self._offsets[name]
+        return [items[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def categories(self, name: str) -> List[str]:
+        """Valores distintos de uma coluna categórica, na ordem da primeira ocorrência."""
+        return list(self._categories[name])
+
+    def codes(self, name: str) -> array:
+        """Códigos de uma coluna categórica (posições em `categories(name)`)."""
+        return self._codes[name]
+
+    def list_items(self, name: str) -> Tuple[List[str], array]:
+        """
+        Itens de uma coluna de listas, sem cópia: todos os itens em sequência
+        e os limites de cada linha (os itens da linha `i` estão entre
+        `offsets[i]` e `offsets[i + 1]`).
+        """
+        return self._items[name], self._offsets[name]
+
+    def value_counts(self, name: str) -> Counter:
+        """Contagem dos valores de uma coluna categórica, sem decodificá-la."""
+        by_code = Counter(self._codes[name])
+        categories = self._categories[name]
+        return Counter({categories[code]: by_code[code] for code in sorted(by_code)})
+
+    def sort_by(self, keys: Sequence[Any]) -> None:
+        """
+        Reordena as linhas no lugar, em ordem crescente de `keys` (uma chave
+        por linha).
+
+        Apenas os códigos, os limites e as referências às strings existentes
+        são reorganizados, coluna a coluna: nenhum valor é copiado ou
+        decodificado, ao contrário de `take`.
+        """
+        if len(keys) != self._length:
+            raise ValueError(f"Esperadas {self._length} chaves, recebidas {len(keys)}")
+        order = sorted(range(self._length), key=keys.__getitem__)
+        if all(position == row for row, position in enumerate(order)):
+            return
+        for name, values in self._strings.items():
+            self._strings[name] = [values[p] for p in order]
+        for name, codes in self._codes.items():
+            self._codes[name] = array(codes.typecode, [codes[p] for p in order])
+        for name, items in self._items.items():
+            offsets = self._offsets[name]
+            new_items: List[str] = []
+            new_offsets = array("Q", [0])
+            for p in order:
+                new_items.extend(items[offsets[p]:offsets[p + 1]])
+                new_offsets.append(len(new_items))
+            self._items[name], self._offsets[name] = new_items, new_offsets
+
+    def take(self, positions: Iterable[int]) -> "ReviewTable":
+        """Cria uma nova tabela com as linhas nas posições informadas, nessa ordem."""
+        positions = list(positions)
+        columns: Dict[str, List[Any]] = {}
+        for name in self.fields:
+            if name in self._items:
+                offsets = self._offsets[name]
+                items = self._items[name]
+                columns[name] = [items[offsets[p]:offsets[p + 1]] for p in positions]
+            elif name in self._codes:
+                categories = self._categories[name]
+                codes = self._codes[name]
+                columns[name] = [categories[codes[p]] for p in positions]
+            else:
+                values = self._strings[name]
+                columns[name] = [values[p] for p in positions]
+        return self.from_columns(columns, self.model)
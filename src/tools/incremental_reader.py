@@ -0,0 +1,171 @@
+"""
+Leitura incremental de arquivos de resenhas que crescem por acréscimo.
+
+A cada execução, apenas as resenhas acrescentadas desde a última leitura
+confirmada são parseadas. O estado (posição em bytes, identidade e tamanho
+do arquivo e um hash da última resenha) fica em um arquivo JSON, e só é
+gravado com `commit()`, depois que o pipeline salvou os resultados.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from src.config import settings
+from src.models import ReviewRaw
+from src.tools.parser import (
+    is_record_start,
+    last_record_start,
+    parse_byte_range,
+    split_byte_ranges,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(data: bytes) -> str:
+    """Hash hexadecimal dos bytes informados."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class IncrementalReviewReader:
+    """
+    Lê somente as resenhas novas de um arquivo que recebe resenhas no final.
+
+    A última resenha do arquivo pode ainda receber linhas de continuação,
+    então a posição salva é a do seu início e os seus bytes ficam
+    registrados (como hash):
+
+    - se ela terminava em quebra de linha, já foi entregue e, na próxima
+      leitura, só é entregue de novo se tiver crescido;
+    - se não terminava (escrita em andamento), fica retida até a próxima
+      leitura.
+
+    Se o arquivo for substituído (outro inode), truncado ou alterado antes
+    da posição salva, a leitura recomeça do início.
+
+    Args:
+        file_path: Caminho do arquivo de resenhas.
+        state_path: Arquivo JSON com o estado de todas as leituras
+            incrementais (padrão: INCREMENTAL_STATE_PATH).
+    """
+
+    def __init__(self, file_path: Path, state_path: Path | None = None):
+        self.file_path = Path(file_path)
+        self.state_path = Path(state_path or settings.INCREMENTAL_STATE_PATH)
+        self._key = str(self.file_path.resolve())
+        self._next_state: Optional[Dict[str, Any]] = None
+        self.new_reviews = 0
+
+    def _load_states(self) -> Dict[str, Dict[str, Any]]:
+        """Lê o estado de todos os arquivos acompanhados."""
+        if not self.state_path.is_file():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            logger.warning("Estado incremental ilegível em %s; ignorando.", self.state_path)
+            return {}
+
+    def _valid_state(self, mm, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Retorna o estado salvo se ele ainda corresponde ao arquivo atual."""
+        state = self._load_states().get(self._key)
+        if state is None:
+            return None
+        if (state["device"], state["inode"]) != (stat.st_dev, stat.st_ino):
+            logger.info("%s foi substituído; lendo desde o início.", self.file_path)
+            return None
+        if stat.st_size < state["size"] or (
+            _sha256(mm[state["offset"]:state["size"]]) != state["tail_sha256"]
+        ):
+            logger.warning(
+                "%s foi truncado ou alterado; lendo desde o início.", self.file_path
+            )
+            return None
+        return state
+
+    def iter_new(self) -> Iterator[ReviewRaw]:
+        """
+        Produz apenas as resenhas novas desde o último `commit()`.
+
+        O arquivo é verificado imediatamente; as resenhas são parseadas sob
+        demanda, em blocos de PARSER_CHUNK_MB.
+        """
+        if not self.file_path.is_file():
+            raise FileNotFoundError(
+                f"O arquivo de resenhas não foi encontrado em: {self.file_path}"
+            )
+        return self._iter_new()
+
+    def _iter_new(self) -> Iterator[ReviewRaw]:
+        """Gerador que localiza o trecho novo do arquivo e o parseia por intervalos."""
+        stat = self.file_path.stat()
+        self.new_reviews = 0
+        if stat.st_size == 0:
+            return
+        with self.file_path.open("rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            state = self._valid_state(mm, stat)
+            start = 0
+            if state is not None:
+                start = state["offset"]
+                if state["tail_emitted"]:
+                    if state["size"] == size or is_record_start(mm, state["size"]):
+                        # A última resenha já entregue não mudou: começa depois dela.
+                        start = state["size"]
+                    else:
+                        logger.info("A última resenha lida ganhou novas linhas; ela será relida.")
+
+            if start >= size:
+                logger.info("Nenhuma resenha nova em %s.", self.file_path)
+                self._next_state = state
+                return
+
+            tail_start = last_record_start(mm, start, size)
+            tail = mm[tail_start:size]
+            tail_complete = tail.endswith(b"\n")
+            self._next_state = {
+                "device": stat.st_dev,
+                "inode": stat.st_ino,
+                "size": size,
+                "offset": tail_start,
+                "tail_sha256": _sha256(tail),
+                "tail_emitted": tail_complete,
+            }
+            # Uma última resenha sem quebra de linha ainda está sendo escrita.
+            body_end = size if tail_complete else tail_start
+            ranges = split_byte_ranges(
+                mm, settings.PARSER_CHUNK_MB * 1024 * 1024, start, body_end
+            )
+        logger.info(
+            "Leitura incremental de %s a partir do byte %d (%d bytes novos).",
+            self.file_path, start, size - start,
+        )
+
+        for range_start, range_end in ranges:
+            for review in parse_byte_range(str(self.file_path), range_start, range_end):
+                self.new_reviews += 1
+                yield review
+        logger.info("✅ %d resenhas novas lidas de %s.", self.new_reviews, self.file_path)
+
+    def commit(self) -> None:
+        """
+        Grava a posição alcançada pela última leitura completa, para que a
+        próxima execução comece a partir dela.
+        """
+        if self._next_state is None:
+            return
+        states = self._load_states()
+        states[self._key] = self._next_state
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(states, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+        logger.info(
+            "Estado incremental salvo: %s até o byte %d.",
+            self.file_path, self._next_state["offset"],
+        )
@@ -0,0 +1,243 @@
+"""
+Cache da detecção de idioma.
+
+As mesmas resenhas (e os mesmos arquivos) são parseadas a cada execução, e
+o langdetect é a etapa mais cara do parsing. Este módulo memoriza o idioma
+detectado por texto normalizado em dois níveis: um LRU em memória e,
+opcionalmente, um arquivo SQLite que sobrevive entre execuções.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import settings
+from src.tools.text_utils import (
+    LANGDETECT_SEED,
+    detect_language,
+    detect_language_tiered,
+    detect_languages,
+    normalize_whitespace,
+    normalize_whitespace_bulk,
+)
+
+logger = logging.getLogger(__name__)
+
+# Gravações acumuladas antes de um commit no SQLite.
+_FLUSH_EVERY = 1000
+
+
+class LanguageCache:
+    """
+    Memoização de `detect_language` com LRU em memória e armazenamento
+    opcional em disco.
+
+    A chave é um hash do texto com espaços normalizados, da semente do
+    langdetect e do modo de detecção, e o idioma é sempre detectado sobre
+    esse texto normalizado, então o resultado com ou sem cache é o mesmo.
+    Quando o arquivo passa de `max_disk_entries`, as entradas mais antigas
+    são removidas até 90% do limite.
+
+    Args:
+        path: Arquivo SQLite; None desativa o armazenamento em disco.
+        max_memory_entries: Capacidade do LRU em memória.
+        max_disk_entries: Limite de entradas do arquivo SQLite.
+        fast_path: Usa a detecção em camadas (`detect_language_tiered`);
+            padrão: LANG_DETECT_FAST_PATH.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_memory_entries: int | None = None,
+        max_disk_entries: int | None = None,
+        fast_path: bool | None = None,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.max_memory_entries = (
+            max_memory_entries if max_memory_entries is not None
+            else settings.LANG_CACHE_MEMORY_ENTRIES
+        )
+        self.max_disk_entries = (
+            max_disk_entries if max_disk_entries is not None
+            else settings.LANG_CACHE_MAX_ENTRIES
+        )
+        self.fast_path = settings.LANG_DETECT_FAST_PATH if fast_path is None else fast_path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Vários processos do parser podem gravar no mesmo arquivo.
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS languages ("
+                " key TEXT PRIMARY KEY,"
+                " language TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """Gera a chave do cache a partir do texto normalizado."""
+        mode = "tiered" if self.fast_path else "langdetect"
+        payload = f"{mode}\x1f{LANGDETECT_SEED}\x1f{text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Procura a chave no LRU e depois no disco; atualiza os contadores."""
+        language = self._memory.get(key)
+        if language is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return language
+        if self._conn is not None:
+            row = self._conn.execute(
+                "SELECT language FROM languages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+        self.misses += 1
+        return None
+
+    def _remember(self, key: str, language: str) -> None:
+        """Guarda o resultado no LRU, descartando o item usado há mais tempo."""
+        self._memory[key] = language
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, key: str, language: str) -> None:
+        """Guarda um resultado novo no LRU e na fila de gravação em disco."""
+        self._remember(key, language)
+        if self._conn is not None:
+            self._pending.append((key, language))
+            if len(self._pending) >= _FLUSH_EVERY:
+                self._flush()
+
+    def detect(self, text: str) -> str:
+        """Equivalente a `detect_language`, consultando o cache antes."""
+        normalized = normalize_whitespace(text)
+        key = self.make_key(normalized)
+        with self._lock:
+            language = self._lookup(key)
+        if language is None:
+            if self.fast_path:
+                language = detect_language_tiered(normalized)[0]
+            else:
+                language = detect_language(normalized)
+            with self._lock:
+                self._store(key, language)
+        return language
+
+    def detect_many(self, texts: Iterable[str], workers: int = 1) -> List[str]:
+        """
+        Equivalente a `detect_languages`: apenas os textos ausentes do cache
+        (sem repetição) são enviados ao langdetect, em um único lote.
+        """
+        normalized = normalize_whitespace_bulk(texts)
+        keys = [self.make_key(text) for text in normalized]
+        results: List[Optional[str]] = []
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for key, text in zip(keys, normalized):
+                language = self._lookup(key) if key not in missing else None
+                if language is None:
+                    missing[key] = text
+                results.append(language)
+
+        if missing:
+            detected = detect_languages(
+                list(missing.values()), workers=workers, fast_path=self.fast_path
+            )
+            with self._lock:
+                for key, language in zip(missing, detected):
+                    self._store(key, language)
+            by_key = dict(zip(missing, detected))
+            results = [
+                language if language is not None else by_key[key]
+                for key, language in zip(keys, results)
+            ]
+        return results
+
+    def _flush(self) -> None:
+        """Grava no SQLite os resultados pendentes e aplica o limite de tamanho."""
+        if self._conn is None or not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO languages (key, language) VALUES (?, ?)",
+            self._pending,
+        )
+        self._pending.clear()
+        count = self._conn.execute("SELECT COUNT(*) FROM languages").fetchone()[0]
+        if count > self.max_disk_entries:
+            excess = count - int(self.max_disk_entries * 0.9)
+            self._conn.execute(
+                "DELETE FROM languages WHERE rowid IN"
+                " (SELECT rowid FROM languages ORDER BY rowid ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+            logger.info(
+                "Cache de idiomas excedeu %d entradas; %d entradas removidas.",
+                self.max_disk_entries, excess,
+            )
+        self._conn.commit()
+
+    def flush(self) -> None:
+        """Grava no disco os resultados ainda pendentes."""
+        with self._lock:
+            self._flush()
+
+    def stats(self) -> Dict[str, float]:
+        """Retorna os contadores de uso do cache."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self) -> None:
+        """Grava os resultados pendentes e fecha a conexão com o banco de dados."""
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[LanguageCache] = None
+_default_cache_pid: Optional[int] = None
+
+
+def get_language_cache() -> Optional[LanguageCache]:
+    """
+    Retorna o cache de idiomas compartilhado do processo atual, criado a
+    partir das configurações, ou None se LANG_CACHE_ENABLED for False.
+
+    Cada processo (inclusive os do parser paralelo) abre sua própria conexão.
+    """
+    global _default_cache, _default_cache_pid  # pylint: disable=global-statement
+    if not settings.LANG_CACHE_ENABLED:
+        return None
+    if _default_cache is None or _default_cache_pid != os.getpid():
+        path = settings.CACHE_DIR / "languages.sqlite3" if settings.LANG_CACHE_PERSISTENT else None
+        _default_cache = LanguageCache(path)
+        _default_cache_pid = os.getpid()
+    return _default_cache
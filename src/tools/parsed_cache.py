@@ -0,0 +1,174 @@
+"""
+Cache colunar das resenhas parseadas.
+
+O parsing (com a detecção de idioma) do mesmo arquivo de resenhas se repete
+a cada execução. Este módulo grava a saída do parser em colunas (`id`,
+`user`, `text`, `language`) em um arquivo `.npz` do numpy, identificado pelo
+hash do conteúdo da origem e pela versão do parser. Enquanto a origem não
+mudar, as execuções seguintes carregam as colunas diretamente, sem parsear
+o texto.
+
+Cada coluna de texto é guardada como um único bloco UTF-8 com os limites de
+cada valor; a coluna de idioma, como códigos de uma tabela de categorias.
+
+O cache é opcional (PARSED_CACHE_ENABLED): o hash exige ler a origem inteira
+antes da primeira resenha e, sem cache válido, as resenhas parseadas ficam em
+memória até o fim da leitura.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.config import settings
+from src.models import ReviewRaw
+from src.review_table import ReviewTable
+from src.tools.parser import PARSER_VERSION, resolve_review_sources
+from src.tools.text_utils import LANGDETECT_SEED
+
+logger = logging.getLogger(__name__)
+
+# Colunas de texto livre; `language` é guardada como categorias.
+_TEXT_COLUMNS = ("id", "user", "text")
+# Tamanho dos blocos lidos ao calcular o hash da origem.
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _pack_strings(values: List[str]) -> Dict[str, object]:
+    """Converte uma coluna de strings em um bloco UTF-8 e seus limites."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    blob = "".join(values).encode("utf-8")
+    return {"data": np.frombuffer(blob, dtype=np.uint8), "offsets": offsets}
+
+
+def _unpack_strings(data, offsets) -> List[str]:
+    """Reconstrói a coluna de strings a partir do bloco UTF-8 e dos limites."""
+    blob = data.tobytes().decode("utf-8")
+    bounds = offsets.tolist()
+    return [blob[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+class ParsedReviewCache:
+    """
+    Guarda e recupera a saída do parser por origem de resenhas.
+
+    A chave combina o conteúdo de todos os arquivos da origem (na ordem de
+    leitura), a versão do parser e o modo de detecção de idioma, então
+    qualquer mudança em um deles gera um novo parsing.
+
+    Args:
+        directory: Diretório dos arquivos de cache (padrão: CACHE_DIR/parsed).
+        max_files: Quantidade de arquivos mantidos (padrão: PARSED_CACHE_MAX_FILES).
+    """
+
+    def __init__(self, directory: Path | None = None, max_files: int | None = None):
+        self.directory = Path(directory or settings.CACHE_DIR / "parsed")
+        self.max_files = max_files if max_files is not None else settings.PARSED_CACHE_MAX_FILES
+
+    def source_key(self, files: Iterable[Path]) -> str:
+        """Calcula a chave do cache a partir do conteúdo dos arquivos e da versão do parser."""
+        mode = "tiered" if settings.LANG_DETECT_FAST_PATH else "langdetect"
+        digest = hashlib.sha256(f"{PARSER_VERSION}\x1f{mode}\x1f{LANGDETECT_SEED}".encode())
+        for file_path in files:
+            file_digest = hashlib.sha256()
+            with Path(file_path).open("rb") as f:
+                while block := f.read(_HASH_BLOCK_SIZE):
+                    file_digest.update(block)
+            digest.update(file_digest.digest())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> Optional[ReviewTable]:
+        """Carrega as resenhas gravadas sob `key`, ou None se não houver cache válido."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as columns:
+                values = {
+                    name: _unpack_strings(columns[f"{name}_data"], columns[f"{name}_offsets"])
+                    for name in _TEXT_COLUMNS
+                }
+                categories = _unpack_strings(
+                    columns["language_data"], columns["language_offsets"]
+                )
+                languages = [categories[code] for code in columns["language_codes"].tolist()]
+        except (OSError, ValueError, KeyError, IndexError, UnicodeDecodeError):
+            logger.warning("Cache de resenhas parseadas ilegível em %s; ignorando.", path)
+            return None
+        # Atualiza o mtime a cada acerto: `_prune` remove os menos usados.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        # Os valores já foram validados quando o cache foi gravado.
+        return ReviewTable.from_columns({**values, "language": languages}, ReviewRaw)
+
+    def store(self, key: str, reviews: ReviewTable) -> None:
+        """Grava as resenhas sob `key` (escrita atômica) e remove os caches mais antigos."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        arrays = {}
+        for name in _TEXT_COLUMNS:
+            packed = _pack_strings(reviews.column(name))
+            arrays[f"{name}_data"] = packed["data"]
+            arrays[f"{name}_offsets"] = packed["offsets"]
+        packed = _pack_strings(reviews.categories("language"))
+        arrays["language_codes"] = np.frombuffer(reviews.codes("language"), dtype=np.uint16)
+        arrays["language_data"] = packed["data"]
+        arrays["language_offsets"] = packed["offsets"]
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        logger.info("Cache de resenhas parseadas gravado em %s (%d resenhas).", path, len(reviews))
+        self._prune(keep=path)
+
+    def _prune(self, keep: Path) -> None:
+        """Remove os arquivos de cache usados há mais tempo além de `max_files`."""
+        files = sorted(
+            (p for p in self.directory.glob("*.npz") if p != keep),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for old_path in files[max(self.max_files - 1, 0):]:
+            old_path.unlink(missing_ok=True)
+
+    def iter_reviews(
+        self,
+        source: Path | str,
+        parse: Callable[[Path | str], Iterator[ReviewRaw]],
+    ) -> Iterator[ReviewRaw]:
+        """
+        Produz as resenhas da origem a partir do cache ou, se ele não existir,
+        com `parse` (ex: `iter_reviews`), gravando o cache quando todas as
+        resenhas tiverem sido lidas.
+
+        A origem é verificada e o hash é calculado imediatamente, antes da
+        primeira iteração.
+        """
+        key = self.source_key(resolve_review_sources(source))
+        cached = self.load(key)
+        if cached is not None:
+            logger.info("✅ %d resenhas carregadas do cache de resenhas parseadas.", len(cached))
+            return iter(cached)
+        return self._parse_and_store(key, parse(source))
+
+    def _parse_and_store(self, key: str, reviews: Iterator[ReviewRaw]) -> Iterator[ReviewRaw]:
+        """Repassa as resenhas do parser e grava o cache se a leitura terminar."""
+        parsed = ReviewTable(ReviewRaw)
+        for review in reviews:
+            parsed.append(review)
+            yield review
+        self.store(key, parsed)
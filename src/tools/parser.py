@@ -1,21 +1,58 @@
 """
 Parser de linhas de texto para ReviewRaw e leitura de arquivos .txt.
-Lê um arquivo .txt e retorna uma lista de ReviewRaw.
+Lê um arquivo .txt (ou compactado, ou um diretório/glob de fragmentos) e
+retorna as resenhas uma a uma (`iter_reviews`) ou como uma lista de
+ReviewRaw (`read_reviews_from_file`).
 """
 
+import bz2
+import glob
+import gzip
+import io
 import logging
+import lzma
+import mmap
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, TextIO, Tuple
+from src.config import settings
 from src.models import ReviewRaw
+from src.tools.language_cache import get_language_cache
 # Importa as funções de utilidade de texto
-from src.tools.text_utils import normalize_whitespace, detect_language
+from src.tools.text_utils import (
+    detect_language,
+    detect_language_tiered,
+    detect_languages,
+    normalize_whitespace,
+)
 
 logger = logging.getLogger(__name__)
 
-def parse_single_review_string(full_review_text: str) -> ReviewRaw:
+# Expressão regular para detectar o início de uma nova resenha (ex: "12345$...")
+REVIEW_START_PATTERN = re.compile(r"^\d+\$.*")
+# Mesma fronteira em bytes, usada para dividir o arquivo entre processos.
+_CHUNK_BOUNDARY_PATTERN = re.compile(rb"\n[0-9]+\$")
+
+# Versão das regras de parsing; incrementar ao mudar a saída do parser
+# invalida os caches de resenhas parseadas (`src.tools.parsed_cache`).
+PARSER_VERSION = 1
+
+# Formatos compactados lidos diretamente, sem descompactar em disco.
+_COMPRESSED_OPENERS: Dict[str, Callable[..., TextIO]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}
+# Extensões consideradas ao ler um diretório de fragmentos.
+REVIEW_FILE_SUFFIXES = (".txt", *_COMPRESSED_OPENERS)
+
+def _split_review_fields(full_review_text: str) -> Tuple[str, str, str]:
     """
-    Converte uma string de resenha completa (potencialmente multi-linha) em um objeto ReviewRaw.
+    Separa uma string de resenha completa em id, usuário e texto normalizado.
     """
     parts = full_review_text.strip().split("$", 2)
 
@@ -52,47 +89,286 @@ def parse_single_review_string(full_review_text: str) -> ReviewRaw:
              full_review_text[:70]
         )
 
-    cleaned_text = normalize_whitespace(text)
-    detected_lang = detect_language(cleaned_text)
+    return id_.strip(), user.strip(), normalize_whitespace(text)
 
+def parse_single_review_string(full_review_text: str) -> ReviewRaw:
+    """
+    Converte uma string de resenha completa (potencialmente multi-linha) em um objeto ReviewRaw.
+    """
+    id_, user, cleaned_text = _split_review_fields(full_review_text)
+    cache = get_language_cache()
     return ReviewRaw(
-        id=id_.strip(),
-        user=user.strip(),
+        id=id_,
+        user=user,
         text=cleaned_text,
-        language=detected_lang
+        language=cache.detect(cleaned_text) if cache else _detect_uncached(cleaned_text)
     )
 
+def _detect_uncached(text: str) -> str:
+    """Detecta o idioma sem cache, com ou sem a camada heurística."""
+    if settings.LANG_DETECT_FAST_PATH:
+        return detect_language_tiered(text)[0]
+    return detect_language(text)
+
+def parse_review_strings(full_review_texts: List[str], workers: int = 1) -> List[ReviewRaw]:
+    """
+    Versão em lote de `parse_single_review_string`: o idioma de todas as
+    resenhas é detectado de uma vez com `detect_languages`.
+    """
+    fields = [_split_review_fields(text) for text in full_review_texts]
+    texts = [text for _, _, text in fields]
+    cache = get_language_cache()
+    if cache is not None:
+        languages = cache.detect_many(texts, workers=workers)
+    else:
+        languages = detect_languages(
+            texts, workers=workers, fast_path=settings.LANG_DETECT_FAST_PATH
+        )
+    return [
+        ReviewRaw(id=id_, user=user, text=text, language=language)
+        for (id_, user, text), language in zip(fields, languages)
+    ]
+
+def is_compressed(file_path: Path) -> bool:
+    """Indica se o arquivo está em um dos formatos compactados suportados."""
+    return file_path.suffix.lower() in _COMPRESSED_OPENERS
+
+def open_review_file(file_path: Path) -> TextIO:
+    """
+    Abre um arquivo de resenhas em modo texto, descompactando gzip, bz2 ou
+    xz em streaming. A decodificação e as quebras de linha seguem as mesmas
+    regras para todos os formatos.
+    """
+    opener = _COMPRESSED_OPENERS.get(file_path.suffix.lower())
+    if opener is None:
+        return file_path.open("r", encoding="utf-8", errors="ignore")
+    return opener(file_path, "rt", encoding="utf-8", errors="ignore")
+
+def _natural_key(path: Path) -> List:
+    """Chave de ordenação natural ("parte-2" antes de "parte-10")."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path.name)]
+
+def resolve_review_sources(source: Path | str) -> List[Path]:
+    """
+    Converte a origem das resenhas em uma lista ordenada de arquivos.
+
+    Aceita um arquivo, um diretório (todos os arquivos .txt, .gz, .bz2,
+    .xz e .lzma dentro dele) ou um padrão glob (ex: "dados/parte-*.gz").
+    Os fragmentos seguem a ordem natural dos nomes, que define a ordem
+    global das resenhas.
+    """
+    path = Path(source)
+    if path.is_file():
+        files = [path]
+    elif path.is_dir():
+        files = [
+            p for p in path.iterdir()
+            if p.is_file() and p.suffix.lower() in REVIEW_FILE_SUFFIXES
+        ]
+    elif glob.has_magic(str(source)):
+        files = [Path(p) for p in glob.glob(str(source)) if Path(p).is_file()]
+    else:
+        files = []
+    if not files:
+        raise FileNotFoundError(f"O arquivo de resenhas não foi encontrado em: {source}")
+    if len(files) > 1:
+        files.sort(key=lambda p: (_natural_key(p.parent), str(p.parent), _natural_key(p)))
+    return files
+
+def iter_reviews(file_path: Path | str) -> Iterator[ReviewRaw]:
+    """
+    Lê um arquivo .txt de resenhas e produz um ReviewRaw por vez, lidando
+    corretamente com entradas que abrangem múltiplas linhas.
+
+    `file_path` também pode ser um arquivo compactado (gzip, bz2, xz), um
+    diretório ou um glob de fragmentos, lidos em sequência (ver
+    `resolve_review_sources`); uma resenha nunca continua de um fragmento
+    para o seguinte.
+
+    Apenas as linhas da resenha atual ficam em memória, então o consumo é
+    constante independentemente do tamanho do arquivo. A existência do
+    arquivo é verificada imediatamente, antes da primeira iteração.
+    """
+    return _iter_review_records(resolve_review_sources(file_path))
+
+def _iter_review_records(files: List[Path]) -> Iterator[ReviewRaw]:
+    """Gerador que lê os arquivos linha a linha e os converte em ReviewRaw."""
+    try:
+        for file_path in files:
+            with open_review_file(file_path) as f:
+                yield from _parse_lines(f)
+    finally:
+        _flush_language_cache()
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[ReviewRaw]:
+    """Agrupa as linhas de cada resenha e as converte em ReviewRaw."""
+    for full_review_text in _iter_record_texts(lines):
+        yield parse_single_review_string(full_review_text)
+
+def _iter_record_texts(lines: Iterable[str]) -> Iterator[str]:
+    """Agrupa as linhas de cada resenha, produzindo o texto completo de cada uma."""
+    current_review_lines: List[str] = []
+
+    for line in lines:
+        # Verifica se a linha atual marca o início de uma NOVA resenha
+        if REVIEW_START_PATTERN.match(line) and current_review_lines:
+            # Se sim, entrega a resenha que acabamos de coletar
+            yield " ".join(current_review_lines)
+
+            # Inicia uma nova resenha
+            current_review_lines = [line.strip()]
+        else:
+            # Se não, é uma linha de continuação ou a primeira linha do arquivo
+            current_review_lines.append(line.strip())
+
+    # Não se esqueça de entregar a última resenha do arquivo após o loop
+    if current_review_lines:
+        yield " ".join(current_review_lines)
+
+def _flush_language_cache() -> None:
+    """Grava o cache de idiomas em disco e registra as estatísticas de uso."""
+    cache = get_language_cache()
+    if cache is not None:
+        cache.flush()
+        logger.info("Estatísticas do cache de idiomas: %s", cache.stats())
+
 def read_reviews_from_file(file_path: Path) -> List[ReviewRaw]:
     """
     Lê um arquivo .txt de resenhas, lidando corretamente com entradas que
     abrangem múltiplas linhas.
     """
-    if not file_path.is_file():
-        raise FileNotFoundError(f"O arquivo de resenhas não foi encontrado em: {file_path}")
+    return list(iter_reviews(file_path))
 
-    reviews: List[ReviewRaw] = []
-    current_review_lines: List[str] = []
+def split_byte_ranges(
+    data, target_size: int, start: int = 0, end: int | None = None
+) -> List[tuple]:
+    """
+    Divide `data[start:end]` (bytes ou mmap) em intervalos `(início, fim)` de
+    cerca de `target_size` bytes.
 
-    # Expressão regular para detectar o início de uma nova resenha (ex: "12345$...")
-    review_start_pattern = re.compile(r"^\d+\$.*")
+    Cada corte é movido para o próximo início de resenha (`\\n<dígitos>$`),
+    então nenhuma resenha, inclusive as de várias linhas, fica dividida
+    entre dois intervalos.
+    """
+    end = len(data) if end is None else end
+    ranges = []
+    while start < end:
+        match = _CHUNK_BOUNDARY_PATTERN.search(data, max(start, start + target_size - 1), end)
+        cut = match.start() + 1 if match else end
+        ranges.append((start, cut))
+        start = cut
+    return ranges
 
-    with file_path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            # Verifica se a linha atual marca o início de uma NOVA resenha
-            if review_start_pattern.match(line) and current_review_lines:
-                # Se sim, processa a resenha que acabamos de coletar
-                full_review_text = " ".join(current_review_lines)
-                reviews.append(parse_single_review_string(full_review_text))
+def last_record_start(data, start: int = 0, end: int | None = None) -> int:
+    """
+    Retorna a posição do início da última resenha em `data[start:end]` (ou
+    `start`, se o intervalo contém uma única resenha).
+    """
+    end = len(data) if end is None else end
+    pos = end
+    while True:
+        pos = data.rfind(b"\n", start, pos)
+        if pos < 0:
+            return start
+        if _CHUNK_BOUNDARY_PATTERN.match(data, pos, end):
+            return pos + 1
 
-                # Inicia uma nova resenha
-                current_review_lines = [line.strip()]
-            else:
-                # Se não, é uma linha de continuação ou a primeira linha do arquivo
-                current_review_lines.append(line.strip())
+def is_record_start(data, pos: int) -> bool:
+    """Indica se uma resenha começa exatamente na posição `pos` de `data`."""
+    if pos == 0:
+        return True
+    return pos < len(data) and _CHUNK_BOUNDARY_PATTERN.match(data, pos - 1) is not None
 
-    # Não se esqueça de processar a última resenha do arquivo após o loop
-    if current_review_lines:
-        full_review_text = " ".join(current_review_lines)
-        reviews.append(parse_single_review_string(full_review_text))
+def parse_byte_range(file_path: str, start: int, end: int) -> List[ReviewRaw]:
+    """
+    Parseia as resenhas de um intervalo de bytes do arquivo, que deve
+    começar no início de uma resenha (usado pelos processos do parser
+    paralelo e pela leitura incremental).
+    """
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8", errors="ignore")
+    # `newline=None` reproduz a separação de linhas da leitura em modo texto.
+    # O idioma de todo o intervalo é detectado em um único lote.
+    reviews = parse_review_strings(list(_iter_record_texts(io.StringIO(text, newline=None))))
+    _flush_worker_cache()
+    return reviews
 
+def parse_review_file(file_path: str) -> List[ReviewRaw]:
+    """
+    Parseia um arquivo inteiro (usado pelo parser paralelo para fragmentos
+    compactados, que não podem ser divididos em intervalos de bytes).
+    """
+    with open_review_file(Path(file_path)) as f:
+        reviews = parse_review_strings(list(_iter_record_texts(f)))
+    _flush_worker_cache()
     return reviews
+
+def _flush_worker_cache() -> None:
+    """Os processos do pool não executam handlers de saída: grava o cache já."""
+    cache = get_language_cache()
+    if cache is not None:
+        cache.flush()
+
+def iter_reviews_parallel(
+    file_path: Path | str,
+    workers: int | None = None,
+    chunk_bytes: int | None = None,
+) -> Iterator[ReviewRaw]:
+    """
+    Versão paralela de `iter_reviews`: mapeia o arquivo em memória, divide-o
+    em intervalos nas fronteiras de resenha e parseia cada intervalo (incluindo
+    a detecção de idioma) em um pool de processos.
+
+    Com vários fragmentos, todos os intervalos entram no mesmo pool;
+    fragmentos compactados são parseados inteiros por um único processo.
+    As resenhas são produzidas na ordem dos arquivos e o resultado é
+    idêntico ao de `iter_reviews`. Apenas alguns intervalos ficam em
+    andamento por vez.
+
+    Args:
+        file_path: Arquivo, diretório ou glob de arquivos de resenhas.
+        workers: Número de processos (padrão: PARSER_WORKERS, ou a quantidade
+            de CPUs se for 0).
+        chunk_bytes: Tamanho aproximado de cada intervalo (padrão: PARSER_CHUNK_MB).
+    """
+    files = resolve_review_sources(file_path)
+    workers = workers or settings.PARSER_WORKERS or os.cpu_count() or 1
+    chunk_bytes = chunk_bytes or settings.PARSER_CHUNK_MB * 1024 * 1024
+    return _iter_parallel_records(files, workers, chunk_bytes)
+
+def _parallel_tasks(files: List[Path], chunk_bytes: int) -> Iterator[tuple]:
+    """Produz as tarefas `(função, argumentos...)` de cada arquivo, em ordem."""
+    for file_path in files:
+        if is_compressed(file_path):
+            yield (parse_review_file, str(file_path))
+            continue
+        if file_path.stat().st_size == 0:
+            continue
+        with file_path.open("rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = split_byte_ranges(mm, chunk_bytes)
+        logger.info("Parseando %s em %d intervalos.", file_path, len(ranges))
+        for byte_range in ranges:
+            yield (parse_byte_range, str(file_path), *byte_range)
+
+def _iter_parallel_records(
+    files: List[Path], workers: int, chunk_bytes: int
+) -> Iterator[ReviewRaw]:
+    """Gerador que distribui as tarefas entre os processos e mantém a ordem."""
+    logger.info("Parseando %d arquivo(s) com %d processos.", len(files), workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        remaining = _parallel_tasks(files, chunk_bytes)
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    task = next(remaining, None)
+                    if task is None:
+                        break
+                    pending.append(executor.submit(*task))
+                if not pending:
+                    break
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
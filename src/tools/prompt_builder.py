@@ -2,8 +2,24 @@
 """
 Funções para construir prompts consistentes para o LLM.
 """
+from typing import List
+
 from src.models import ReviewRaw
 
+# Descrição das chaves esperadas na análise de cada resenha. Compartilhada
+# entre o prompt individual e o prompt empacotado (várias resenhas).
+_OUTPUT_KEYS_DESCRIPTION = (
+    '  - "translation_pt": string (a tradução da resenha para o '
+    "português do Brasil).\n"
+    "  - \"sentiment\": string (deve ser 'positive', 'negative' ou 'neutral').\n"
+    "  - \"intensity\": string (a intensidade do sentimento: 'Alta', "
+    "'Média' ou 'Baixa').\n"
+    '  - "aspects": uma lista de 1 a 3 palavras-chave em português que '
+    'resumem os pontos principais (ex: ["usabilidade", "bugs", "preço"]).\n'
+    '  - "explanation": uma frase curta em português explicando o porquê '
+    "da classificação de sentimento.\n\n"
+)
+
 def build_json_prompt(review: ReviewRaw) -> str:
     """
     Constrói um prompt detalhado para o LLM, solicitando uma análise completa
@@ -18,14 +34,30 @@ def build_json_prompt(review: ReviewRaw) -> str:
         f"{language_hint}\n"
         f"Resenha original: \"{review.text}\"\n\n"
         "O JSON de saída deve ter EXATAMENTE as seguintes chaves:\n"
-        '  - "translation_pt": string (a tradução da resenha para o '
-        "português do Brasil).\n"
-        "  - \"sentiment\": string (deve ser 'positive', 'negative' ou 'neutral').\n"
-        "  - \"intensity\": string (a intensidade do sentimento: 'Alta', "
-        "'Média' ou 'Baixa').\n"
-        '  - "aspects": uma lista de 1 a 3 palavras-chave em português que '
-        'resumem os pontos principais (ex: ["usabilidade", "bugs", "preço"]).\n'
-        '  - "explanation": uma frase curta em português explicando o porquê '
-        "da classificação de sentimento.\n\n"
+        f"{_OUTPUT_KEYS_DESCRIPTION}"
         "Responda APENAS com o objeto JSON, sem nenhum texto ou formatação adicional."
     )
+
+def build_packed_json_prompt(reviews: List[ReviewRaw]) -> str:
+    """
+    Constrói um único prompt que pede a análise de várias resenhas de uma vez.
+
+    As instruções são enviadas uma só vez e o LLM deve responder com uma
+    lista JSON contendo um objeto por resenha, identificado pela chave "id".
+    """
+    reviews_block = "\n".join(
+        f"- id \"{review.id}\" (idioma detectado: '{review.language}'): "
+        f"\"{review.text}\""
+        for review in reviews
+    )
+
+    return (
+        "Sua tarefa é fazer uma análise detalhada de cada uma das resenhas de "
+        "um aplicativo abaixo e retornar uma lista JSON.\n\n"
+        f"Resenhas originais:\n{reviews_block}\n\n"
+        f"A lista deve ter exatamente {len(reviews)} objetos, um por resenha. "
+        "Cada objeto deve ter EXATAMENTE as seguintes chaves:\n"
+        '  - "id": string (o id da resenha analisada, exatamente como informado).\n'
+        f"{_OUTPUT_KEYS_DESCRIPTION}"
+        "Responda APENAS com a lista JSON, sem nenhum texto ou formatação adicional."
+    )
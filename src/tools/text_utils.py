@@ -4,10 +4,30 @@ Funções utilitárias para manipulação e limpeza de texto.
 Estas funções são genéricas e não possuem conhecimento sobre o
 domínio da aplicação (resenhas, sentimentos, etc.).
 """
+import os
 import re
 import unicodedata
 import logging
-from langdetect import detect, LangDetectException
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Semente fixa: sem ela o langdetect pode dar respostas diferentes para o
+# mesmo texto a cada execução (ou em cada processo).
+LANGDETECT_SEED = 0
+_langdetect = None
+
+def _load_langdetect():
+    """
+    Importa o langdetect na primeira detecção (e fixa a semente), para não
+    pesar na inicialização de quem só usa as funções de limpeza de texto.
+    """
+    global _langdetect  # pylint: disable=global-statement
+    if _langdetect is None:
+        import langdetect  # pylint: disable=import-outside-toplevel
+        langdetect.DetectorFactory.seed = LANGDETECT_SEED
+        _langdetect = langdetect
+    return _langdetect
 
 def normalize_whitespace(text: str) -> str:
     """
@@ -43,6 +63,75 @@ def remove_special_characters(text: str, keep_punctuation: bool = True) -> str:
         # Mantém apenas letras, números e espaços
         return re.sub(r'[^a-zA-Z0-9\s]', '', text)
 
+# --- Versões em lote ----------------------------------------------------------
+# Produzem exatamente o mesmo resultado das funções acima, com um custo por
+# string bem menor. Os padrões e tabelas são compilados uma única vez.
+_SPECIAL_PATTERNS = {
+    True: re.compile(r'[^a-zA-Z0-9\s.,!?]'),
+    False: re.compile(r'[^a-zA-Z0-9\s]'),
+}
+# Separador usado para processar um bloco de strings de uma só vez. Não é
+# espaço, não é alterado pela NFKD e não combina com as marcas vizinhas.
+_BULK_SEPARATOR = "\x00"
+_BULK_CHUNK_SIZE = 10_000
+_SPECIAL_PATTERNS_WITH_SEPARATOR = {
+    keep: re.compile(pattern.pattern[:-1] + _BULK_SEPARATOR + "]")
+    for keep, pattern in _SPECIAL_PATTERNS.items()
+}
+# Tabelas para `str.translate` que removem os caracteres ASCII especiais.
+_ASCII_DELETE_TABLES = {
+    keep: {
+        code: None for code in range(128)
+        if pattern.match(chr(code)) and chr(code) != _BULK_SEPARATOR
+    }
+    for keep, pattern in _SPECIAL_PATTERNS.items()
+}
+# Espaços fora do ASCII (ex: U+2028) são mantidos pela versão escalar.
+_NON_ASCII_SPACE_PATTERN = re.compile(r'[^\S\x00-\x7f]')
+
+def normalize_whitespace_bulk(texts: Iterable[str]) -> List[str]:
+    """
+    Versão em lote de `normalize_whitespace`.
+
+    `str.split()` sem argumentos usa a mesma definição de espaço que `\\s`
+    (Unicode) e descarta as pontas, então o resultado é idêntico ao da
+    regex, sem o custo de uma chamada a `re.sub` por string.
+    """
+    return [" ".join(text.split()) for text in texts]
+
+def remove_special_characters_bulk(
+    texts: Iterable[str], keep_punctuation: bool = True
+) -> List[str]:
+    """
+    Versão em lote de `remove_special_characters`, com resultado idêntico.
+
+    As strings são processadas em blocos: cada bloco é unido por um
+    separador, normalizado (NFKD) e filtrado de uma só vez. Como o filtro
+    final só mantém caracteres ASCII (e espaços), as marcas combinantes já
+    são descartadas por ele e, quando não há espaços fora do ASCII, o filtro
+    se reduz a `encode('ascii', 'ignore')` seguido de `str.translate`.
+    """
+    results: List[str] = []
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, _BULK_CHUNK_SIZE)):
+        results.extend(_remove_special_characters_chunk(chunk, keep_punctuation))
+    return results
+
+def _remove_special_characters_chunk(chunk: List[str], keep_punctuation: bool) -> List[str]:
+    """Limpa um bloco de strings de uma só vez (ver `remove_special_characters_bulk`)."""
+    joined = _BULK_SEPARATOR.join(chunk)
+    if joined.count(_BULK_SEPARATOR) != len(chunk) - 1:
+        # Alguma string já contém o separador: processa uma a uma.
+        return [remove_special_characters(text, keep_punctuation) for text in chunk]
+
+    joined = unicodedata.normalize('NFKD', joined)
+    if _NON_ASCII_SPACE_PATTERN.search(joined):
+        cleaned = _SPECIAL_PATTERNS_WITH_SEPARATOR[keep_punctuation].sub('', joined)
+    else:
+        cleaned = joined.encode('ascii', 'ignore').decode('ascii')
+        cleaned = cleaned.translate(_ASCII_DELETE_TABLES[keep_punctuation])
+    return cleaned.split(_BULK_SEPARATOR)
+
 logger = logging.getLogger(__name__)
 
 def detect_language(text: str) -> str:
@@ -64,10 +153,129 @@ def detect_language(text: str) -> str:
         logger.debug("Texto muito curto para detecção de idioma confiável: '%s'", text)
         return "unknown"
 
+    langdetect = _load_langdetect()
     try:
         # Retorna apenas os 2 primeiros caracteres (ex: 'en' em vez de 'en-US')
-        return detect(text)[:2]
-    except LangDetectException:
+        return langdetect.detect(text)[:2]
+    except langdetect.LangDetectException:
         # Retorna 'unknown' se o texto for muito curto ou a detecção falhar
         logger.debug("langdetect não conseguiu determinar o idioma para o texto: '%s'", text[:50])
         return "unknown"
+
+# --- Detecção rápida (heurística) -------------------------------------------
+# Palavras funcionais exclusivas de cada idioma: as compartilhadas entre
+# português, espanhol e inglês ("de", "que", "no", "para", "so", "este",
+# "porque"...) ficam de fora do português e do inglês. Espanhol, francês e
+# italiano servem apenas como concorrentes, com marcadores comuns (incluindo
+# alguns que o português também usa, como "nada") que pesam contra ele: a
+# heurística só decide por português ou inglês.
+_STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "pt": frozenset(
+        "não nao é muito com uma um os do da dos das na em eu você voce ele ela "
+        "isso isto mais bem bom boa ótimo otimo também tambem já ainda pra tem "
+        "estou foi meu minha e ao nem só aplicativo gostei".split()
+    ),
+    "en": frozenset(
+        "the and is it this that to of for with not but very was are be have has "
+        "my i you on so just good great love can it's don't doesn't would will "
+        "they there what when all i'm app's really because".split()
+    ),
+    "es": frozenset(
+        "el la los las y es muy pero una del lo yo me gusta ya nada no para "
+        "aplicación también hay sirve".split()
+    ),
+    "fr": frozenset("le les et est je pas une des du pour avec très ce il c'est".split()),
+    "it": frozenset("il che non per molto questa questo della sono anche".split()),
+}
+# Caracteres que indicam fortemente um idioma.
+_CHARSET_HINTS: Dict[str, str] = {"ã": "pt", "õ": "pt", "ñ": "es", "¿": "es", "¡": "es"}
+_FAST_LANGUAGES = ("pt", "en")
+_WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+# Menor fração de pontos a favor do idioma vencedor para dispensar o langdetect.
+HEURISTIC_CONFIDENCE = 0.8
+_HEURISTIC_MIN_HITS = 2
+
+def heuristic_language(text: str) -> Tuple[Optional[str], float]:
+    """
+    Classificador rápido baseado em palavras funcionais e caracteres típicos.
+
+    Returns:
+        O idioma mais provável ('pt' ou 'en', ou None se o texto usa outro
+        alfabeto ou não há indícios suficientes) e a confiança, entre 0 e 1.
+    """
+    lowered = text.lower()
+    # Textos com letras fora do alfabeto latino ficam com o langdetect.
+    if any(ord(c) > 0x24F and c.isalpha() for c in lowered):
+        return None, 0.0
+
+    scores = dict.fromkeys(_STOPWORDS, 0)
+    for word in _WORD_PATTERN.findall(lowered):
+        for language, words in _STOPWORDS.items():
+            if word in words:
+                scores[language] += 1
+    for char, language in _CHARSET_HINTS.items():
+        if char in lowered:
+            scores[language] += 2
+
+    best = max(scores, key=scores.get)
+    total = sum(scores.values())
+    if best not in _FAST_LANGUAGES or scores[best] < _HEURISTIC_MIN_HITS:
+        return None, 0.0
+    return best, scores[best] / total
+
+def detect_language_tiered(
+    text: str, threshold: float = HEURISTIC_CONFIDENCE
+) -> Tuple[str, str]:
+    """
+    Detecção em camadas: a regra de texto curto, depois a heurística e, só
+    para textos ambíguos, o langdetect.
+
+    Returns:
+        O código do idioma e a camada que decidiu: 'short', 'heuristic' ou
+        'langdetect'.
+    """
+    if len(text.strip()) < 10:
+        return "unknown", "short"
+    language, confidence = heuristic_language(text)
+    if language is not None and confidence >= threshold:
+        return language, "heuristic"
+    return detect_language(text), "langdetect"
+
+def _detect_chunk(texts: List[str], fast_path: bool = False) -> List[str]:
+    """Detecta o idioma de um bloco de textos (executado em um processo do pool)."""
+    if fast_path:
+        return [detect_language_tiered(text)[0] for text in texts]
+    return [detect_language(text) for text in texts]
+
+def detect_languages(
+    texts: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 256,
+    fast_path: bool = False,
+) -> List[str]:
+    """
+    Detecta o idioma de vários textos de uma vez, mantendo a ordem de entrada.
+
+    Aplica as mesmas regras de `detect_language` (inclusive 'unknown' para
+    textos com menos de 10 caracteres) e, como a semente é fixa, o resultado
+    não depende da quantidade de processos.
+
+    Args:
+        texts: Os textos a serem analisados.
+        workers: Número de processos (1 = no processo atual, 0 = todas as CPUs).
+        chunk_size: Quantidade de textos enviada a um processo por vez.
+        fast_path: Se True, usa `detect_language_tiered` (heurística antes
+            do langdetect).
+
+    Returns:
+        Um código de idioma (ou 'unknown') por texto.
+    """
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) <= chunk_size:
+        return _detect_chunk(texts, fast_path)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        results = executor.map(_detect_chunk, chunks, [fast_path] * len(chunks))
+        return [lang for langs in results for lang in langs]
@@ -0,0 +1,134 @@
+"""
+Estimativas de tokens para dimensionar prompts e respostas do LLM.
+
+As estimativas são heurísticas (sem tokenizer do modelo): contam bytes UTF-8,
+o que aproxima bem textos em alfabeto latino (~4 bytes por token) e é
+conservador para escritas como japonês ou chinês.
+"""
+import math
+from typing import List, Tuple
+
+from src.config import settings
+from src.models import ReviewRaw
+
+# Bytes UTF-8 por token, em média, para os tokenizers BPE usuais.
+BYTES_PER_TOKEN = 4
+# Tokens gerados para as chaves fixas do JSON (sentimento, intensidade,
+# aspectos e explicação), sem contar a tradução.
+JSON_OVERHEAD_TOKENS = 110
+# Traduções para o português costumam ser mais longas que o original.
+TRANSLATION_EXPANSION = 1.3
+# Folga aplicada sobre a estimativa para evitar JSON truncado.
+SAFETY_MARGIN = 1.25
+TRIM_MARKER = " [...] "
+
+
+def estimate_tokens(text: str) -> int:
+    """Estima o número de tokens de um texto."""
+    return math.ceil(len(text.encode("utf-8")) / BYTES_PER_TOKEN)
+
+
+def _byte_prefix(text: str, budget_bytes: int) -> str:
+    """Maior início do texto com até `budget_bytes` bytes UTF-8."""
+    return text.encode("utf-8")[:budget_bytes].decode("utf-8", "ignore")
+
+
+def _byte_suffix(text: str, budget_bytes: int) -> str:
+    """Maior fim do texto com até `budget_bytes` bytes UTF-8."""
+    if budget_bytes <= 0:
+        return ""
+    return text.encode("utf-8")[-budget_bytes:].decode("utf-8", "ignore")
+
+
+def trim_to_token_budget(text: str, max_tokens: int) -> str:
+    """
+    Reduz um texto para caber em `max_tokens`, de forma controlada.
+
+    Mantém o início (70%) e o fim (30%) do texto, cortando em fronteiras de
+    palavra e indicando o trecho removido com " [...] ". Se nem a primeira
+    (ou a última) palavra couber, como em textos sem espaços (japonês,
+    chinês, URLs longas), o corte é feito por caracteres. Textos que já
+    cabem no orçamento são retornados sem alteração.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget_bytes = max(0, max_tokens * BYTES_PER_TOKEN - len(TRIM_MARKER))
+    head_budget = int(budget_bytes * 0.7)
+    tail_budget = budget_bytes - head_budget
+
+    head, used = [], 0
+    for word in text.split(" "):
+        size = len(word.encode("utf-8")) + 1
+        if used + size > head_budget:
+            break
+        head.append(word)
+        used += size
+    head_text = " ".join(head) if head else _byte_prefix(text, head_budget)
+
+    rest = text[len(head_text):]
+    tail, used = [], 0
+    for word in reversed(rest.split(" ")):
+        size = len(word.encode("utf-8")) + 1
+        if used + size > tail_budget:
+            break
+        tail.append(word)
+        used += size
+    tail.reverse()
+    tail_text = " ".join(tail) if tail else _byte_suffix(rest, tail_budget)
+
+    return (head_text + TRIM_MARKER + tail_text).strip()
+
+
+def output_token_budget(review: ReviewRaw) -> int:
+    """
+    Estima o `max_tokens` necessário para a análise JSON de uma resenha.
+
+    Considera o tamanho da tradução (proporcional ao texto original e maior
+    quando a resenha não está em português) mais as chaves fixas do JSON,
+    limitado a [LLM_MIN_OUTPUT_TOKENS, LLM_MAX_OUTPUT_TOKENS].
+    """
+    translation = estimate_tokens(review.text)
+    if review.language != "pt":
+        translation = math.ceil(translation * TRANSLATION_EXPANSION)
+    budget = math.ceil((JSON_OVERHEAD_TOKENS + translation) * SAFETY_MARGIN)
+    return min(settings.LLM_MAX_OUTPUT_TOKENS, max(settings.LLM_MIN_OUTPUT_TOKENS, budget))
+
+
+def budget_review(review: ReviewRaw) -> Tuple[ReviewRaw, int]:
+    """
+    Prepara uma resenha para o prompt: limita o texto a LLM_MAX_INPUT_TOKENS
+    e calcula o orçamento de saída correspondente.
+
+    Returns:
+        Uma cópia da resenha (com o texto possivelmente reduzido) e o
+        `max_tokens` a ser usado na requisição.
+    """
+    trimmed_text = trim_to_token_budget(review.text, settings.LLM_MAX_INPUT_TOKENS)
+    if trimmed_text != review.text:
+        review = review.model_copy(update={"text": trimmed_text})
+    return review, output_token_budget(review)
+
+
+def fit_to_context(prompt: str, max_tokens: int) -> int:
+    """
+    Ajusta `max_tokens` para que prompt + resposta caibam em LLM_CONTEXT_TOKENS.
+
+    Nunca retorna menos que LLM_MIN_OUTPUT_TOKENS.
+    """
+    available = settings.LLM_CONTEXT_TOKENS - estimate_tokens(prompt)
+    return max(settings.LLM_MIN_OUTPUT_TOKENS, min(max_tokens, available))
+
+
+def budget_reviews(reviews: List[ReviewRaw]) -> Tuple[List[ReviewRaw], List[int]]:
+    """
+    Aplica `budget_review` a cada resenha quando LLM_DYNAMIC_MAX_TOKENS está
+    ativo; caso contrário, mantém os textos e usa LLM_MAX_TOKENS para todas.
+
+    Returns:
+        As resenhas a serem usadas nos prompts e o `max_tokens` de cada uma.
+    """
+    if not settings.LLM_DYNAMIC_MAX_TOKENS:
+        return list(reviews), [settings.LLM_MAX_TOKENS] * len(reviews)
+    prepared = [budget_review(review) for review in reviews]
+    return [r for r, _ in prepared], [b for _, b in prepared]
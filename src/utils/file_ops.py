@@ -7,11 +7,14 @@ e formata os dados antes de delegar a escrita para o módulo `io` genérico.
 
 import logging
 from collections import Counter
+from itertools import chain
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
 from src.models import ReviewProcessed
-from src.utils.io import save_json, save_text
+from src.processor import ReviewAggregator
+from src.review_table import ReviewTable
+from src.utils.io import save_json, save_json_object, save_text, save_text_chunks
 
 
 logger = logging.getLogger(__name__)
@@ -20,15 +23,28 @@ logger = logging.getLogger(__name__)
 class FileOpsError(Exception):
     """Exceção personalizada para erros de operações de arquivo."""
 
-def save_processed_json(reviews: Iterable[ReviewProcessed], path: Path):
-    """Salva uma lista de resenhas processadas em um arquivo JSON."""
-    # 1. Prepara os dados (converte modelos Pydantic para dicionários)
-    data_to_save = [r.model_dump() for r in reviews]
-    # 2. Delega a escrita para a função genérica de salvar JSON
+def save_processed_json(reviews: Union[ReviewTable, Iterable[ReviewProcessed]], path: Path):
+    """
+    Salva uma lista (ou ReviewTable) de resenhas processadas em um arquivo JSON.
+    """
+    # 1. Prepara os dados sob demanda (converte modelos Pydantic para
+    #    dicionários; uma ReviewTable já fornece os dicionários a partir das
+    #    colunas), sem montar a lista inteira em memória
+    if isinstance(reviews, ReviewTable):
+        data_to_save = reviews.iter_dicts()
+    else:
+        data_to_save = (r.model_dump() for r in reviews)
+    # 2. Delega a escrita para a função genérica de salvar JSON, item a item
     save_json(data_to_save, path)
     logger.info("Arquivo JSON processado salvo em: %s", path)
 
 
+def save_summary_json(report: Dict[str, Any], path: Path):
+    """Salva o relatório analítico (ver `src.analytics.build_report`) em JSON."""
+    save_json_object(report, path)
+    logger.info("Relatório analítico salvo em: %s", path)
+
+
 def save_summary_txt(counts: Counter, concatenated: str, path: Path):
     """Salva a contagem de sentimentos e o texto concatenado em um arquivo de texto."""
     # 1. Formata o conteúdo do sumário como uma única string
@@ -40,3 +56,27 @@ def save_summary_txt(counts: Counter, concatenated: str, path: Path):
     # 2. Delega a escrita para a função genérica de salvar texto
     save_text(summary_content, path)
     logger.info("Arquivo de sumário salvo em: %s", path)
+
+
+def _format_counts(title: str, counts: Iterable[Tuple[str, int]]) -> List[str]:
+    """Formata uma seção de contagens do sumário."""
+    return [title, *(f"{k}: {v}" for k, v in counts)]
+
+
+def save_aggregated_summary(aggregator: ReviewAggregator, path: Path, top_aspects: int = 20):
+    """
+    Salva o sumário a partir de um ReviewAggregator: as contagens por
+    sentimento, idioma e intensidade, os aspectos mais citados e a seção
+    concatenada, copiada em blocos sem passar por uma única string.
+    """
+    header = [
+        *_format_counts("Contagem de sentimentos:", aggregator.sentiments.items()),
+        *_format_counts("\nContagem por idioma:", aggregator.languages.most_common()),
+        *_format_counts("\nContagem por intensidade:", aggregator.intensities.most_common()),
+        *_format_counts("\nAspectos mais citados:", aggregator.aspects.most_common(top_aspects)),
+        "\nConcatenado:",
+    ]
+    save_text_chunks(
+        chain(["\n".join(header) + "\n"], aggregator.iter_concatenated()), path
+    )
+    logger.info("Arquivo de sumário salvo em: %s", path)
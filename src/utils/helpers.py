@@ -4,18 +4,194 @@ Funções utilitárias pequenas e compartilhadas.
 
 import json
 import logging
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele, usa-se o decodificador padrão
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Tokens relevantes para delimitar um objeto JSON: strings completas (ou
+# interrompidas pelo fim do texto, com o grupo 1 vazio) e a pontuação
+# estrutural. Números, literais e espaços entre eles são ignorados.
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*("?)|[{}\[\],:]')
+# Vírgulas anteriores (da última para a primeira) tentadas como ponto de
+# corte ao reparar uma resposta truncada.
+_MAX_REPAIR_CUTS = 3
+
+def _decode_json(text: str) -> Any:
+    """Decodifica JSON com o orjson, se instalado, e o decodificador padrão como reserva."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # O padrão aceita NaN/Infinity e dá a mensagem de erro usual
+    return json.loads(text)
+
+def _slice_without(text: str, start: int, end: int, dropped: List[int]) -> str:
+    """Retorna `text[start:end]` sem os caracteres nas posições `dropped` (em ordem)."""
+    parts = []
+    for position in dropped:
+        if position >= end:
+            break
+        parts.append(text[start:position])
+        start = position + 1
+    parts.append(text[start:end])
+    return "".join(parts)
+
+def _json_candidates(
+    text: str, start: int, complete_items: bool = False
+) -> Tuple[List[str], bool]:
+    """
+    Percorre, em uma única passada, o objeto (ou a lista) JSON que começa em
+    `start` e retorna os textos a decodificar, sem vírgulas finais (antes de
+    '}' ou ']'), e se eles são reparos.
+
+    Se a estrutura fecha, o único candidato é ela (o que vem depois é
+    ignorado). Se o texto termina antes (ex: pelo limite de max_tokens), os
+    candidatos são reparos, do mais completo ao mais curto: fechar a string
+    aberta e as chaves e colchetes pendentes; depois, cortar em uma vírgula
+    anterior, descartando o último item incompleto.
+
+    Com `complete_items` (para listas), o reparo só mantém os elementos
+    completos da lista: o elemento interrompido é descartado inteiro, em vez
+    de completado com um valor cortado.
+    """
+    stack: List[str] = []
+    dropped: List[int] = []  # vírgulas finais a remover
+    cuts: List[Tuple[int, str]] = []  # (posição de uma vírgula, fechamento naquele ponto)
+    last_comma: Optional[int] = None
+    end = len(text)
+    open_string = False
+    for match in _JSON_TOKEN.finditer(text, start):
+        token = match.group()
+        if token[0] == '"' and not match.group(1):
+            # String interrompida pelo fim do texto (descarta uma barra invertida solta)
+            end, open_string = match.end(), True
+            break
+        if token in ("}", "]"):
+            if last_comma is not None and not text[last_comma + 1:match.start()].strip():
+                dropped.append(last_comma)
+            if not stack or stack.pop() != token:
+                return [], False  # Estrutura inválida
+            if not stack:
+                return [_slice_without(text, start, match.end(), dropped)], False
+        elif token in ("{", "["):
+            stack.append("}" if token == "{" else "]")
+        elif token == ",":
+            cuts.append((match.start(), "".join(reversed(stack))))
+        last_comma = match.start() if token == "," else None
+
+    if complete_items:
+        candidates = []
+        if not open_string and stack == ["]"]:
+            # O texto termina logo após um elemento completo
+            candidates.append(_slice_without(text, start, end, dropped).rstrip().rstrip(",") + "]")
+        top_level = [position for position, closing in cuts if closing == "]"]
+        if top_level:
+            candidates.append(_slice_without(text, start, top_level[-1], dropped) + "]")
+        return candidates, True
+
+    body = _slice_without(text, start, end, dropped)
+    if open_string:
+        body += '"'
+    body = body.rstrip()
+    if body.endswith(","):
+        body = body[:-1]
+    elif body.endswith(":"):
+        body += " null"
+    candidates = [body + "".join(reversed(stack))]
+    for position, closing in reversed(cuts[-_MAX_REPAIR_CUTS:]):
+        candidates.append(_slice_without(text, start, position, dropped) + closing)
+    return candidates, True
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extrai o primeiro objeto JSON de uma resposta de LLM, reparando os
+    danos mais comuns.
+
+    1. Caminho rápido: do primeiro '{' ao último '}', decodificado com o
+       orjson quando disponível.
+    2. Caso contrário, um scanner de uma passada (que respeita strings e
+       escapes) delimita o primeiro objeto balanceado, ignorando texto ou
+       objetos depois dele e removendo vírgulas finais.
+    3. Se o objeto foi cortado (ex: pelo limite de max_tokens), a string
+       aberta é fechada e as chaves e colchetes pendentes são completados,
+       descartando o último item se ele estiver incompleto.
+
+    Returns:
+        O dicionário extraído, ou None se nenhum objeto puder ser recuperado.
+    """
+    start_index = text.find("{")
+    if start_index == -1:
+        return None
+    end_index = text.rfind("}")
+    if end_index > start_index:
+        try:
+            data = _decode_json(text[start_index:end_index + 1])
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+
+    candidates, repaired = _json_candidates(text, start_index)
+    for candidate in candidates:
+        try:
+            data = _decode_json(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            if repaired:
+                logger.info("JSON truncado na resposta do LLM foi reparado.")
+            return data
+    return None
+
+def extract_json_list(text: str) -> Optional[List[Any]]:
+    """
+    Extrai a primeira lista JSON de uma resposta de LLM, com os mesmos
+    reparos de `extract_json_object` (texto em volta, vírgulas finais).
+
+    Se a lista foi cortada (ex: pelo limite de max_tokens), apenas os
+    elementos completos são mantidos; o elemento interrompido é descartado.
+
+    Returns:
+        A lista extraída, ou None se nenhuma lista puder ser recuperada.
+    """
+    start_index = text.find("[")
+    if start_index == -1:
+        return None
+    end_index = text.rfind("]")
+    if end_index > start_index:
+        try:
+            data = _decode_json(text[start_index:end_index + 1])
+            if isinstance(data, list):
+                return data
+        except ValueError:
+            pass
+
+    candidates, repaired = _json_candidates(text, start_index, complete_items=True)
+    for candidate in candidates:
+        try:
+            data = _decode_json(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, list):
+            if repaired:
+                logger.info("Lista JSON truncada na resposta do LLM foi reparada.")
+            return data
+    return None
+
 def safe_json_load(text: str) -> Dict[str, Any]:
     """
     Tenta carregar uma string como JSON de forma segura, limpando-a primeiro.
 
     Esta função é projetada para lidar com respostas de LLMs que podem
-    envolver o JSON em blocos de código Markdown (```json ... ```) ou
-    adicionar texto explicativo. Ela extrai o conteúdo entre o primeiro '{'
-    e o último '}'.
+    envolver o JSON em blocos de código Markdown (```json ... ```), adicionar
+    texto explicativo, repetir o objeto ou ser cortadas no meio do JSON (ver
+    `extract_json_object`).
 
     Args:
         text: A string que se espera conter um JSON.
@@ -24,28 +200,79 @@ def safe_json_load(text: str) -> Dict[str, Any]:
         Um dicionário se o parsing for bem-sucedido, ou um dicionário vazio em caso de erro.
     """
     try:
-        # Encontra o início e o fim do objeto JSON na string
-        start_index = text.find('{')
-        end_index = text.rfind('}')
-
-        if start_index != -1 and end_index != -1:
-            # Extrai a substring que parece ser o JSON
-            json_str = text[start_index : end_index + 1]
-            return json.loads(json_str)
-        else:
+        if "{" not in text:
             # Se não encontrar um objeto JSON, retorna vazio
             logger.warning(
                 "Nenhum objeto JSON ('{...}') encontrado na resposta do LLM: %s", text[:200]
             )
             return {}
+        data = extract_json_object(text)
+        if data is None:
+            logger.warning(
+                "Falha ao decodificar JSON extraído. Resposta do LLM: %s", text[:200]
+            )
+            return {}
+        return data
+
+    except (TypeError, RecursionError) as e:
+        logger.error(
+            "Erro ao decodificar JSON (tipo inválido ou recursão excessiva): %s", e
+        )
+        return {}
+
+def safe_json_list_load(text: str) -> List[Any]:
+    """
+    Tenta carregar uma string como uma lista JSON de forma segura.
+
+    Funciona como `safe_json_load`, mas extrai a primeira lista (ver
+    `extract_json_list`): uma lista cortada pelo limite de max_tokens ou com
+    vírgulas finais mantém os seus elementos completos, para que só as
+    resenhas que faltam sejam pedidas de novo. Se a resposta contiver um
+    objeto em vez de uma lista,
+    são aceitos os formatos {"resenhas": [{"id": ...}, ...]} (uma lista de
+    objetos com "id"), {"<id>": {...}, ...} e um único objeto com "id".
+    Outras listas do objeto (ex: "aspects") não são tomadas como a lista de
+    resultados.
+
+    Args:
+        text: A string que se espera conter uma lista JSON.
+
+    Returns:
+        A lista carregada, ou uma lista vazia em caso de erro.
+    """
+    try:
+        start_index = text.find('[')
+        object_index = text.find('{')
+
+        if start_index != -1 and (object_index == -1 or start_index < object_index):
+            data = extract_json_list(text)
+            if data is None:
+                logger.warning(
+                    "Falha ao decodificar lista JSON extraída. Resposta do LLM: %s", text[:200]
+                )
+                return []
+            return data
+
+        data = safe_json_load(text)
+        if "id" in data:
+            return [data]
+        for value in data.values():
+            if isinstance(value, list) and value and all(
+                isinstance(item, dict) and "id" in item for item in value
+            ):
+                return value
+        return [
+            {"id": key, **value} for key, value in data.items()
+            if isinstance(value, dict)
+        ]
 
     except json.JSONDecodeError:
         logger.warning(
-            "Falha ao decodificar JSON extraído. Resposta do LLM: %s", text[:200]
+            "Falha ao decodificar lista JSON extraída. Resposta do LLM: %s", text[:200]
         )
-        return {}
+        return []
     except (TypeError, RecursionError) as e:
         logger.error(
-            "Erro ao decodificar JSON (tipo inválido ou recursão excessiva): %s", e
+            "Erro ao decodificar lista JSON (tipo inválido ou recursão excessiva): %s", e
         )
-        return {}
+        return []
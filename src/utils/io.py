@@ -7,13 +7,35 @@ from pathlib import Path
 from typing import Iterable
 
 def save_json(data: Iterable[dict], path: Path):
-    """Salva dados iteráveis (como uma lista de dicionários) em um arquivo JSON."""
+    """
+    Salva dados iteráveis (como uma lista de dicionários) em um arquivo JSON.
+
+    O array é escrito item a item, no mesmo formato de `json.dump(...,
+    indent=2)`, sem montar a lista inteira em memória.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        separator = "[\n  "
+        for item in data:
+            f.write(separator)
+            f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+            separator = ",\n  "
+        f.write("[]" if separator == "[\n  " else "\n]")
+
+def save_json_object(data: dict, path: Path):
+    """Salva um dicionário em um arquivo JSON."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        json.dump(list(data), f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
 def save_text(text: str, path: Path):
     """Salva uma string de texto em um arquivo."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
         f.write(text)
+
+def save_text_chunks(chunks: Iterable[str], path: Path):
+    """Salva um texto recebido em partes, sem montá-lo inteiro em memória."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.writelines(chunks)
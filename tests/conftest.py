@@ -0,0 +1,16 @@
+"""
+Fixtures compartilhadas pelos testes.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.config import settings
+from src.tools import language_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_language_cache(tmp_path: Path, monkeypatch):
+    """Mantém os caches dos testes (idiomas, resenhas parseadas) fora do diretório de dados."""
+    monkeypatch.setattr(settings, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(language_cache, "_default_cache", None)
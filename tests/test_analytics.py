@@ -0,0 +1,79 @@
+"""
+Testes para o relatório analítico vetorizado em `src.analytics`.
+"""
+import json
+from pathlib import Path
+
+from src.analytics import build_report, load_frames
+from src.models import ReviewProcessed
+from src.review_table import ReviewTable
+from src.utils.file_ops import save_summary_json
+
+REVIEWS = [
+    ReviewProcessed(
+        user="UserA", original="Great!", translation_pt="Ótimo!", sentiment="positive",
+        language="en", intensity="Alta", aspects=["desempenho", "design"], explanation="Bom",
+    ),
+    ReviewProcessed(
+        user="UserB", original="Ruim.", translation_pt="Ruim.", sentiment="negative",
+        language="pt", intensity="Média", aspects=[], explanation="Ruim",
+    ),
+    ReviewProcessed(
+        user="UserA", original="Bof.", translation_pt="Mais ou menos.", sentiment="neutral",
+        language="fr", intensity="Baixa", aspects=["design"], explanation="Neutro",
+    ),
+    ReviewProcessed(
+        user="UserC", original="Nice", translation_pt="Legal", sentiment="positive",
+        language="en", intensity="Alta", aspects=["design", "preço"], explanation="Bom",
+    ),
+]
+
+def test_load_frames_expands_aspects():
+    """Cada aspecto citado deve virar uma linha com o sentimento da sua resenha."""
+    frame, aspects = load_frames(REVIEWS)
+
+    assert list(frame["user"]) == ["UserA", "UserB", "UserA", "UserC"]
+    assert list(frame["language"]) == ["en", "pt", "fr", "en"]
+    assert list(aspects["aspect"]) == ["desempenho", "design", "design", "design", "preço"]
+    assert list(aspects["sentiment"]) == [
+        "positive", "positive", "neutral", "positive", "positive",
+    ]
+
+def test_build_report_counts():
+    """O relatório deve trazer as tabelas cruzadas, os aspectos e os usuários."""
+    report = build_report(REVIEWS, top_aspects=2)
+
+    assert report["total_reviews"] == 4
+    assert report["sentiment_counts"] == {"positive": 2, "negative": 1, "neutral": 1}
+    assert report["sentiment_by_language"]["en"] == {
+        "positive": 2, "negative": 0, "neutral": 0,
+    }
+    assert report["sentiment_by_intensity"]["Baixa"]["neutral"] == 1
+    assert report["top_aspects_by_sentiment"] == {
+        "positive": [{"aspect": "design", "count": 2}, {"aspect": "desempenho", "count": 1}],
+        "neutral": [{"aspect": "design", "count": 1}],
+    }
+    assert report["users"] == {
+        "distinct": 3,
+        "max_reviews_per_user": 2,
+        "reviews_per_user": {"UserA": 2, "UserB": 1, "UserC": 1},
+    }
+
+def test_build_report_accepts_table_and_empty_input():
+    """A tabela colunar deve dar o mesmo relatório; sem resenhas, tudo zerado."""
+    assert build_report(ReviewTable.from_rows(REVIEWS)) == build_report(REVIEWS)
+
+    empty = build_report([])
+    assert empty["total_reviews"] == 0
+    assert empty["top_aspects_by_sentiment"] == {}
+    assert empty["users"]["max_reviews_per_user"] == 0
+
+def test_save_summary_json(tmp_path: Path):
+    """O relatório deve ser gravado como JSON legível, sem escapar acentos."""
+    output_file = tmp_path / "outputs" / "summary.json"
+
+    save_summary_json(build_report(REVIEWS), output_file)
+
+    content = output_file.read_text(encoding="utf-8")
+    assert "preço" in content
+    assert json.loads(content) == build_report(REVIEWS)
@@ -0,0 +1,93 @@
+"""
+Testes para o controle adaptativo de concorrência em `src.concurrency`.
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from openai import APIStatusError
+
+from src.concurrency import AdaptiveConcurrencyController, percentile
+from src.llm_client import API_ERROR_RESPONSE, LLMClient
+
+
+def test_percentile_nearest_rank():
+    """O percentil deve seguir o método nearest-rank."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 95) == 95.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([], 95) == 0.0
+
+
+def test_limit_grows_while_latency_is_flat():
+    """Com latência estável, o limite aumenta um a cada janela até o teto."""
+    controller = AdaptiveConcurrencyController(min_limit=1, max_limit=3, window_size=5)
+
+    for _ in range(5 * 4):
+        controller.record_success(1.0)
+
+    metrics = controller.metrics()
+    assert metrics["limit"] == 3
+    assert [c["to"] for c in metrics["changes"]] == [2, 3]
+    assert all("estável" in c["reason"] for c in metrics["changes"])
+
+
+def test_limit_backs_off_when_latency_rises():
+    """Uma alta do p95 além da tolerância reduz o limite multiplicativamente."""
+    controller = AdaptiveConcurrencyController(
+        min_limit=1, max_limit=20, initial_limit=10, window_size=5
+    )
+    for _ in range(5):
+        controller.record_success(1.0)
+    for _ in range(5):
+        controller.record_success(5.0)
+
+    metrics = controller.metrics()
+    assert metrics["limit"] == 7  # floor(11 * 0.7)
+    assert "em alta" in metrics["changes"][-1]["reason"]
+
+
+def test_burst_of_failures_counts_once():
+    """Falhas de requisições iniciadas antes da última redução são ignoradas."""
+    controller = AdaptiveConcurrencyController(min_limit=1, max_limit=20, initial_limit=10)
+    started_at = time.monotonic()
+
+    controller.record_failure(started_at)
+    controller.record_failure(started_at)
+    controller.record_failure(started_at)
+
+    assert controller.limit == 7
+    assert controller.metrics()["changes"][0]["reason"] == "timeout/erro de conexão"
+
+
+def test_llm_client_uses_adaptive_limit():
+    """O cliente não deve ultrapassar o limite atual do controlador."""
+    client = LLMClient(base_url="http://mock/v1", max_concurrency=8, adaptive=True)
+    client.client = MagicMock()
+    client.client.max_retries = 0
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message.content = "{}"
+    # Latência constante para que o p95 permaneça estável entre as janelas.
+    client.client.chat.completions.create.side_effect = (
+        lambda **_kwargs: time.sleep(0.01) or resp
+    )
+
+    assert client.concurrency_limit == 1
+    assert client.batch_process(["p"] * 60) == ["{}"] * 60
+    assert 1 < client.concurrency_limit <= 8
+
+
+@pytest.mark.parametrize("status_code, backs_off", [(429, True), (503, True), (400, False)])
+def test_llm_client_backs_off_on_overload_status(status_code: int, backs_off: bool):
+    """Rate limit (429) e erros 5xx reduzem o limite; outros erros de API, não."""
+    client = LLMClient(base_url="http://mock/v1", max_concurrency=8, adaptive=True)
+    client.concurrency = AdaptiveConcurrencyController(min_limit=1, max_limit=8, initial_limit=8)
+    client.client = MagicMock()
+    client.client.max_retries = 0
+    client.client.chat.completions.create.side_effect = APIStatusError(
+        "erro", response=MagicMock(status_code=status_code), body=None
+    )
+
+    assert client.batch_process(["p"]) == [API_ERROR_RESPONSE]
+    assert (client.concurrency_limit < 8) is backs_off
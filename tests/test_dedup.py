@@ -0,0 +1,56 @@
+"""
+Testes para a deduplicação de resenhas em `src.dedup`.
+"""
+import json
+
+from src.dedup import DuplicateTracker, dedup_key
+from src.models import ReviewRaw
+from src.processor import map_llm_response_to_processed
+
+REVIEWS = [
+    ReviewRaw(id="1", user="Ana", text="Ótimo app", language="pt"),
+    ReviewRaw(id="2", user="Bruno", text="Muito bom, recomendo!", language="pt"),
+    ReviewRaw(id="3", user="Carla", text="ótimo   APP", language="pt"),
+    ReviewRaw(id="4", user="Davi", text="Ótimo app", language="unknown"),
+    ReviewRaw(id="5", user="Eva", text="Ótimo app", language="pt"),
+]
+
+
+def test_dedup_key_normalizes_case_and_whitespace():
+    """Diferenças de caixa e espaçamento não impedem o agrupamento."""
+    assert dedup_key(REVIEWS[0]) == dedup_key(REVIEWS[2])
+    assert dedup_key(REVIEWS[0]) != dedup_key(REVIEWS[3])  # idioma diferente
+
+
+def test_duplicate_tracker_keeps_each_member_user():
+    """A análise do representante é repassada a todos os membros, cada um com seu usuário."""
+    tracker = DuplicateTracker()
+    sent = [review for index, review in enumerate(REVIEWS) if tracker.add(index, review)[0]]
+    analysis = json.dumps({
+        "translation_pt": "Ótimo app",
+        "sentiment": "positive",
+        "intensity": "Alta",
+        "aspects": ["geral"],
+        "explanation": "Elogio.",
+    })
+
+    assert [r.id for r in sent] == ["1", "2", "4"]
+    members = [REVIEWS[0]] + [review for _, review in tracker.resolve(REVIEWS[0], analysis)]
+    processed = [map_llm_response_to_processed(review, analysis) for review in members]
+    assert [p.user for p in processed] == ["Ana", "Carla", "Eva"]
+    assert processed[1].original == "ótimo   APP"
+    assert all(p.sentiment == "positive" for p in processed)
+
+
+def test_duplicate_tracker_holds_duplicates_until_resolved():
+    """No fluxo, duplicatas aguardam o representante ou recebem a resposta já conhecida."""
+    tracker = DuplicateTracker()
+
+    assert tracker.add(0, REVIEWS[0]) == (True, None)
+    assert tracker.add(1, REVIEWS[1]) == (True, None)
+    assert tracker.add(2, REVIEWS[2]) == (False, None)
+
+    assert tracker.resolve(REVIEWS[0], "resposta") == [(2, REVIEWS[2])]
+    assert tracker.add(3, REVIEWS[3]) == (True, None)
+    assert tracker.add(4, REVIEWS[4]) == (False, "resposta")
+    assert (tracker.total, tracker.unique) == (5, 3)
@@ -3,7 +3,7 @@ Teste unitário para a função detect_language em text_utils.py.
 """
 
 import pytest
-from src.tools.text_utils import detect_language
+from src.tools.text_utils import detect_language, detect_language_tiered, detect_languages
 
 # Casos de teste para a função detect_language
 DETECT_LANGUAGE_CASES = [
@@ -33,3 +33,31 @@ def test_detect_language(text: str, expected_language: str):
     """
     detected_lang = detect_language(text)
     assert detected_lang == expected_language
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_detect_languages_matches_single_detection(workers: int):
+    """
+    Testa se a detecção em lote mantém a ordem e dá o mesmo resultado que
+    `detect_language`, com ou sem processos auxiliares.
+    """
+    texts = [text for text, _ in DETECT_LANGUAGE_CASES] * 3
+
+    detected = detect_languages(texts, workers=workers, chunk_size=4)
+
+    assert detected == [detect_language(text) for text in texts]
+
+@pytest.mark.parametrize("text, expected", [
+    ("Muito bom, recomendo! Não trava mais no meu celular.", ("pt", "heuristic")),
+    ("The app keeps crashing when I open it.", ("en", "heuristic")),
+    ("Esto es una prueba en español.", ("es", "langdetect")),
+    ("La aplicación no funciona, ya no sirve para nada", ("es", "langdetect")),
+    ("Das ist eine sehr gute Idee.", ("de", "langdetect")),
+    ("これは日本語のテストです。", ("ja", "langdetect")),
+    ("Hi", ("unknown", "short")),
+])
+def test_detect_language_tiered_reports_deciding_tier(text: str, expected):
+    """
+    Testa se textos claros em português/inglês são decididos pela heurística
+    e os demais caem no langdetect, informando a camada que decidiu.
+    """
+    assert detect_language_tiered(text) == expected
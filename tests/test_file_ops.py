@@ -7,7 +7,9 @@ from pathlib import Path
 
 # Importa os modelos e as funções que vamos testar
 from src.models import ReviewProcessed
-from src.utils.file_ops import save_processed_json, save_summary_txt
+from src.processor import ReviewAggregator
+from src.utils.file_ops import save_aggregated_summary, save_processed_json, save_summary_txt
+from src.utils.io import save_json
 
 def test_save_processed_json(tmp_path: Path):
     """
@@ -72,6 +74,19 @@ def test_save_processed_json(tmp_path: Path):
     ]
     assert saved_data == expected_data, "O conteúdo do arquivo JSON está incorreto."
 
+def test_save_json_streams_items_in_json_dump_format(tmp_path: Path):
+    """
+    `save_json` aceita um gerador e escreve o mesmo texto que `json.dump`
+    com `indent=2`, inclusive para a lista vazia.
+    """
+    output_file = tmp_path / "items.json"
+    for data in ([], [{"a": 1, "b": ["ç", {"c": None}]}, {}]):
+        save_json((item for item in data), output_file)
+
+        assert output_file.read_text(encoding="utf-8") == json.dumps(
+            data, ensure_ascii=False, indent=2
+        )
+
 def test_save_summary_txt(tmp_path: Path):
     """
     Testa a função save_summary_txt.
@@ -102,3 +117,30 @@ def test_save_summary_txt(tmp_path: Path):
     assert "neutral: 2" in saved_content
     assert "\nConcatenado:\n" in saved_content
     assert "UserA: Review1 || UserB: Review2" in saved_content
+
+def test_save_aggregated_summary(tmp_path: Path):
+    """
+    Testa se o sumário gravado a partir do agregador traz as contagens, os
+    aspectos e a seção concatenada no mesmo formato de `save_summary_txt`.
+    """
+    reviews = [
+        ReviewProcessed(
+            user=user, original=original, translation_pt=original, sentiment=sentiment,
+            language=language, intensity="Alta", aspects=aspects, explanation="-",
+        )
+        for user, original, sentiment, language, aspects in [
+            ("UserA", "Review1", "positive", "en", ["preço", "ui"]),
+            ("UserB", "Review2", "negative", "pt", ["ui"]),
+        ]
+    ]
+    output_file = tmp_path / "outputs" / "summary.txt"
+
+    with ReviewAggregator(spool_max_size=4) as aggregator:
+        aggregator.update(reviews)
+        save_aggregated_summary(aggregator, output_file)
+
+    saved_content = output_file.read_text(encoding="utf-8")
+    assert saved_content.startswith("Contagem de sentimentos:\npositive: 1\nnegative: 1\n")
+    assert "\nContagem por idioma:\nen: 1\npt: 1\n" in saved_content
+    assert "\nAspectos mais citados:\nui: 2\npreço: 1\n" in saved_content
+    assert saved_content.endswith("\nConcatenado:\nUserA: Review1 || UserB: Review2")
@@ -0,0 +1,72 @@
+"""
+Testes para a extração de JSON das respostas do LLM em `src.utils.helpers`.
+"""
+import pytest
+
+from src.utils import helpers
+from src.utils.helpers import extract_json_object, safe_json_list_load, safe_json_load
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        # Bloco Markdown com texto em volta
+        ('Claro!\n```json\n{"sentiment": "positive"}\n```', {"sentiment": "positive"}),
+        # Dois objetos: vale o primeiro
+        ('{"sentiment": "positive"}\n{"sentiment": "negative"}', {"sentiment": "positive"}),
+        # Chaves dentro de strings não confundem o scanner
+        ('{"a": "}{", "b": "\\"}"} fim }', {"a": "}{", "b": '"}'}),
+        # Vírgulas finais em objetos e listas
+        ('{"aspects": ["ui", "preço",], "sentiment": "neutral",}',
+         {"aspects": ["ui", "preço"], "sentiment": "neutral"}),
+    ],
+    ids=["markdown", "two_objects", "braces_in_strings", "trailing_commas"],
+)
+def test_extract_json_object_handles_common_damage(response: str, expected: dict):
+    """O primeiro objeto deve ser extraído mesmo com texto, repetição ou vírgulas extras."""
+    assert extract_json_object(response) == expected
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ('{"translation_pt": "Ótimo app, rec', {"translation_pt": "Ótimo app, rec"}),
+        ('{"sentiment": "positive", "aspects": ["ui", "pre',
+         {"sentiment": "positive", "aspects": ["ui", "pre"]}),
+        ('{"sentiment": "positive", "intensity": "Alta",\n  ',
+         {"sentiment": "positive", "intensity": "Alta"}),
+        ('{"sentiment": "positive", "explan', {"sentiment": "positive"}),
+        ('{"sentiment": "positive", "score": tr', {"sentiment": "positive"}),
+    ],
+    ids=["open_string", "open_list", "dangling_comma", "open_key", "partial_literal"],
+)
+def test_extract_json_object_repairs_truncated_output(response: str, expected: dict):
+    """Respostas cortadas pelo max_tokens devem ser completadas."""
+    assert extract_json_object(response) == expected
+
+def test_extract_json_object_without_orjson(monkeypatch):
+    """Sem o orjson, o decodificador padrão deve ser usado."""
+    monkeypatch.setattr(helpers, "orjson", None)
+
+    assert extract_json_object('ok {"a": [1, 2,],}') == {"a": [1, 2]}
+
+@pytest.mark.parametrize("response", ["", "sem json", '{"a": 1]', "[1, 2]"])
+def test_safe_json_load_returns_empty_dict_when_unrecoverable(response: str):
+    """Respostas sem objeto recuperável devem resultar em um dicionário vazio."""
+    assert safe_json_load(response) == {}
+
+@pytest.mark.parametrize(
+    "response, expected_ids",
+    [
+        # Cortada no meio do segundo elemento: só o primeiro é mantido
+        ('[{"id": "1", "aspects": ["ui"]}, {"id": "2", "sentiment": "neg', ["1"]),
+        # Cortada logo após um elemento completo
+        ('Resultado: [{"id": "1"}, {"id": "2"}, ', ["1", "2"]),
+        # Vírgula final antes do ']'
+        ('[{"id": "1"}, {"id": "2"},]', ["1", "2"]),
+        # Nenhum elemento completo
+        ('[{"id": "1", "explanation": "a, b, c', []),
+    ],
+    ids=["cut_in_item", "cut_after_item", "trailing_comma", "nothing_complete"],
+)
+def test_safe_json_list_load_keeps_complete_items(response: str, expected_ids: list):
+    """Listas cortadas ou com vírgulas finais mantêm apenas os elementos completos."""
+    assert [item["id"] for item in safe_json_list_load(response)] == expected_ids
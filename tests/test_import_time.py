@@ -0,0 +1,58 @@
+"""
+Testes de orçamento do tempo de importação do pipeline.
+
+O pipeline é executado muitas vezes (cron e jobs fragmentados), então o custo
+de inicialização importa. Os testes rodam `python -X importtime` em um
+processo novo e falham se uma dependência pesada voltar a ser importada no
+topo de um módulo ou se o tempo total passar do orçamento.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependências que só devem ser carregadas na etapa que as usa.
+DEFERRED_MODULES = ["openai", "requests", "langdetect", "pytz", "numpy", "pandas"]
+
+# Tempo cumulativo máximo de `import scripts.run_pipeline`, em milissegundos.
+# Medido em ~330 ms; a folga cobre máquinas de CI mais lentas.
+IMPORT_BUDGET_MS = 800
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Importa `module` em um processo novo e retorna o tempo cumulativo (µs) por módulo."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_pipeline_import_defers_heavy_dependencies():
+    """Importar o pipeline não deve carregar as dependências pesadas (ver DEFERRED_MODULES)."""
+    imported = _import_times("scripts.run_pipeline")
+
+    assert "scripts.run_pipeline" in imported
+    loaded = [m for m in DEFERRED_MODULES if m in imported]
+    assert not loaded, f"Dependências importadas na inicialização: {loaded}"
+
+
+def test_pipeline_import_within_budget():
+    """O tempo de importação do pipeline (melhor de 3) deve caber no orçamento."""
+    best_us = min(_import_times("scripts.run_pipeline")["scripts.run_pipeline"] for _ in range(3))
+
+    assert best_us / 1000 <= IMPORT_BUDGET_MS, (
+        f"Importação levou {best_us / 1000:.0f} ms (orçamento: {IMPORT_BUDGET_MS} ms)"
+    )
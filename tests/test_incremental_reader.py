@@ -0,0 +1,70 @@
+"""
+Testes para a leitura incremental em `src.tools.incremental_reader`.
+"""
+from pathlib import Path
+
+from src.tools.incremental_reader import IncrementalReviewReader
+
+
+def _read(path: Path, state_path: Path, commit: bool = True):
+    """Lê as resenhas novas e retorna os ids; confirma a leitura se `commit`."""
+    reader = IncrementalReviewReader(path, state_path=state_path)
+    ids = [review.id for review in reader.iter_new()]
+    if commit:
+        reader.commit()
+    return ids
+
+
+def test_reads_only_appended_reviews(tmp_path: Path):
+    """Após o commit, apenas as resenhas acrescentadas são lidas."""
+    path, state = tmp_path / "resenhas.txt", tmp_path / "state.json"
+    path.write_text("1$Ana$Primeira resenha\n2$Bia$Segunda resenha\n", encoding="utf-8")
+    assert _read(path, state) == ["1", "2"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("3$Caio$Terceira resenha\n4$Duda$Quarta\n")
+
+    assert _read(path, state) == ["3", "4"]
+    assert _read(path, state) == []
+
+
+def test_without_commit_the_same_reviews_are_read_again(tmp_path: Path):
+    """Sem `commit()` (execução que falhou), a posição não avança."""
+    path, state = tmp_path / "resenhas.txt", tmp_path / "state.json"
+    path.write_text("1$Ana$Primeira resenha\n", encoding="utf-8")
+
+    assert _read(path, state, commit=False) == ["1"]
+    assert _read(path, state) == ["1"]
+
+
+def test_partial_and_extended_trailing_records(tmp_path: Path):
+    """
+    Uma última resenha sem quebra de linha fica retida, e uma resenha já lida
+    que ganha linhas de continuação é relida com o texto completo.
+    """
+    path, state = tmp_path / "resenhas.txt", tmp_path / "state.json"
+    path.write_text("1$Ana$Primeira resenha\n2$Bia$Segunda res", encoding="utf-8")
+    assert _read(path, state) == ["1"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("enha\n")
+    assert _read(path, state) == ["2"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("continua na linha seguinte\n3$Caio$Terceira\n")
+    reader = IncrementalReviewReader(path, state_path=state)
+    reviews = list(reader.iter_new())
+
+    assert [r.id for r in reviews] == ["2", "3"]
+    assert reviews[0].text == "Segunda resenha continua na linha seguinte"
+
+
+def test_rewritten_file_is_read_from_the_start(tmp_path: Path):
+    """Se o conteúdo já lido muda (ou o arquivo encolhe), tudo é lido de novo."""
+    path, state = tmp_path / "resenhas.txt", tmp_path / "state.json"
+    path.write_text("1$Ana$Primeira resenha\n2$Bia$Segunda resenha\n", encoding="utf-8")
+    _read(path, state)
+
+    path.write_text("1$Ana$Primeira resenha\n2$Bia$Outra resenha!!\n", encoding="utf-8")
+
+    assert _read(path, state) == ["1", "2"]
@@ -0,0 +1,90 @@
+"""
+Testes para o journal de respostas do LLM em `src.journal`.
+"""
+from pathlib import Path
+
+from src.journal import ResponseJournal
+from src.llm_client import CONNECTION_ERROR_RESPONSE
+from src.models import ReviewRaw
+
+REVIEW_A = ReviewRaw(id="1", user="UserA", text="Great app!", language="en")
+REVIEW_B = ReviewRaw(id="2", user="UserB", text="Muito lento.", language="pt")
+
+
+def test_journal_roundtrip(tmp_path: Path):
+    """Respostas registradas devem ser recuperadas pela chave da resenha."""
+    journal = ResponseJournal(tmp_path / "journal.jsonl")
+    journal.open(resume=False)
+    journal.append(REVIEW_A, '{"sentiment": "positive"}')
+    journal.append(REVIEW_B, '{"sentiment": "negative"}')
+    journal.close()
+
+    loaded = ResponseJournal(tmp_path / "journal.jsonl").load()
+
+    assert loaded[ResponseJournal.key(REVIEW_A)] == '{"sentiment": "positive"}'
+    assert loaded[ResponseJournal.key(REVIEW_B)] == '{"sentiment": "negative"}'
+
+
+def test_journal_key_changes_with_content():
+    """Uma resenha com o mesmo id mas texto diferente não reaproveita a resposta."""
+    edited = REVIEW_A.model_copy(update={"text": "Terrible app!"})
+    assert ResponseJournal.key(REVIEW_A) != ResponseJournal.key(edited)
+
+
+def test_journal_skips_fallback_responses(tmp_path: Path):
+    """Falhas de conexão não são registradas, para serem tentadas novamente."""
+    journal = ResponseJournal(tmp_path / "journal.jsonl")
+    journal.open(resume=False)
+    journal.append(REVIEW_A, CONNECTION_ERROR_RESPONSE)
+    journal.close()
+
+    assert not journal.load()
+
+
+def test_journal_ignores_truncated_last_line(tmp_path: Path):
+    """Uma linha incompleta (queda durante a escrita) é ignorada."""
+    path = tmp_path / "journal.jsonl"
+    journal = ResponseJournal(path)
+    journal.open(resume=False)
+    journal.append(REVIEW_A, "{}")
+    journal.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"id": "2", "hash": "ab')
+
+    assert list(journal.load()) == [ResponseJournal.key(REVIEW_A)]
+
+
+def test_journal_resume_appends_and_new_run_truncates(tmp_path: Path):
+    """Com resume o conteúdo é mantido; sem resume, o journal recomeça."""
+    path = tmp_path / "journal.jsonl"
+    journal = ResponseJournal(path)
+    journal.open(resume=False)
+    journal.append(REVIEW_A, "{}")
+    journal.close()
+
+    journal.open(resume=True)
+    journal.append(REVIEW_B, "{}")
+    journal.close()
+    assert len(journal.load()) == 2
+
+    journal.open(resume=False)
+    journal.close()
+    assert not journal.load()
+
+
+def test_journal_resume_after_truncated_last_line(tmp_path: Path):
+    """Ao retomar, a linha incompleta é descartada e o novo registro não se perde."""
+    path = tmp_path / "journal.jsonl"
+    journal = ResponseJournal(path)
+    journal.open(resume=False)
+    journal.append(REVIEW_A, "{}")
+    journal.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"id": "2", "hash": "ab')
+
+    journal.open(resume=True)
+    journal.append(REVIEW_B, "{}")
+    journal.close()
+
+    assert set(journal.load()) == {ResponseJournal.key(REVIEW_A), ResponseJournal.key(REVIEW_B)}
+    assert path.read_text(encoding="utf-8").count("\n") == 2
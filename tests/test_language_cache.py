@@ -0,0 +1,67 @@
+"""
+Testes para o cache da detecção de idioma em `src.tools.language_cache`.
+"""
+from pathlib import Path
+from unittest.mock import patch
+
+from src.tools.language_cache import LanguageCache
+from src.tools.text_utils import detect_language
+
+TEXTS = [
+    "This is a wonderful library.",
+    "Eu amo pizza e programação.",
+    "This   is a wonderful library.",
+    "Hi",
+]
+
+
+def test_detect_matches_detect_language_and_counts_hits():
+    """O resultado é o mesmo do langdetect; textos com o mesmo espaçamento normalizado são hits."""
+    cache = LanguageCache(fast_path=False)
+
+    detected = [cache.detect(text) for text in TEXTS]
+
+    assert detected == [detect_language(text) for text in TEXTS]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert stats["hit_rate"] == 0.25
+
+
+def test_detect_many_sends_only_missing_texts_to_langdetect():
+    """Em lote, apenas textos inéditos (e sem repetição) chegam ao langdetect."""
+    cache = LanguageCache(fast_path=False)
+    cache.detect(TEXTS[0])
+
+    with patch(
+        "src.tools.language_cache.detect_languages",
+        side_effect=lambda texts, workers, fast_path: [detect_language(t) for t in texts],
+    ) as batch:
+        detected = cache.detect_many(TEXTS + TEXTS)
+
+    assert detected == [detect_language(text) for text in TEXTS + TEXTS]
+    assert batch.call_args.args[0] == [TEXTS[1], TEXTS[3]]
+
+
+def test_memory_lru_is_bounded():
+    """O LRU em memória descarta os itens usados há mais tempo."""
+    cache = LanguageCache(max_memory_entries=2)
+    for text in TEXTS:
+        cache.detect(text)
+
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_disk_store_persists_and_respects_cap(tmp_path: Path):
+    """O arquivo SQLite é reaproveitado entre instâncias e respeita o limite."""
+    path = tmp_path / "languages.sqlite3"
+    cache = LanguageCache(path, max_disk_entries=10, fast_path=False)
+    cache.detect_many([f"Texto número {i} para o cache" for i in range(20)])
+    cache.close()
+    assert cache.evictions > 0
+
+    reopened = LanguageCache(path, max_disk_entries=10, fast_path=False)
+    with patch("src.tools.language_cache.detect_language") as detect:
+        assert reopened.detect("Texto número 19 para o cache") == "pt"
+    detect.assert_not_called()
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
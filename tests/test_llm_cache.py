@@ -0,0 +1,112 @@
+"""
+Testes para o cache persistente de respostas do LLM em `src.llm_cache`.
+"""
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from openai import APIConnectionError
+
+from src.llm_cache import LLMResponseCache
+from src.llm_client import CONNECTION_ERROR_RESPONSE, LLMClient
+
+
+def test_cache_roundtrip_and_counters(tmp_path: Path):
+    """Uma resposta gravada deve ser lida de volta e contabilizada como hit."""
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    key = cache.make_key("model", "prompt", 0.0, 512)
+
+    assert cache.get(key) is None
+    cache.set(key, '{"sentiment": "positive"}')
+    assert cache.get(key) == '{"sentiment": "positive"}'
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    cache.close()
+
+
+def test_cache_persists_between_instances(tmp_path: Path):
+    """O cache deve sobreviver ao fechamento e reabertura do arquivo."""
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path)
+    key = cache.make_key("model", "prompt", 0.0, 512)
+    cache.set(key, "resposta")
+    cache.close()
+
+    reopened = LLMResponseCache(path)
+    assert reopened.get(key) == "resposta"
+    assert reopened.size_bytes == len("resposta")
+    reopened.close()
+
+
+def test_cache_key_depends_on_generation_parameters():
+    """Qualquer mudança de modelo, prompt, temperatura ou max_tokens muda a chave."""
+    base = LLMResponseCache.make_key("m", "p", 0.0, 512)
+
+    assert base == LLMResponseCache.make_key("m", "p", 0, 512)
+    assert base != LLMResponseCache.make_key("outro", "p", 0.0, 512)
+    assert base != LLMResponseCache.make_key("m", "outro", 0.0, 512)
+    assert base != LLMResponseCache.make_key("m", "p", 0.7, 512)
+    assert base != LLMResponseCache.make_key("m", "p", 0.0, 256)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    """Ao exceder o limite de tamanho, as entradas mais antigas são removidas."""
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    cache.get("a")  # "a" passa a ser a mais recente
+    cache.set("c", "x" * 20)
+
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size_bytes <= 30
+    assert cache.stats()["evictions"] >= 1
+    cache.close()
+
+
+def test_cache_bypass_skips_reads_but_stores(tmp_path: Path):
+    """Com bypass, leituras sempre falham mas as respostas continuam sendo gravadas."""
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path, bypass=True)
+    cache.set("k", "v")
+
+    assert cache.get("k") is None
+    cache.close()
+
+    assert LLMResponseCache(path).get("k") == "v"
+
+
+def test_llm_client_uses_cache(tmp_path: Path):
+    """O cliente deve evitar a chamada ao LLM quando a resposta está no cache."""
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    client = LLMClient(base_url="http://mock/v1", cache=cache)
+    client.client = MagicMock()
+    client.client.max_retries = 0
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message.content = '{"sentiment": "neutral"}'
+    client.client.chat.completions.create.return_value = resp
+
+    first = client.batch_process(["prompt"])
+    second = client.batch_process(["prompt"])
+
+    assert first == second == ['{"sentiment": "neutral"}']
+    assert client.client.chat.completions.create.call_count == 1
+    cache.close()
+
+
+def test_llm_client_does_not_cache_fallbacks(tmp_path: Path):
+    """Respostas de fallback geradas por erros não devem ser armazenadas."""
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    client = LLMClient(base_url="http://mock/v1", cache=cache)
+    client.client = MagicMock()
+    client.client.max_retries = 0
+    client.client.chat.completions.create.side_effect = APIConnectionError(
+        request=MagicMock()
+    )
+
+    assert client.batch_process(["prompt"]) == [CONNECTION_ERROR_RESPONSE]
+    assert len(cache) == 0
+    cache.close()
@@ -0,0 +1,158 @@
+"""
+Testes unitários para o LLMClient em src.llm_client.
+
+O cliente OpenAI é substituído por mocks, portanto nenhum servidor LLM é
+necessário para executar estes testes.
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from openai import APIConnectionError, APIError, AuthenticationError
+
+from src.llm_client import (
+    API_ERROR_RESPONSE,
+    CONNECTION_ERROR_RESPONSE,
+    LLMClient,
+)
+
+
+def _completion(content: str) -> MagicMock:
+    """Cria uma resposta falsa no formato de `chat.completions.create`."""
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message.content = content
+    return resp
+
+
+def _make_client(create_side_effect, max_concurrency: int = 1) -> LLMClient:
+    """Cria um LLMClient cujo método `create` usa o side effect informado."""
+    client = LLMClient(base_url="http://mock/v1", max_concurrency=max_concurrency)
+    client.client = MagicMock()
+    client.client.max_retries = 0
+    client.client.chat.completions.create.side_effect = create_side_effect
+    return client
+
+
+def _echo(**kwargs):
+    """Devolve o próprio prompt como resposta."""
+    return _completion(kwargs["messages"][0]["content"])
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_batch_process_preserves_order(max_concurrency: int):
+    """As respostas devem seguir a ordem dos prompts, com ou sem concorrência."""
+    def slow_echo(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        # Prompts iniciais demoram mais para forçar conclusão fora de ordem.
+        time.sleep(0.01 * (10 - int(prompt)))
+        return _completion(prompt)
+
+    client = _make_client(slow_echo, max_concurrency=max_concurrency)
+    prompts = [str(i) for i in range(10)]
+
+    assert client.batch_process(prompts) == prompts
+
+
+def test_batch_process_runs_requests_concurrently():
+    """Com max_concurrency=N, até N requisições devem ficar em andamento juntas."""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def tracking_echo(**kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return _echo(**kwargs)
+
+    client = _make_client(tracking_echo, max_concurrency=3)
+    client.batch_process([str(i) for i in range(9)])
+
+    assert peak == 3
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_batch_process_returns_fallback_on_api_errors(max_concurrency: int):
+    """Erros de conexão e de API devem virar JSON de fallback sem abortar o lote."""
+    def flaky(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        if prompt == "conn":
+            raise APIConnectionError(request=MagicMock())
+        if prompt == "api":
+            raise APIError("bad request", request=MagicMock(), body=None)
+        return _completion(prompt)
+
+    client = _make_client(flaky, max_concurrency=max_concurrency)
+    outputs = client.batch_process(["ok", "conn", "api", "ok2"])
+
+    assert outputs == ["ok", CONNECTION_ERROR_RESPONSE, API_ERROR_RESPONSE, "ok2"]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_batch_process_aborts_on_authentication_error(max_concurrency: int):
+    """Um erro de autenticação é fatal e deve ser propagado."""
+    def unauthorized(**_kwargs):
+        raise AuthenticationError("invalid key", response=MagicMock(), body=None)
+
+    client = _make_client(unauthorized, max_concurrency=max_concurrency)
+
+    with pytest.raises(AuthenticationError):
+        client.batch_process(["a", "b", "c", "d"])
+
+
+def test_batch_process_replaces_none_content():
+    """Um conteúdo `None` retornado pela API deve virar string vazia."""
+    client = _make_client(lambda **_kwargs: _completion(None))
+
+    assert client.batch_process(["a"]) == [""]
+
+
+def test_iter_process_yields_pairs_as_they_complete():
+    """Com concorrência, os pares saem na ordem de conclusão, com o índice correto."""
+    def slow_first(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        if prompt == "0":
+            time.sleep(0.1)
+        return _completion(prompt)
+
+    client = _make_client(slow_first, max_concurrency=2)
+    pairs = list(client.iter_process(["0", "1", "2"]))
+
+    assert sorted(pairs) == [(0, "0"), (1, "1"), (2, "2")]
+    assert pairs[-1] == (0, "0")
+
+
+def test_iter_process_stops_submitting_when_consumer_stops():
+    """Interromper a iteração deve impedir o envio dos prompts restantes."""
+    client = _make_client(_echo, max_concurrency=2)
+    iterator = client.iter_process([str(i) for i in range(20)])
+
+    next(iterator)
+    iterator.close()
+
+    assert client.client.chat.completions.create.call_count < 20
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_iter_process_consumes_prompts_lazily(max_concurrency: int):
+    """Um gerador de prompts é lido apenas conforme há vagas para requisições."""
+    consumed = []
+
+    def prompts():
+        for i in range(100):
+            consumed.append(i)
+            yield str(i)
+
+    client = _make_client(_echo, max_concurrency=max_concurrency)
+    iterator = client.iter_process(prompts())
+    first = next(iterator)
+    iterator.close()
+
+    assert first[1] == str(first[0])
+    assert len(consumed) <= max_concurrency + 1
@@ -0,0 +1,152 @@
+"""
+Testes para o roteamento entre servidores de inferência em `src.llm_pool`.
+"""
+import time
+from unittest.mock import MagicMock
+
+from openai import APIConnectionError
+
+from src.config import EndpointConfig
+from src.llm_client import CONNECTION_ERROR_RESPONSE, LLMClient
+from src.llm_pool import EndpointPool
+
+
+def _pool(*configs: EndpointConfig, **kwargs) -> EndpointPool:
+    """Cria um pool com os servidores informados."""
+    return EndpointPool(list(configs), api_key="test", **kwargs)
+
+
+def test_acquire_prefers_least_loaded_by_weight():
+    """O servidor com menor carga relativa ao peso deve ser escolhido."""
+    pool = _pool(
+        EndpointConfig(base_url="http://a/v1", weight=1, max_concurrency=4),
+        EndpointConfig(base_url="http://b/v1", weight=3, max_concurrency=4),
+    )
+
+    chosen = [pool.acquire().base_url for _ in range(4)]
+
+    assert chosen.count("http://b/v1") == 3
+    assert chosen.count("http://a/v1") == 1
+    assert pool.max_concurrency == 8
+
+
+def test_acquire_respects_concurrency_limits():
+    """Um servidor cheio não recebe novas requisições."""
+    pool = _pool(
+        EndpointConfig(base_url="http://a/v1", weight=10, max_concurrency=1),
+        EndpointConfig(base_url="http://b/v1", weight=1, max_concurrency=2),
+    )
+
+    chosen = [pool.acquire().base_url for _ in range(3)]
+
+    assert chosen == ["http://a/v1", "http://b/v1", "http://b/v1"]
+
+
+def test_endpoint_leaves_rotation_and_is_probed_again():
+    """Falhas consecutivas tiram o servidor de rotação até o fim da espera."""
+    pool = _pool(
+        EndpointConfig(base_url="http://a/v1"),
+        failure_threshold=2,
+        cooldown=0.05,
+    )
+
+    for _ in range(2):
+        pool.release(pool.acquire(), connection_failed=True)
+    assert pool.acquire(timeout=0) is None
+
+    time.sleep(0.06)
+    probe = pool.acquire(timeout=0)
+    assert probe is not None
+    # Enquanto o teste está em andamento, nenhuma outra requisição é enviada.
+    assert pool.acquire(timeout=0) is None
+
+    pool.release(probe)
+    assert pool.stats()[0]["healthy"] is True
+
+
+def test_acquire_waits_for_cooldown_instead_of_giving_up():
+    """Com todos os servidores fora de rotação, `acquire` espera e testa de novo."""
+    pool = _pool(
+        EndpointConfig(base_url="http://a/v1"),
+        failure_threshold=1,
+        cooldown=0.1,
+    )
+    pool.release(pool.acquire(), connection_failed=True)
+
+    started_at = time.monotonic()
+    probe = pool.acquire(timeout=5)
+
+    assert probe is not None
+    assert time.monotonic() - started_at >= 0.09
+    # Um servidor excluído (que já falhou para a requisição) não é esperado.
+    pool.release(probe, connection_failed=True)
+    assert pool.acquire(exclude=(probe,), timeout=5) is None
+
+
+def test_client_waits_for_endpoints_to_recover():
+    """Uma queda breve de todos os servidores não deve gerar respostas de fallback."""
+    client = LLMClient(
+        endpoints=[
+            EndpointConfig(base_url="http://a/v1"),
+            EndpointConfig(base_url="http://b/v1"),
+        ],
+    )
+    pool = client.pool
+    pool.failure_threshold, pool.cooldown = 1, 0.1
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message.content = "ok"
+    for endpoint in pool.endpoints:
+        endpoint.client = MagicMock()
+        endpoint.client.chat.completions.create.return_value = resp
+        pool.release(pool.acquire(), connection_failed=True)
+    assert not any(s["healthy"] for s in pool.stats())
+
+    started_at = time.monotonic()
+    outputs = client.batch_process(["a"] * 20)
+
+    assert outputs == ["ok"] * 20
+    assert time.monotonic() - started_at >= 0.09
+    assert any(s["healthy"] for s in pool.stats())
+
+
+def test_client_fails_over_to_healthy_endpoint():
+    """Um erro de conexão em um servidor faz a requisição ir para outro."""
+    client = LLMClient(
+        endpoints=[
+            EndpointConfig(base_url="http://down/v1", weight=10),
+            EndpointConfig(base_url="http://up/v1"),
+        ],
+    )
+    down, up = client.pool.endpoints
+    down.client = MagicMock()
+    down.client.chat.completions.create.side_effect = APIConnectionError(
+        request=MagicMock()
+    )
+    up.client = MagicMock()
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message.content = "ok"
+    up.client.chat.completions.create.return_value = resp
+
+    assert client.batch_process(["a", "b", "c", "d"]) == ["ok"] * 4
+    # Após 3 falhas (limite padrão), o servidor fora do ar deixa de ser usado.
+    assert down.client.chat.completions.create.call_count == 3
+    assert client.pool.stats()[0]["healthy"] is False
+
+
+def test_client_returns_fallback_when_all_endpoints_fail():
+    """Se o servidor continua falhando ao ser testado, o fallback é retornado."""
+    client = LLMClient(endpoints=[EndpointConfig(base_url="http://down/v1")])
+    client.pool.cooldown = 0.01
+    endpoint = client.pool.endpoints[0]
+    endpoint.client = MagicMock()
+    endpoint.client.chat.completions.create.side_effect = APIConnectionError(
+        request=MagicMock()
+    )
+
+    outputs = client.batch_process(["a"] * 5)
+
+    assert outputs == [CONNECTION_ERROR_RESPONSE] * 5
+    # Após sair de rotação, cada prompt restante espera e testa o servidor.
+    assert endpoint.client.chat.completions.create.call_count == 5
@@ -0,0 +1,66 @@
+"""
+Testes do servidor LLM falso e do teste de carga em `scripts`.
+
+Exercitam o LLMClient por HTTP de verdade, sem depender de um LLM rodando.
+"""
+import json
+
+import pytest
+
+from scripts.load_test import TimedLLMClient, run_load_test
+from scripts.mock_llm_server import MockLLMServer
+from src.config import settings
+from src.llm_client import API_ERROR_RESPONSE, LLMClient
+from src.models import ReviewRaw
+from src.processor import map_llm_response_to_processed
+
+
+@pytest.fixture(name="no_retries")
+def fixture_no_retries(monkeypatch):
+    """Desativa os retries do cliente OpenAI para que os erros sejam imediatos."""
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+
+
+def test_client_against_mock_server():
+    """As respostas do servidor falso são análises válidas."""
+    review = ReviewRaw(id="1", user="Ana", text="Muito bom!", language="pt")
+    with MockLLMServer() as server:
+        client = LLMClient(base_url=server.base_url)
+        responses = client.batch_process(["a", "b"])
+
+    assert server.requests == 2
+    processed = map_llm_response_to_processed(review, responses[0])
+    assert processed.sentiment == "positive"
+    assert processed.explanation != "Falha na análise detalhada do LLM."
+
+
+def test_mock_server_respects_concurrency_limit():
+    """O servidor nunca atende mais requisições simultâneas que o seu limite."""
+    with MockLLMServer(latency_ms=30, concurrency=2) as server:
+        client = LLMClient(base_url=server.base_url, max_concurrency=6)
+        client.batch_process([str(i) for i in range(12)])
+
+    assert server.max_in_flight == 2
+
+
+def test_mock_server_error_rate_and_templates(no_retries):  # pylint: disable=unused-argument
+    """Erros simulados viram fallback; respostas usam os modelos informados."""
+    templates = [json.dumps({"sentiment": "negative"})]
+    with MockLLMServer(error_rate=0.5, templates=templates, seed=1) as server:
+        client = LLMClient(base_url=server.base_url)
+        responses = client.batch_process([str(i) for i in range(20)])
+
+    assert responses.count(API_ERROR_RESPONSE) == server.errors > 0
+    assert set(responses) == {API_ERROR_RESPONSE, templates[0]}
+
+
+def test_run_load_test_reports_latency_percentiles():
+    """O relatório do teste de carga traz vazão e percentis coerentes."""
+    with MockLLMServer(latency_ms=10, concurrency=4) as server:
+        client = TimedLLMClient(base_url=server.base_url, max_concurrency=4)
+        report = run_load_test(client, n_requests=20)
+
+    assert report["requests"] == report["server_calls"] == 20
+    assert report["failures"] == 0
+    assert report["throughput_rps"] > 0
+    assert 0.01 <= report["latency_p50_s"] <= report["latency_p95_s"] <= report["latency_max_s"]
@@ -0,0 +1,135 @@
+"""
+Testes para o empacotamento de resenhas em `src.packing`.
+
+O LLMClient é substituído por um mock que responde de acordo com os ids
+presentes em cada prompt empacotado.
+"""
+import json
+import re
+from typing import List
+from unittest.mock import MagicMock
+
+from src.llm_client import CONNECTION_ERROR_RESPONSE
+from src.models import ReviewRaw
+from src.packing import make_packs, process_packed, split_packed_response
+from src.processor import map_llm_response_to_processed
+
+REVIEWS = [
+    ReviewRaw(id=str(i), user=f"User{i}", text=f"Review number {i}", language="en")
+    for i in range(1, 8)
+]
+
+ANALYSIS = {
+    "translation_pt": "Tradução",
+    "sentiment": "positive",
+    "intensity": "Alta",
+    "aspects": ["geral"],
+    "explanation": "Ok.",
+}
+
+
+def _packed_ids(prompt: str) -> List[str]:
+    """Extrai os ids das resenhas presentes em um prompt empacotado."""
+    return re.findall(r'^- id "([^"]+)"', prompt, flags=re.MULTILINE)
+
+
+def _mock_client(drop_ids=()) -> MagicMock:
+    """Cria um cliente que responde a todos os ids, exceto os de `drop_ids`."""
+    def respond(prompts, max_tokens):
+        assert max_tokens is not None and len(max_tokens) == len(prompts)
+        responses = []
+        for prompt in prompts:
+            ids = _packed_ids(prompt)
+            if not ids:  # prompt individual
+                responses.append(json.dumps(ANALYSIS))
+                continue
+            items = [{"id": i, **ANALYSIS} for i in ids if i not in drop_ids]
+            responses.append("```json\n" + json.dumps(items) + "\n```")
+        return responses
+
+    client = MagicMock()
+    client.iter_process.side_effect = lambda prompts, max_tokens=None: enumerate(
+        respond(prompts, max_tokens)
+    )
+    return client
+
+
+def test_make_packs_never_repeats_ids():
+    """Pacotes respeitam o tamanho máximo e não repetem ids."""
+    reviews = [
+        ReviewRaw(id=i, user="u", text="t", language="en")
+        for i in ["1", "2", "2", "3", "4"]
+    ]
+    assert make_packs(reviews, 3) == [[0, 1], [2, 3, 4]]
+
+
+def test_split_packed_response_ignores_unknown_items():
+    """Itens sem id ou com ids inesperados são descartados."""
+    text = json.dumps([{"id": "1", "sentiment": "positive"}, {"id": "9"}, "lixo"])
+    result = split_packed_response(text, ["1", "2"])
+
+    assert list(result) == ["1"]
+    assert json.loads(result["1"]) == {"sentiment": "positive"}
+
+
+def test_split_packed_response_accepts_object_keyed_by_id():
+    """Um objeto no formato {"<id>": {...}} também é aceito."""
+    text = '{"1": {"sentiment": "negative"}, "2": {"sentiment": "neutral"}}'
+    result = split_packed_response(text, ["1", "2"])
+
+    assert json.loads(result["2"]) == {"sentiment": "neutral"}
+
+
+def test_split_packed_response_ignores_lists_that_are_not_results():
+    """Listas de strings (ex: "aspects") não são confundidas com a lista de resultados."""
+    single = '{"id": "1", "sentiment": "positive", "aspects": ["ui", "preço"]}'
+    wrapped = json.dumps({"resenhas": [{"id": "2", "sentiment": "neutral"}], "notas": ["x"]})
+    keyed = '{"notas": ["x"], "1": {"sentiment": "negative", "aspects": ["ui"]}}'
+
+    assert json.loads(split_packed_response(single, ["1"])["1"]) == {
+        "sentiment": "positive", "aspects": ["ui", "preço"],
+    }
+    assert list(split_packed_response(wrapped, ["1", "2"])) == ["2"]
+    assert json.loads(split_packed_response(keyed, ["1"])["1"])["sentiment"] == "negative"
+
+
+def test_process_packed_one_response_per_review():
+    """Todas as resenhas recebem uma resposta válida com poucos pedidos."""
+    client = _mock_client()
+    responses = process_packed(REVIEWS, client, pack_size=4)
+
+    assert len(responses) == len(REVIEWS)
+    assert client.iter_process.call_count == 1
+    for review, response in zip(REVIEWS, responses):
+        processed = map_llm_response_to_processed(review, response)
+        assert processed.user == review.user
+        assert processed.sentiment == "positive"
+
+
+def test_process_packed_retries_only_missing_reviews():
+    """Ids ausentes são reenviados em pacotes menores até o prompt individual."""
+    client = _mock_client(drop_ids={"2", "3"})
+    responses = process_packed(REVIEWS, client, pack_size=4)
+
+    assert all(json.loads(r)["sentiment"] == "positive" for r in responses)
+    retried_prompts = [
+        prompt
+        for call in client.iter_process.call_args_list[1:]
+        for prompt in call.args[0]
+    ]
+    # Apenas as resenhas 2 e 3 são reenviadas, cada uma em seu próprio prompt.
+    assert len(retried_prompts) == 2
+    assert all("Review number 2" in p or "Review number 3" in p for p in retried_prompts)
+
+
+def test_process_packed_does_not_split_on_connection_error():
+    """Falhas de conexão são repassadas às resenhas do pacote sem nova divisão."""
+    client = MagicMock()
+    client.iter_process.side_effect = lambda prompts, max_tokens=None: enumerate(
+        [CONNECTION_ERROR_RESPONSE for _ in prompts]
+    )
+
+    responses = process_packed(REVIEWS, client, pack_size=4)
+
+    assert responses == [CONNECTION_ERROR_RESPONSE] * len(REVIEWS)
+    assert client.iter_process.call_count == 1
@@ -0,0 +1,103 @@
+"""
+Testes para o cache de resenhas parseadas em `src.tools.parsed_cache`.
+"""
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models import ReviewRaw
+from src.review_table import ReviewTable
+from src.tools import parsed_cache
+from src.tools.parsed_cache import ParsedReviewCache
+from src.tools.parser import iter_reviews, read_reviews_from_file
+
+CONTENT = (
+    "1$Ana$Ótimo aplicativo, recomendo!\n"
+    "2$Bob$Crashes every time I open it.\n"
+    "continua na linha seguinte\n"
+    "3$Carla$Très bien 日本語\n"
+    "4$Davi$\n"
+)
+
+@pytest.fixture
+def reviews_file(tmp_path: Path) -> Path:
+    """Arquivo de resenhas de exemplo."""
+    path = tmp_path / "resenhas.txt"
+    path.write_text(CONTENT, encoding="utf-8")
+    return path
+
+def test_second_run_loads_from_cache_without_parsing(reviews_file: Path):
+    """A segunda leitura da mesma origem não deve chamar o parser."""
+    cache = ParsedReviewCache()
+    expected = read_reviews_from_file(reviews_file)
+
+    first = list(cache.iter_reviews(reviews_file, iter_reviews))
+    parse = MagicMock()
+    second = list(cache.iter_reviews(reviews_file, parse))
+
+    assert first == expected
+    assert second == expected
+    parse.assert_not_called()
+
+def test_changed_source_or_parser_version_invalidates_cache(reviews_file: Path, monkeypatch):
+    """Mudar o conteúdo da origem ou a versão do parser gera uma nova chave."""
+    cache = ParsedReviewCache()
+    key = cache.source_key([reviews_file])
+
+    monkeypatch.setattr(parsed_cache, "PARSER_VERSION", 999)
+    assert cache.source_key([reviews_file]) != key
+    monkeypatch.undo()
+
+    reviews_file.write_text(CONTENT + "5$Eva$Nova resenha\n", encoding="utf-8")
+    assert cache.source_key([reviews_file]) != key
+
+def test_interrupted_read_does_not_store_cache(reviews_file: Path):
+    """Uma leitura não consumida até o fim não deve gravar o cache."""
+    cache = ParsedReviewCache()
+    reviews = cache.iter_reviews(reviews_file, iter_reviews)
+    next(reviews)
+    reviews.close()
+
+    assert not list(cache.directory.glob("*.npz"))
+
+def test_corrupted_cache_is_ignored(reviews_file: Path):
+    """Um arquivo de cache ilegível deve ser ignorado (e o parsing refeito)."""
+    cache = ParsedReviewCache()
+    key = cache.source_key([reviews_file])
+    cache.directory.mkdir(parents=True)
+    (cache.directory / f"{key}.npz").write_bytes(b"corrompido")
+
+    assert cache.load(key) is None
+    assert list(cache.iter_reviews(reviews_file, iter_reviews)) == read_reviews_from_file(reviews_file)
+
+def test_store_keeps_only_most_recent_files(tmp_path: Path):
+    """Apenas os `max_files` caches mais recentes devem ser mantidos."""
+    cache = ParsedReviewCache(max_files=2)
+    review = read_reviews_from_file(_write(tmp_path / "r.txt", CONTENT))[:1]
+    table = ReviewTable.from_rows(review, ReviewRaw)
+    for age, key in enumerate(("a", "b", "c")):
+        cache.store(key, table)
+        os.utime(cache.directory / f"{key}.npz", (1_000_000 + age, 1_000_000 + age))
+
+    assert {p.stem for p in cache.directory.glob("*.npz")} == {"b", "c"}
+    assert list(cache.load("c")) == review
+
+def test_cache_hit_protects_file_from_pruning(tmp_path: Path):
+    """Um cache carregado conta como recente: a remoção segue o uso, não a gravação."""
+    cache = ParsedReviewCache(max_files=2)
+    review = read_reviews_from_file(_write(tmp_path / "r.txt", CONTENT))[:1]
+    table = ReviewTable.from_rows(review, ReviewRaw)
+    for age, key in enumerate(("a", "b")):
+        cache.store(key, table)
+        os.utime(cache.directory / f"{key}.npz", (1_000_000 + age, 1_000_000 + age))
+
+    assert list(cache.load("a")) == review
+    cache.store("c", table)
+
+    assert {p.stem for p in cache.directory.glob("*.npz")} == {"a", "c"}
+
+def _write(path: Path, content: str) -> Path:
+    path.write_text(content, encoding="utf-8")
+    return path
@@ -5,9 +5,16 @@ Estes testes não fazem chamadas de rede e validam a lógica de
 parsing e validação da função `map_llm_response_to_processed`.
 """
 
+from collections import Counter
+
 import pytest
 from src.models import ReviewRaw, ReviewProcessed
-from src.processor import analyze_reviews, map_llm_response_to_processed
+from src.processor import (
+    ReviewAggregator,
+    analyze_reviews,
+    map_llm_response_to_processed,
+    map_llm_responses_to_processed,
+)
 
 # Casos de teste com diferentes tipos de respostas do LLM
 # Formato: (
@@ -191,6 +198,27 @@ def test_map_llm_response_to_processed(
         f"[{test_name}] Falha na validação da explicação."
     )
 
+def test_map_llm_responses_to_processed_matches_single_validation():
+    """
+    A validação em lote deve produzir, na mesma ordem, o mesmo resultado da
+    validação individual, inclusive os fallbacks das respostas inválidas.
+    """
+    pairs = [(case[1], case[2]) for case in TEST_CASES]
+
+    expected = [map_llm_response_to_processed(review, response) for review, response in pairs]
+
+    assert map_llm_responses_to_processed(pairs) == expected
+
+def test_map_llm_responses_to_processed_all_valid():
+    """Um lote sem respostas inválidas não deve usar fallback."""
+    valid_cases = [c for c in TEST_CASES if c[7] != "Falha na análise detalhada do LLM."]
+
+    result = map_llm_responses_to_processed((c[1], c[2]) for c in valid_cases)
+
+    assert [r.sentiment for r in result] == [c[3] for c in valid_cases]
+    assert [r.aspects for r in result] == [c[6] for c in valid_cases]
+    assert map_llm_responses_to_processed([]) == []
+
 def test_analyze_reviews_logic():
     """
     Testa a lógica de análise da função analyze_reviews.
@@ -255,3 +283,24 @@ def test_analyze_reviews_logic():
     # 4. Valida a string concatenada
     expected_string = "UserA: Great! | UserB: Bad. | UserC: It's ok. | UserD: Amazing!"
     assert concatenated_string == expected_string, "A string concatenada está incorreta."
+
+def test_review_aggregator_counts_and_spools_concatenation():
+    """
+    O agregador deve contar sentimentos, idiomas, intensidades e aspectos e
+    manter a seção concatenada mesmo depois de passar do limite em memória.
+    """
+    reviews = [
+        map_llm_response_to_processed(case[1], case[2]) for case in TEST_CASES
+    ]
+
+    with ReviewAggregator(separator=" | ", spool_max_size=16) as aggregator:
+        for review in reviews:
+            aggregator.add(review)
+
+        assert aggregator.total == len(reviews)
+        assert aggregator.sentiments == Counter(r.sentiment for r in reviews)
+        assert aggregator.intensities == Counter(r.intensity for r in reviews)
+        assert aggregator.languages == Counter({"en": len(reviews)})
+        assert aggregator.aspects == Counter(a for r in reviews for a in r.aspects)
+        assert aggregator.concatenated() == " | ".join(f"{r.user}: {r.original}" for r in reviews)
+        assert "".join(aggregator.iter_concatenated(block_size=7)) == aggregator.concatenated()
@@ -1,12 +1,21 @@
 """
 Testes para o parser de resenhas em `src.tools.parser`.
 """
+import bz2
+import gzip
+import lzma
 from pathlib import Path
 
 import pytest
 
 from src.models import ReviewRaw
-from src.tools.parser import read_reviews_from_file
+from src.tools.parser import (
+    iter_reviews,
+    iter_reviews_parallel,
+    read_reviews_from_file,
+    resolve_review_sources,
+    split_byte_ranges,
+)
 
 # Conteúdo de exemplo para o arquivo de teste
 # Inclui casos normais, linha em branco, linha com '$' no texto, e linha mal-formatada
@@ -67,3 +76,98 @@ def test_read_reviews_from_non_existent_file():
     # Verifica se a exceção correta é levantada usando o gerenciador de contexto do pytest
     with pytest.raises(FileNotFoundError, match="O arquivo de resenhas não foi encontrado"):
         read_reviews_from_file(non_existent_path)
+
+def test_iter_reviews_yields_one_review_at_a_time(tmp_path: Path):
+    """
+    Testa se `iter_reviews` produz as resenhas sob demanda, com o mesmo
+    resultado de `read_reviews_from_file`.
+    """
+    test_file_path = tmp_path / "resenhas_teste.txt"
+    test_file_path.write_text(DUMMY_CONTENT, encoding="utf-8")
+
+    iterator = iter_reviews(test_file_path)
+    first = next(iterator)
+
+    assert first.id == "123"
+    assert [first, *iterator] == read_reviews_from_file(test_file_path)
+
+def test_iter_reviews_checks_file_before_iterating():
+    """
+    Testa se o arquivo inexistente é detectado já na chamada, e não apenas
+    na primeira iteração.
+    """
+    with pytest.raises(FileNotFoundError):
+        iter_reviews(Path("non_existent_dir/non_existent_file.txt"))
+
+def test_split_byte_ranges_cuts_only_at_review_starts():
+    """
+    Testa se os cortes caem sempre no início de uma resenha, mantendo as
+    linhas de continuação junto com a resenha a que pertencem.
+    """
+    data = DUMMY_CONTENT.encode("utf-8")
+    ranges = split_byte_ranges(data, target_size=10)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    chunks = [data[start:end].decode("utf-8") for start, end in ranges]
+    assert chunks[2] == (
+        "789$UserC$J'aime bien, mais...\n"
+        "cette partie est sur une nouvelle ligne.\n"
+        "\n"
+    )
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_iter_reviews_parallel_matches_serial_parser(tmp_path: Path, newline: str):
+    """
+    Testa se o parser paralelo produz as mesmas resenhas, na mesma ordem,
+    mesmo com intervalos pequenos que caem no meio de resenhas multi-linha.
+    """
+    content = (DUMMY_CONTENT * 5).replace("\n", newline)
+    test_file_path = tmp_path / "resenhas_teste.txt"
+    test_file_path.write_bytes(content.encode("utf-8"))
+
+    parallel = list(iter_reviews_parallel(test_file_path, workers=2, chunk_bytes=64))
+
+    assert parallel == read_reviews_from_file(test_file_path)
+
+@pytest.mark.parametrize(
+    "suffix, compress",
+    [(".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)],
+)
+def test_iter_reviews_reads_compressed_files(tmp_path: Path, suffix: str, compress):
+    """Testa se arquivos compactados produzem as mesmas resenhas do .txt."""
+    plain_path = tmp_path / "resenhas.txt"
+    plain_path.write_text(DUMMY_CONTENT, encoding="utf-8")
+    compressed_path = tmp_path / f"resenhas.txt{suffix}"
+    compressed_path.write_bytes(compress(DUMMY_CONTENT.encode("utf-8")))
+
+    assert list(iter_reviews(compressed_path)) == read_reviews_from_file(plain_path)
+
+def _write_shards(directory: Path) -> Path:
+    """Grava o conteúdo de exemplo em fragmentos nomeados fora da ordem alfabética."""
+    directory.mkdir()
+    shards = DUMMY_CONTENT.split("101$")
+    (directory / "parte-10.txt.gz").write_bytes(gzip.compress(("101$" + shards[1]).encode("utf-8")))
+    (directory / "parte-2.txt").write_text(shards[0], encoding="utf-8")
+    (directory / "leia-me.md").write_text("ignorado", encoding="utf-8")
+    return directory
+
+def test_resolve_review_sources_orders_shards_naturally(tmp_path: Path):
+    """Testa a ordem natural dos fragmentos de diretórios e globs."""
+    shards_dir = _write_shards(tmp_path / "fragmentos")
+    expected = [shards_dir / "parte-2.txt", shards_dir / "parte-10.txt.gz"]
+
+    assert resolve_review_sources(shards_dir) == expected
+    assert resolve_review_sources(str(shards_dir / "parte-*")) == expected
+    with pytest.raises(FileNotFoundError):
+        resolve_review_sources(str(shards_dir / "inexistente-*.txt"))
+
+def test_iter_reviews_streams_shards_in_order(tmp_path: Path):
+    """Testa se um diretório de fragmentos equivale ao arquivo único, em série ou em paralelo."""
+    plain_path = tmp_path / "resenhas.txt"
+    plain_path.write_text(DUMMY_CONTENT, encoding="utf-8")
+    shards_dir = _write_shards(tmp_path / "fragmentos")
+    expected = read_reviews_from_file(plain_path)
+
+    assert list(iter_reviews(shards_dir)) == expected
+    assert list(iter_reviews_parallel(shards_dir, workers=2, chunk_bytes=32)) == expected
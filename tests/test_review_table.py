@@ -0,0 +1,99 @@
+"""
+Testes para o armazenamento colunar em `src.review_table`.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.models import ReviewProcessed, ReviewRaw
+from src.processor import analyze_reviews
+from src.review_table import ReviewTable
+from src.utils.file_ops import save_processed_json
+
+REVIEWS = [
+    ReviewProcessed(
+        user="UserA", original="Great!", translation_pt="Ótimo!", sentiment="positive",
+        language="en", intensity="Alta", aspects=["desempenho", "design"], explanation="Bom",
+    ),
+    ReviewProcessed(
+        user="UserB", original="Ruim.", translation_pt="Ruim.", sentiment="negative",
+        language="pt", intensity="Média", aspects=[], explanation="Ruim",
+    ),
+    ReviewProcessed(
+        user="UserC", original="Bof.", translation_pt="Mais ou menos.", sentiment="neutral",
+        language="fr", intensity="Baixa", aspects=["design"], explanation="Neutro",
+    ),
+    ReviewProcessed(
+        user="UserD", original="Nice", translation_pt="Legal", sentiment="positive",
+        language="en", intensity="Alta", aspects=["preço"], explanation="Bom",
+    ),
+]
+
+def test_round_trip_produces_equal_models():
+    """Os objetos criados a partir da tabela devem ser iguais aos originais."""
+    table = ReviewTable.from_rows(REVIEWS)
+
+    assert len(table) == len(REVIEWS)
+    assert list(table) == REVIEWS
+    assert table[1] == REVIEWS[1]
+    assert table[-1] == REVIEWS[-1]
+    assert list(table.iter_dicts()) == [r.model_dump() for r in REVIEWS]
+    with pytest.raises(IndexError):
+        table.row(len(REVIEWS))
+
+def test_categorical_columns_are_encoded():
+    """Colunas categóricas guardam cada valor distinto uma única vez."""
+    table = ReviewTable.from_rows(REVIEWS)
+
+    assert table.categories("language") == ["en", "pt", "fr"]
+    assert list(table.codes("language")) == [0, 1, 2, 0]
+    assert table.value_counts("sentiment") == Counter(positive=2, negative=1, neutral=1)
+    assert table.column("aspects") == [r.aspects for r in REVIEWS]
+
+def test_take_reorders_rows():
+    """`take` cria uma tabela com as linhas na ordem pedida."""
+    table = ReviewTable.from_rows(REVIEWS)
+
+    taken = table.take([3, 0, 2])
+
+    assert list(taken) == [REVIEWS[3], REVIEWS[0], REVIEWS[2]]
+    assert taken.categories("language") == ["en", "fr"]
+
+def test_sort_by_reorders_rows_in_place():
+    """`sort_by` reordena as linhas pela chave, sem criar outra tabela."""
+    table = ReviewTable.from_rows(REVIEWS)
+
+    table.sort_by([30, 10, 40, 20])
+
+    assert list(table) == [REVIEWS[1], REVIEWS[3], REVIEWS[0], REVIEWS[2]]
+    assert table.column("aspects") == [[], ["preço"], ["desempenho", "design"], ["design"]]
+    with pytest.raises(ValueError):
+        table.sort_by([1])
+
+def test_raw_reviews_and_column_length_check():
+    """A tabela aceita outros modelos e rejeita colunas de tamanhos diferentes."""
+    raw = [ReviewRaw(id="1", user="Ana", text="Oi", language="pt")]
+    table = ReviewTable.from_columns(
+        {"id": ["1"], "user": ["Ana"], "text": ["Oi"], "language": ["pt"]}, ReviewRaw
+    )
+
+    assert list(table) == raw
+    with pytest.raises(ValueError):
+        ReviewTable.from_columns(
+            {"id": ["1", "2"], "user": ["Ana"], "text": ["Oi"], "language": ["pt"]}, ReviewRaw
+        )
+
+def test_analysis_and_writer_accept_table(tmp_path: Path):
+    """A análise e o salvamento em JSON devem dar o mesmo resultado com a tabela."""
+    table = ReviewTable.from_rows(REVIEWS)
+    from_table, from_list = tmp_path / "table.json", tmp_path / "list.json"
+
+    save_processed_json(table, from_table)
+    save_processed_json(REVIEWS, from_list)
+
+    assert analyze_reviews(table) == analyze_reviews(REVIEWS)
+    assert json.loads(from_table.read_text(encoding="utf-8")) == json.loads(
+        from_list.read_text(encoding="utf-8")
+    )
@@ -0,0 +1,166 @@
+"""
+Testes para a orquestração do pipeline em `scripts.run_pipeline`.
+"""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from scripts import run_pipeline
+from src import llm_client
+from src.config import settings
+from src.models import ReviewRaw
+
+RESPONSE = json.dumps({
+    "translation_pt": "Ótimo", "sentiment": "positive", "intensity": "Alta",
+    "aspects": ["design"], "explanation": "Bom",
+})
+
+
+@pytest.fixture(autouse=True)
+def isolated_paths(tmp_path: Path, monkeypatch):
+    """Mantém saídas, journal e estado dos testes em um diretório temporário."""
+    monkeypatch.setattr(settings, "OUTPUTS_DIR", tmp_path / "outputs")
+    monkeypatch.setattr(settings, "JOURNAL_PATH", tmp_path / "outputs" / "llm_journal.jsonl")
+    monkeypatch.setattr(settings, "INCREMENTAL_STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+
+@pytest.fixture(name="llm_calls")
+def fake_llm(monkeypatch):
+    """Substitui a etapa do LLM por respostas fixas e registra as resenhas enviadas."""
+    calls = []
+
+    def process_with_llm(raw_reviews, resume=False):  # pylint: disable=unused-argument
+        for index, review in enumerate(raw_reviews):
+            calls.append(review.id)
+            yield index, review, RESPONSE
+
+    monkeypatch.setattr(run_pipeline, "process_with_llm", process_with_llm)
+    return calls
+
+
+def test_incremental_runs_keep_previous_outputs(tmp_path: Path, llm_calls):
+    """Cada execução incremental grava em um diretório próprio; sem novidades, nada muda."""
+    reviews = tmp_path / "reviews.txt"
+    reviews.write_text("1$Ana$Great app\n2$Bia$Nice design\n", encoding="utf-8")
+    runs_dir = settings.OUTPUTS_DIR / "incremental"
+
+    run_pipeline.main(["--incremental", "--input", str(reviews)])
+    (first_run,) = runs_dir.iterdir()
+    first_output = (first_run / "processed.json").read_text(encoding="utf-8")
+
+    run_pipeline.main(["--incremental", "--input", str(reviews)])
+
+    assert llm_calls == ["1", "2"]
+    assert list(runs_dir.iterdir()) == [first_run]
+    assert (first_run / "processed.json").read_text(encoding="utf-8") == first_output
+    assert [r["user"] for r in json.loads(first_output)] == ["Ana", "Bia"]
+    assert not (settings.OUTPUTS_DIR / "processed.json").exists()
+
+    with reviews.open("a", encoding="utf-8") as f:
+        f.write("3$Caio$Bad update\n")
+    run_pipeline.main(["--incremental", "--input", str(reviews)])
+
+    assert llm_calls == ["1", "2", "3"]
+    (second_run,) = set(runs_dir.iterdir()) - {first_run}
+    second_output = (second_run / "processed.json").read_text(encoding="utf-8")
+    assert [r["user"] for r in json.loads(second_output)] == ["Caio"]
+    assert (first_run / "processed.json").read_text(encoding="utf-8") == first_output
+
+
+class FakeLLMClient:
+    """
+    Cliente falso: recebe todos os prompts antes de responder (como várias
+    requisições simultâneas) e responde na ordem inversa, citando o texto da
+    resenha na explicação.
+    """
+
+    max_concurrency = 4
+    prompts: list = []
+
+    def __init__(self, cache=None):  # pylint: disable=unused-argument
+        pass
+
+    def iter_requests(self, requests):
+        """Produz `(posição, resposta)` na ordem inversa de envio."""
+        pending = list(enumerate(requests))
+        for k, (prompt, _) in reversed(pending):
+            text = re.search(r'Resenha original: "(.*)"', prompt).group(1)
+            FakeLLMClient.prompts.append(text)
+            yield k, json.dumps({
+                "translation_pt": text, "sentiment": "positive", "intensity": "Alta",
+                "aspects": ["geral"], "explanation": f"análise de {text}",
+            }, ensure_ascii=False)
+
+
+@pytest.fixture(name="fake_client")
+def fake_client_fixture(monkeypatch):
+    """Usa o FakeLLMClient no lugar do cliente real e limpa os prompts registrados."""
+    monkeypatch.setattr(llm_client, "LLMClient", FakeLLMClient)
+    FakeLLMClient.prompts = []
+    return FakeLLMClient
+
+
+def _reviews(*texts: str):
+    """Resenhas em português com ids e usuários sequenciais."""
+    return [
+        ReviewRaw(id=str(i), user=f"U{i}", text=text, language="pt")
+        for i, text in enumerate(texts, start=1)
+    ]
+
+
+def _processed(tmp_path: Path, results) -> list:
+    """Valida e salva os resultados, retornando o conteúdo de processed.json."""
+    run_pipeline.validate_and_analyze(results, tmp_path / "run")
+    return json.loads((tmp_path / "run" / "processed.json").read_text(encoding="utf-8"))
+
+
+def test_resume_replays_journal_without_requesting_again(tmp_path: Path, fake_client):
+    """Ao retomar, as resenhas do journal não voltam ao LLM e a ordem do arquivo é mantida."""
+    reviews = _reviews("Primeira resenha", "Segunda resenha", "Terceira resenha",
+                       "Quarta resenha")
+
+    # Primeira execução interrompida após duas respostas (as duas últimas enviadas).
+    first = run_pipeline.process_with_llm(iter(reviews))
+    interrupted = [next(first), next(first)]
+    first.close()
+    assert [review.id for _, review, _ in interrupted] == ["4", "3"]
+
+    fake_client.prompts = []
+    processed = _processed(tmp_path, run_pipeline.process_with_llm(iter(reviews), resume=True))
+
+    assert fake_client.prompts == ["Segunda resenha", "Primeira resenha"]
+    assert [p["user"] for p in processed] == ["U1", "U2", "U3", "U4"]
+    assert [p["explanation"] for p in processed] == [
+        f"análise de {review.text}" for review in reviews
+    ]
+
+
+
+def test_duplicates_receive_representative_response_in_input_order(
+    tmp_path: Path, fake_client
+):
+    """
+    Duplicatas recebem a resposta do representante (vinda do LLM ou do
+    journal) sem nova requisição, e os resultados seguem a ordem do arquivo.
+    """
+    reviews = _reviews("Ótimo app", "Trava muito", "ótimo   APP", "Não abre",
+                       "Trava  muito", "Ótimo app")
+
+    # O journal já tem a resposta de "Trava muito".
+    first = run_pipeline.process_with_llm(iter(reviews[:2]))
+    assert next(first)[1].id == "2"
+    first.close()
+
+    fake_client.prompts = []
+    processed = _processed(tmp_path, run_pipeline.process_with_llm(iter(reviews), resume=True))
+
+    assert sorted(fake_client.prompts) == ["Não abre", "Ótimo app"]
+    assert [p["user"] for p in processed] == ["U1", "U2", "U3", "U4", "U5", "U6"]
+    assert [p["original"] for p in processed] == [review.text for review in reviews]
+    assert [p["explanation"] for p in processed] == [
+        "análise de Ótimo app", "análise de Trava muito", "análise de Ótimo app",
+        "análise de Não abre", "análise de Trava muito", "análise de Ótimo app",
+    ]
@@ -0,0 +1,60 @@
+"""
+Testes para as funções de limpeza de texto em `src.tools.text_utils`.
+
+As versões em lote devem produzir exatamente o mesmo resultado das funções
+escalares, inclusive em casos de borda de Unicode.
+"""
+import sys
+
+import pytest
+
+from src.tools.text_utils import (
+    normalize_whitespace,
+    normalize_whitespace_bulk,
+    remove_special_characters,
+    remove_special_characters_bulk,
+)
+
+TEXTS = [
+    "",
+    "   ",
+    "Ótimo   app!\tRecomendo.\n",
+    "Não funciona, ¿por qué? très bien… ½ ﬁ",
+    "ñandú com espaço\u00a0não separável",
+    "linha\u2028separador e espaço\u3000ideográfico",
+    "controle\x1c\x1d\x1e\x1fe\x0b\x0cfim",
+    "日本語のテスト 123",
+    "nulo\x00no meio",
+    "é combinante solto ́",
+]
+
+# Todos os caracteres ASCII e uma amostra de pontos de código Unicode.
+ALL_CHARS = "".join(chr(c) for c in range(0, 0x3100, 7) if not 0xD800 <= c < 0xE000)
+
+
+def test_normalize_whitespace_bulk_matches_scalar():
+    """A versão em lote deve ser idêntica à escalar, caractere a caractere."""
+    texts = TEXTS + [f"a{chr(c)}b " for c in range(sys.maxunicode + 1) if chr(c).isspace()]
+
+    assert normalize_whitespace_bulk(texts) == [normalize_whitespace(t) for t in texts]
+
+
+@pytest.mark.parametrize("keep_punctuation", [True, False])
+def test_remove_special_characters_bulk_matches_scalar(keep_punctuation: bool):
+    """A versão em lote deve ser idêntica à escalar, com ou sem pontuação."""
+    texts = TEXTS + [ALL_CHARS] + [chr(c) for c in range(128)]
+
+    expected = [remove_special_characters(t, keep_punctuation) for t in texts]
+
+    assert remove_special_characters_bulk(texts, keep_punctuation) == expected
+    # Sem strings "difíceis" (separador ou espaços fora do ASCII) no bloco.
+    simple = [t for t in TEXTS if "\x00" not in t and "\u2028" not in t]
+    assert remove_special_characters_bulk(iter(simple), keep_punctuation) == [
+        remove_special_characters(t, keep_punctuation) for t in simple
+    ]
+
+
+def test_bulk_functions_accept_empty_input():
+    """Entradas vazias devem produzir listas vazias."""
+    assert normalize_whitespace_bulk([]) == []
+    assert remove_special_characters_bulk([]) == []
@@ -0,0 +1,103 @@
+"""
+Testes para as estimativas de tokens em `src.tools.token_budget`.
+"""
+import pytest
+
+from src.config import settings
+from src.models import ReviewRaw
+from src.tools.token_budget import (
+    TRIM_MARKER,
+    budget_review,
+    budget_reviews,
+    estimate_tokens,
+    fit_to_context,
+    output_token_budget,
+    trim_to_token_budget,
+)
+
+
+def _review(text: str, language: str = "en") -> ReviewRaw:
+    """Cria uma resenha de teste."""
+    return ReviewRaw(id="1", user="User", text=text, language=language)
+
+
+def test_estimate_tokens_counts_utf8_bytes():
+    """A estimativa usa ~4 bytes UTF-8 por token."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("これは") == 3  # 9 bytes
+
+
+def test_short_text_is_not_trimmed():
+    """Textos dentro do orçamento permanecem iguais."""
+    assert trim_to_token_budget("Muito bom", 10) == "Muito bom"
+
+
+def test_long_text_keeps_head_and_tail():
+    """Textos longos mantêm o início e o fim, com marcador no meio."""
+    text = " ".join(f"w{i}" for i in range(1000))
+    trimmed = trim_to_token_budget(text, 50)
+
+    assert TRIM_MARKER.strip() in trimmed
+    assert trimmed.startswith("w0 w1 w2")
+    assert trimmed.endswith("w998 w999")
+    assert estimate_tokens(trimmed) <= 50
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["これは" * 2000, "https://exemplo.com/" + "a" * 8000, "a" * 8000 + " fim"],
+    ids=["cjk", "long_url", "long_first_word"],
+)
+def test_text_without_spaces_is_trimmed_by_characters(text: str):
+    """Palavras maiores que o orçamento são cortadas por caracteres, não descartadas."""
+    trimmed = trim_to_token_budget(text, 768)
+    head, tail = trimmed.split(TRIM_MARKER.strip())
+
+    assert text.startswith(head.strip()) and len(head.strip()) > 100
+    assert text.endswith(tail.strip()) and tail.strip()
+    assert estimate_tokens(trimmed) <= 768
+
+
+def test_output_budget_grows_with_text_and_translation():
+    """Resenhas mais longas, e que precisam de tradução, recebem mais tokens."""
+    short = output_token_budget(_review("Ótimo app", "pt"))
+    long_pt = output_token_budget(_review("palavra " * 200, "pt"))
+    long_en = output_token_budget(_review("palavra " * 200, "en"))
+
+    assert settings.LLM_MIN_OUTPUT_TOKENS <= short < settings.LLM_MAX_TOKENS
+    assert short < long_pt < long_en <= settings.LLM_MAX_OUTPUT_TOKENS
+
+
+def test_budget_review_trims_without_touching_original():
+    """O texto do prompt é reduzido, mas a resenha original não é alterada."""
+    review = _review("palavra " * 2000)
+    prompt_review, max_tokens = budget_review(review)
+
+    assert estimate_tokens(prompt_review.text) <= settings.LLM_MAX_INPUT_TOKENS
+    assert review.text.startswith("palavra palavra")
+    assert TRIM_MARKER.strip() not in review.text
+    assert max_tokens == output_token_budget(prompt_review)
+
+
+@pytest.mark.parametrize("dynamic", [True, False])
+def test_budget_reviews_respects_setting(monkeypatch, dynamic: bool):
+    """Sem LLM_DYNAMIC_MAX_TOKENS, todas as resenhas usam LLM_MAX_TOKENS."""
+    monkeypatch.setattr(settings, "LLM_DYNAMIC_MAX_TOKENS", dynamic)
+    reviews = [_review("Bom"), _review("palavra " * 300)]
+
+    _, budgets = budget_reviews(reviews)
+
+    if dynamic:
+        assert budgets[0] < budgets[1]
+    else:
+        assert budgets == [settings.LLM_MAX_TOKENS] * 2
+
+
+def test_fit_to_context_limits_max_tokens():
+    """O max_tokens é reduzido para caber na janela de contexto."""
+    prompt = "x" * (settings.LLM_CONTEXT_TOKENS - 200) * 4
+
+    assert fit_to_context("curto", 512) == 512
+    assert fit_to_context(prompt, 512) == 200